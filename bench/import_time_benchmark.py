@@ -0,0 +1,65 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS: dict[str, str] = {
+    "package": "import chemsynthcalc",
+    "formula": "from chemsynthcalc import ChemicalFormula",
+    "reaction": "from chemsynthcalc import ChemicalReaction",
+}
+
+# cumulative import time budgets in ms (median of runs)
+BUDGETS: dict[str, float] = {
+    "package": 10.0,
+    "formula": 60.0,
+    "reaction": 250.0,
+}
+
+
+def top_level_imports(statement: str) -> dict[str, int]:
+    """
+    Run the statement in a fresh interpreter with -X importtime and
+    collect the cumulative time (in us) of all top-level imports.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    imports: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # top-level imports are not indented
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def import_time(statement: str) -> float:
+    """
+    Import time of the statement (in ms) without the interpreter startup imports.
+    """
+    imports = top_level_imports(statement)
+    return sum(v for k, v in imports.items() if k not in STARTUP_IMPORTS) / 1000
+
+
+parser = argparse.ArgumentParser(description="chemsynthcalc import time benchmark")
+parser.add_argument("--runs", type=int, default=7)
+args = parser.parse_args()
+
+STARTUP_IMPORTS: set[str] = set(top_level_imports("pass"))
+# skip the first cold run with .pyc compilation
+import_time(STATEMENTS["reaction"])
+
+over_budget = False
+for name, statement in STATEMENTS.items():
+    median = statistics.median(import_time(statement) for _ in range(args.runs))
+    status = "ok" if median <= BUDGETS[name] else "OVER BUDGET"
+    over_budget = over_budget or median > BUDGETS[name]
+    print(f"{statement}: {median:.1f} ms (budget {BUDGETS[name]} ms) {status}")
+
+sys.exit(1 if over_budget else 0)
@@ -0,0 +1,79 @@
+"""
+Load generator for the chemsynthcalc HTTP service.
+
+Starts the service twice (per-request processing with max_batch=1 and
+micro-batching) and sends the same reactions from many client threads.
+
+Usage:
+    python bench/server_load_benchmark.py --requests 2000 --clients 32
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from chemsynthcalc.server import ChemSynthCalcServer
+
+
+def setup(in_fname: str, n: int) -> list[str]:
+    with open(in_fname, encoding="utf-8") as reactions:
+        data: list[str] = [line.rstrip() for line in reactions if line.strip()]
+    return [data[i % len(data)] for i in range(n)]
+
+
+def post(url: str, reaction: str) -> int:
+    request = urllib.request.Request(
+        url, data=json.dumps({"reaction": reaction}).encode("utf-8")
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+def bench(
+    reactions: list[str],
+    clients: int,
+    workers: int | None,
+    max_batch: int,
+    window: float,
+) -> None:
+    server = ChemSynthCalcServer(
+        ("127.0.0.1", 0), workers=workers, max_batch=max_batch, window=window
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(lambda r: post(url + "/reaction", r), reactions))
+        elapsed = time.perf_counter() - start
+        with urllib.request.urlopen(url + "/stats") as response:
+            stats = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"max batch {max_batch}: {len(reactions) / elapsed:.1f} requests/s")
+    print(f"    {stats}")
+
+
+parser = argparse.ArgumentParser(description="chemsynthcalc server load benchmark")
+parser.add_argument("--input", default="bench/text_mined_reactions.txt")
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--clients", type=int, default=32)
+parser.add_argument("--workers", type=int, default=None)
+parser.add_argument("--max-batch", type=int, default=64)
+parser.add_argument("--batch-window-ms", type=float, default=2.0)
+args = parser.parse_args()
+
+input_list = setup(args.input, args.requests)
+print(f"number of requests: {len(input_list)}, clients: {args.clients}")
+bench(input_list, args.clients, args.workers, 1, 0.0)
+bench(input_list, args.clients, args.workers, args.max_batch, args.batch_window_ms / 1000)
@@ -0,0 +1,225 @@
+"""
+Stage-resolved benchmark of chemsynthcalc on the text-mined corpus.
+
+Every stage of the calculation is timed separately for each item
+of the corpus, and the median and 95th percentile (in microseconds)
+are reported as JSON.
+
+Usage:
+    python bench/stage_benchmark.py run --corpus reaction --out bench/baseline.json
+    python bench/stage_benchmark.py compare bench/baseline.json bench/current.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Callable
+
+from chemsynthcalc.balancer import Balancer
+from chemsynthcalc.chem_output import ChemicalOutput
+from chemsynthcalc.chemical_formula import ChemicalFormula
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.formula_parser import ChemicalFormulaParser
+from chemsynthcalc.formula_validator import FormulaValidator
+from chemsynthcalc.molar_mass import MolarMassCalculation
+from chemsynthcalc.reaction_decomposer import ReactionDecomposer
+from chemsynthcalc.reaction_matrix import ChemicalReactionMatrix
+from chemsynthcalc.reaction_validator import ReactionValidator
+
+CORPUS = "bench/text_mined_reactions.txt"
+
+
+def load_reactions(in_fname: str, limit: int | None) -> list[str]:
+    with open(in_fname, encoding="utf-8") as reactions:
+        data: list[str] = [line.rstrip() for line in reactions if line.strip()]
+    return data[:limit]
+
+
+def load_formulas(reactions: list[str]) -> list[str]:
+    formulas: dict[str, None] = {}
+    for reaction in reactions:
+        for formula in ReactionDecomposer(reaction).compounds:
+            formulas[formula] = None
+    return list(formulas)
+
+
+class StageTimer:
+    """
+    Collects per-item timings (in ns) of named stages.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, list[int]] = {}
+        self.failures: dict[str, int] = {}
+
+    def time(self, stage: str, func: Callable[[], object]) -> object:
+        start = time.perf_counter_ns()
+        try:
+            result = func()
+        except Exception:
+            result = None
+            self.failures[stage] = self.failures.get(stage, 0) + 1
+        self.timings.setdefault(stage, []).append(time.perf_counter_ns() - start)
+        return result
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        output: dict[str, dict[str, float]] = {}
+        for stage, timings in self.timings.items():
+            ordered = sorted(timings)
+            output[stage] = {
+                "n": len(ordered),
+                "failures": self.failures.get(stage, 0),
+                "median_us": statistics.median(ordered) / 1000,
+                "p95_us": ordered[int(0.95 * (len(ordered) - 1))] / 1000,
+                "total_ms": sum(ordered) / 1e6,
+            }
+        return output
+
+
+def bench_formulas(formulas: list[str], timer: StageTimer) -> None:
+    for formula in formulas:
+        timer.time("validation", FormulaValidator(formula).validate_formula)
+        parsed = timer.time(
+            "parsing", ChemicalFormulaParser(formula).parse_formula
+        )
+        if parsed is None:
+            continue
+        timer.time(
+            "molar mass",
+            MolarMassCalculation(parsed).calculate_molar_mass,  # type: ignore
+        )
+        obj = ChemicalFormula(formula)
+        output = obj.output_results
+        timer.time(
+            "serialization",
+            ChemicalOutput(output, 4, obj="ChemicalFormula").dump_to_json,
+        )
+
+
+def bench_reactions(
+    reactions: list[str], timer: StageTimer, comb_max: int, comb_iterations: float
+) -> None:
+    for reaction in reactions:
+        if not timer.time("validation", ReactionValidator(reaction).validate_reaction):
+            continue
+        decomposed: ReactionDecomposer = timer.time(
+            "decomposition", lambda: ReactionDecomposer(reaction)
+        )  # type: ignore
+        parsed: list[dict[str, float]] = timer.time(
+            "parsing",
+            lambda: [
+                ChemicalFormulaParser(f).parse_formula() for f in decomposed.compounds
+            ],
+        )  # type: ignore
+        if parsed is None:
+            continue
+        matrix = timer.time(
+            "matrix", lambda: ChemicalReactionMatrix(parsed).matrix
+        )
+        balancer = Balancer(matrix, len(decomposed.reactants), 8)  # type: ignore
+        timer.time("inv", balancer.inv)
+        timer.time("gpinv", balancer.gpinv)
+        timer.time("ppinv", balancer.ppinv)
+        if len(decomposed.compounds) <= comb_max:
+            # bounded search: unsolvable reactions would take minutes otherwise
+            timer.time("comb", lambda: balancer._comb_algorithm(comb_iterations))
+
+        obj = ChemicalReaction(reaction)
+        try:
+            obj.coefficients
+            obj.molar_masses
+        except Exception:
+            continue
+        if timer.time("masses", lambda: obj.masses) is None:
+            continue
+        output = obj.output_results
+        timer.time(
+            "serialization",
+            ChemicalOutput(output, 4, obj="ChemicalReaction").dump_to_json,
+        )
+
+
+def run(args: argparse.Namespace) -> None:
+    reactions = load_reactions(args.input, args.limit)
+    timer = StageTimer()
+    if args.corpus == "formula":
+        items = load_formulas(reactions)
+        bench_formulas(items, timer)
+    else:
+        items = reactions
+        bench_reactions(items, timer, args.comb_max, args.comb_iterations)
+
+    result = {
+        "corpus": args.corpus,
+        "items": len(items),
+        "python": sys.version.split()[0],
+        "stages": timer.summary(),
+    }
+    dump = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(dump + "\n")
+    print(dump)
+
+
+def compare(args: argparse.Namespace) -> None:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    if baseline["corpus"] != current["corpus"]:
+        sys.exit(f"Different corpora: {baseline['corpus']} and {current['corpus']}")
+
+    regressions: list[str] = []
+    for stage, old in baseline["stages"].items():
+        new = current["stages"].get(stage)
+        if new is None:
+            print(f"{stage}: missing in current run")
+            continue
+        for metric in ("median_us", "p95_us"):
+            ratio = new[metric] / old[metric] if old[metric] else 1.0
+            flag = ""
+            if ratio > 1 + args.threshold:
+                flag = " REGRESSION"
+                regressions.append(f"{stage} {metric}")
+            print(
+                f"{stage} {metric}: {old[metric]:.1f} -> {new[metric]:.1f} ({ratio:.2f}x){flag}"
+            )
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+parser = argparse.ArgumentParser(description="chemsynthcalc stage benchmark")
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+run_parser = subparsers.add_parser("run", help="run the benchmark")
+run_parser.add_argument("--corpus", choices=["formula", "reaction"], default="reaction")
+run_parser.add_argument("--input", default=CORPUS)
+run_parser.add_argument("--limit", type=int, default=None, help="max number of reactions")
+run_parser.add_argument(
+    "--comb-max", type=int, default=5, help="max number of compounds for comb method"
+)
+run_parser.add_argument(
+    "--comb-iterations",
+    type=float,
+    default=1e4,
+    help="max number of iterations for comb method",
+)
+run_parser.add_argument("--out", default=None, help="JSON output file")
+run_parser.set_defaults(func=run)
+
+compare_parser = subparsers.add_parser("compare", help="compare two runs")
+compare_parser.add_argument("baseline")
+compare_parser.add_argument("current")
+compare_parser.add_argument(
+    "--threshold", type=float, default=0.1, help="allowed relative slowdown"
+)
+compare_parser.set_defaults(func=compare)
+
+if __name__ == "__main__":
+    arguments = parser.parse_args()
+    arguments.func(arguments)
@@ -0,0 +1,91 @@
+"""
+Number of SVDs and wall time of the matrix balancing methods.
+
+Every SVD is counted while the reactions of the corpus are balanced: the
+public np.linalg.svd and np.linalg.pinv (one SVD per call) are wrapped,
+which covers all SVDs made by the balancing algorithms. Two scenarios
+are measured: the auto chain (as used by ChemicalReaction) and the full
+inv + gpinv + ppinv chain on every reaction.
+
+Usage:
+    python bench/svd_benchmark.py --limit 5000
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+
+svd_calls: int = 0
+
+
+def counting(func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        global svd_calls
+        svd_calls += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+np.linalg.svd = counting(np.linalg.svd)  # type: ignore
+np.linalg.pinv = counting(np.linalg.pinv)  # type: ignore
+
+
+def setup(in_fname: str, limit: int | None) -> list[ChemicalReaction]:
+    with open(in_fname, encoding="utf-8") as reactions:
+        data: list[str] = [line.rstrip() for line in reactions if line.strip()]
+    prepared: list[ChemicalReaction] = []
+    for reaction in data[:limit]:
+        try:
+            chemical_reaction = ChemicalReaction(reaction)
+            chemical_reaction.matrix
+            prepared.append(chemical_reaction)
+        except Exception:
+            pass
+    return prepared
+
+
+def auto_chain(reaction: ChemicalReaction) -> None:
+    reaction.balancer.exact_matrix = None
+    try:
+        reaction.balancer.auto()
+    except Exception:
+        pass
+
+
+def full_chain(reaction: ChemicalReaction) -> None:
+    for method in ("inv", "gpinv", "ppinv"):
+        try:
+            getattr(reaction.balancer, method)()
+        except Exception:
+            pass
+
+
+def bench(name: str, reactions: list[ChemicalReaction], func: Any) -> None:
+    global svd_calls
+    for reaction in reactions:
+        reaction.__dict__.pop("balancer", None)
+    svd_calls = 0
+    start = time.perf_counter()
+    for reaction in reactions:
+        func(reaction)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name}: {svd_calls / len(reactions):.3f} SVDs per reaction, "
+        f"{elapsed / len(reactions) * 1e6:.1f} us per reaction"
+    )
+
+
+parser = argparse.ArgumentParser(description="chemsynthcalc SVD count benchmark")
+parser.add_argument("--input", default="bench/text_mined_reactions.txt")
+parser.add_argument("--limit", type=int, default=None)
+args = parser.parse_args()
+
+input_list = setup(args.input, args.limit)
+print(f"number of reactions: {len(input_list)}")
+bench("auto chain", input_list, auto_chain)
+bench("inv + gpinv + ppinv", input_list, full_chain)
@@ -58,10 +58,39 @@ CO2: M = 44.0090 g/mol, m = 1.2882 g
 ```
 """
 
-import importlib.metadata
-
-from .chemical_formula import ChemicalFormula
-from .chemical_reaction import ChemicalReaction
+# typing.TYPE_CHECKING without importing typing at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .chemical_formula import ChemicalFormula
+    from .chemical_reaction import ChemicalReaction
 
 __all__ = ["ChemicalFormula", "ChemicalReaction"]
-__version__ = importlib.metadata.version("chemsynthcalc")
+
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "ChemicalFormula": ".chemical_formula",
+    "ChemicalReaction": ".chemical_reaction",
+}
+
+
+def __getattr__(name: str) -> object:
+    """
+    Lazy loading of the package attributes ([PEP 562](https://peps.python.org/pep-0562/)).
+    Submodules (and NumPy with them) are imported only on the first access,
+    and the package version is resolved only when asked for.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name == "__version__":
+        import importlib.metadata
+
+        value = importlib.metadata.version("chemsynthcalc")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES) + ["__version__"])
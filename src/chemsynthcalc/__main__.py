@@ -0,0 +1,43 @@
+"""
+Command line interface: `chemsynthcalc serve` (or `python -m chemsynthcalc serve`).
+"""
+
+import argparse
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="chemsynthcalc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="run the local HTTP/JSON service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "--workers", type=int, default=None, help="number of workers (CPU count by default)"
+    )
+    serve_parser.add_argument(
+        "--threads", action="store_true", help="use a thread pool instead of processes"
+    )
+    serve_parser.add_argument(
+        "--max-batch", type=int, default=64, help="max number of requests in a micro-batch"
+    )
+    serve_parser.add_argument(
+        "--batch-window-ms", type=float, default=2.0, help="micro-batch gathering window"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from .server import serve
+
+        serve(
+            args.host,
+            args.port,
+            args.workers,
+            not args.threads,
+            args.max_batch,
+            args.batch_window_ms / 1000,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Asyncio interface for embedding chemsynthcalc into async services.
+
+The calculations are offloaded to a shared thread (or process) executor,
+so they do not block the event loop. The number of calculations in flight
+is limited, and calculations that are still waiting for a free slot
+(or for a free worker) are dropped when the awaiting task is cancelled.
+
+Examples:
+    >>> from chemsynthcalc import aio
+    >>> await aio.balance("H2+O2=H2O", target_mass=2)
+    {'initial reaction': 'H2+O2=H2O', ..., 'masses': [0.22379129, 1.77620871, 2.0]}
+    >>> async for result in aio.balance_many(reactions, max_in_flight=16):
+    ...     print(result["final reaction"])
+"""
+
+import asyncio
+import os
+import weakref
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TypeVar
+
+from .chemical_formula import ChemicalFormula
+from .chemical_reaction import ChemicalReaction
+
+T = TypeVar("T")
+
+
+def _reaction_results(reaction: str, kwargs: dict[str, object]) -> dict[str, object]:
+    return ChemicalReaction(reaction, **kwargs).output_results  # type: ignore
+
+
+def _formula_results(
+    formula: str, custom_oxides: tuple[str, ...], precision: int
+) -> dict[str, object]:
+    return ChemicalFormula(formula, *custom_oxides, precision=precision).output_results
+
+
+class AsyncCalculator:
+    """
+    Runs calculations in an executor with a limit on the number
+    of calculations in flight.
+
+    Parameters:
+        executor (Executor | None): An executor to use (a new one is created if None)
+        max_workers (int | None): Number of workers of the created executor
+        processes (bool): Create a process pool instead of a thread pool
+        max_concurrency (int | None): Max number of calculations in flight (2 * workers by default)
+
+    Raise:
+        ValueError if max_concurrency <= 0
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        processes: bool = False,
+        max_concurrency: int | None = None,
+    ) -> None:
+        if max_workers is None:
+            cpus = os.cpu_count() or 1
+            max_workers = cpus if processes else min(32, cpus + 4)
+        workers: int = max_workers
+        if executor is not None:
+            self.executor: Executor = executor
+            self._owns_executor: bool = False
+        else:
+            self.executor = (
+                ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+            )
+            self._owns_executor = True
+
+        if max_concurrency is None:
+            max_concurrency = 2 * workers
+        if max_concurrency > 0:
+            self.max_concurrency: int = max_concurrency
+        else:
+            raise ValueError("max_concurrency <= 0")
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Concurrency limit of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """
+        Run a function in the executor once there is a free slot.
+        If the awaiting task is cancelled before the function is started,
+        the function is never run.
+
+        Parameters:
+            func (Callable[..., T]): A function (picklable for process pools)
+            *args (object): Function arguments
+
+        Returns:
+            The function result
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def balance(self, reaction: str, **kwargs: object) -> dict[str, object]:
+        """
+        Calculate a reaction.
+
+        Parameters:
+            reaction (str): A reaction string
+            **kwargs (object): Other [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction] arguments
+
+        Returns:
+            [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results] of the reaction
+        """
+        return await self.run(_reaction_results, reaction, kwargs)
+
+    async def calculate_formula(
+        self, formula: str, *custom_oxides: str, precision: int = 8
+    ) -> dict[str, object]:
+        """
+        Calculate a formula.
+
+        Parameters:
+            formula (str): A formula string
+            *custom_oxides (str): Non-default oxide formulas
+            precision (int): Value of rounding precision
+
+        Returns:
+            [output_results][chemsynthcalc.chemical_formula.ChemicalFormula.output_results] of the formula
+        """
+        return await self.run(_formula_results, formula, custom_oxides, precision)
+
+    async def balance_many(
+        self,
+        reactions: Iterable[str] | AsyncIterable[str],
+        max_in_flight: int | None = None,
+        return_exceptions: bool = True,
+        **kwargs: object,
+    ) -> AsyncIterator[dict[str, object] | Exception]:
+        """
+        Calculate many reactions and yield the results in the input order.
+
+        Only max_in_flight reactions are taken from the input at a time, so
+        the input can be a long (or endless) stream. If the iteration is stopped
+        early, the reactions that are not finished yet are cancelled.
+
+        Parameters:
+            reactions (Iterable[str] | AsyncIterable[str]): Reaction strings
+            max_in_flight (int | None): Max number of reactions taken from input ahead (max_concurrency by default)
+            return_exceptions (bool): Yield the exceptions of failed reactions instead of raising them
+            **kwargs (object): Other [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction] arguments
+
+        Yields:
+            [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results] or exception for every reaction
+
+        Raise:
+            ValueError if max_in_flight < 1
+        """
+        window = self.max_concurrency if max_in_flight is None else max_in_flight
+        if window < 1:
+            raise ValueError("max_in_flight < 1")
+
+        pending: list[asyncio.Task[dict[str, object]]] = []
+        try:
+            async for reaction in _aiter(reactions):
+                pending.append(asyncio.ensure_future(self.balance(reaction, **kwargs)))
+                if len(pending) >= window:
+                    yield await _result(pending.pop(0), return_exceptions)
+            while pending:
+                yield await _result(pending.pop(0), return_exceptions)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def shutdown(self, cancel_futures: bool = True) -> None:
+        """
+        Shut down the executor (if it was created by this object).
+
+        Parameters:
+            cancel_futures (bool): Cancel the calculations that are not started yet
+        """
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+
+async def _aiter(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _result(
+    task: "asyncio.Task[T]", return_exceptions: bool
+) -> T | Exception:
+    try:
+        return await task
+    except Exception as error:
+        if return_exceptions:
+            return error
+        raise
+
+
+_default: AsyncCalculator | None = None
+
+
+def configure(
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    processes: bool = False,
+    max_concurrency: int | None = None,
+) -> AsyncCalculator:
+    """
+    Replace the shared calculator used by the module-level functions.
+    See [AsyncCalculator][chemsynthcalc.aio.AsyncCalculator] for the arguments.
+
+    Returns:
+        The new shared calculator
+    """
+    global _default
+    if _default is not None:
+        _default.shutdown()
+    _default = AsyncCalculator(executor, max_workers, processes, max_concurrency)
+    return _default
+
+
+def get_calculator() -> AsyncCalculator:
+    """
+    The shared calculator (a thread pool one is created on first use).
+
+    Returns:
+        The shared calculator
+    """
+    global _default
+    if _default is None:
+        _default = AsyncCalculator()
+    return _default
+
+
+async def balance(reaction: str, **kwargs: object) -> dict[str, object]:
+    """
+    Calculate a reaction in the shared calculator.
+    See [AsyncCalculator.balance][chemsynthcalc.aio.AsyncCalculator.balance].
+    """
+    return await get_calculator().balance(reaction, **kwargs)
+
+
+async def calculate_formula(
+    formula: str, *custom_oxides: str, precision: int = 8
+) -> dict[str, object]:
+    """
+    Calculate a formula in the shared calculator.
+    See [AsyncCalculator.calculate_formula][chemsynthcalc.aio.AsyncCalculator.calculate_formula].
+    """
+    return await get_calculator().calculate_formula(
+        formula, *custom_oxides, precision=precision
+    )
+
+
+def balance_many(
+    reactions: Iterable[str] | AsyncIterable[str],
+    max_in_flight: int | None = None,
+    return_exceptions: bool = True,
+    **kwargs: object,
+) -> AsyncIterator[dict[str, object] | Exception]:
+    """
+    Calculate many reactions in the shared calculator.
+    See [AsyncCalculator.balance_many][chemsynthcalc.aio.AsyncCalculator.balance_many].
+    """
+    return get_calculator().balance_many(
+        reactions, max_in_flight, return_exceptions, **kwargs
+    )
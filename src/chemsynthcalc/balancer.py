@@ -1,11 +1,205 @@
-from fractions import Fraction
+import time
+from typing import Iterable, NamedTuple
 
 import numpy as np
 import numpy.typing as npt
 
 from .balancing_algos import BalancingAlgorithms
-from .chem_errors import BalancingError
-from .utils import find_gcd, find_lcm
+from .chem_errors import BalancingError, BalancingTimeout
+from .exact import ExactMatrix, exact_coefficients
+from .instrumentation import timed
+from .integerize import integerize
+from .reaction_matrix import as_integer_array, checked_matmul
+
+
+class BalancingAttempt(NamedTuple):
+    """
+    A record of one call of a balancing method: method name, failure reason
+    (empty string if the method succeeded) and duration of the call (in ns).
+    """
+
+    method: str
+    reason: str
+    duration_ns: int
+
+    @property
+    def success(self) -> bool:
+        return self.reason == ""
+
+
+# rough throughputs of one CPU core for the cost model
+_CALL_SECONDS = 5e-5
+_FLOATING_OPERATIONS_PER_SECOND = 1e10
+_COMB_ENTRIES_PER_SECOND = 8e7
+_EXACT_OPERATIONS_PER_SECOND = 1e7
+_FLOAT_BYTES = 8
+_PYTHON_INTEGER_BYTES = 64
+
+# names of the methods of auto in the algorithm of the reaction
+_AUTO_NAMES = {
+    "exact": "exact",
+    "inv": "inverse",
+    "gpinv": "general pseudoinverse",
+    "ppinv": "partial pseudoinverse",
+}
+
+
+class CostEstimate(NamedTuple):
+    """
+    Estimated cost of a balancing method for a reaction matrix
+    (see [estimate][chemsynthcalc.balancer.Balancer.estimate]).
+
+    Attributes:
+        method (str): Balancing method
+        iterations (int): Number of decompositions (inv, gpinv, ppinv), elimination
+        row operations (exact) or candidate coefficient vectors in the worst case (comb)
+        peak_memory (int): Peak memory of the method (in bytes)
+        seconds (float): Estimated worst-case running time (in seconds)
+        nullity (int): Dimension of the null space of the reaction matrix
+        (a reaction has a unique solution only if it is 1)
+    """
+
+    method: str
+    iterations: int
+    peak_memory: int
+    seconds: float
+    nullity: int
+
+
+class BalanceCheck(NamedTuple):
+    """
+    Result of [check_balance][chemsynthcalc.balancer.Balancer.check_balance]
+    for many coefficient vectors.
+
+    Attributes:
+        balanced (npt.NDArray[np.bool_]): Is the reaction balanced with every vector?
+        residuals (npt.NDArray[np.float64]): Euclidean norm of the atom imbalance
+        (reactants minus products) of every vector
+    """
+
+    balanced: npt.NDArray[np.bool_]
+    residuals: npt.NDArray[np.float64]
+
+
+def aggregate_attempts(
+    attempt_logs: Iterable[Iterable[BalancingAttempt]],
+) -> dict[str, dict[str, dict[str, int]]]:
+    """
+    Aggregate attempt logs of many balancers (for example, of a batch of reactions).
+
+    Parameters:
+        attempt_logs (Iterable[Iterable[BalancingAttempt]]): Attempt logs
+
+    Returns:
+        Dictionary of method: {reason ("ok" for success): {count, total_ns}}
+
+    Examples:
+        >>> aggregate_attempts(ChemicalReaction(r).balancing_attempts for r in reactions)
+        {'inv': {'ok': {'count': 95, 'total_ns': 2876341}, 'singular matrix': {'count': 5, 'total_ns': 87624}}, ...}
+    """
+    aggregated: dict[str, dict[str, dict[str, int]]] = {}
+    for log in attempt_logs:
+        for attempt in log:
+            reason = attempt.reason or "ok"
+            record = aggregated.setdefault(attempt.method, {}).setdefault(
+                reason, {"count": 0, "total_ns": 0}
+            )
+            record["count"] += 1
+            record["total_ns"] += attempt.duration_ns
+    return aggregated
+
+
+def estimate_cost(
+    method: str,
+    rows: int,
+    columns: int,
+    rank: int | None = None,
+    comb_chunk_size: int = BalancingAlgorithms.comb_chunk_size,
+) -> CostEstimate:
+    """
+    Estimate the worst-case cost of a balancing method for a reaction matrix
+    of the given shape (elements, compounds) without building the matrix.
+    Without the rank, the rank is taken to be full, so the nullity is its
+    lower bound columns - min(rows, columns).
+
+    Parameters:
+        method (str): One of 5 currently implemented methods (inv, gpinv, ppinv, comb, exact)
+        rows (int): Number of rows (elements) of the reaction matrix
+        columns (int): Number of columns (compounds) of the reaction matrix
+        rank (int | None): Rank of the reaction matrix if it is known
+        comb_chunk_size (int): Number of candidate vectors checked at once by comb
+
+    Returns:
+        A [CostEstimate][chemsynthcalc.balancer.CostEstimate]
+
+    Raise:
+        ValueError if method is not found.
+
+    Examples:
+        >>> estimate_cost("inv", 5, 6)
+        CostEstimate(method='inv', iterations=1, peak_memory=1456, seconds=5.03048e-05, nullity=1)
+    """
+    if rank is None:
+        rank = min(rows, columns)
+    nullity = columns - rank
+
+    match method:
+        case "inv" | "gpinv":
+            # one full SVD (shared by both methods)
+            operations = 4 * rows * columns**2 + 8 * columns**3 + 4 * rows**2 * columns
+            memory = 2 * _FLOAT_BYTES * (rows**2 + columns**2 + rows * columns)
+            return CostEstimate(
+                method,
+                1,
+                memory,
+                _CALL_SECONDS + operations / _FLOATING_OPERATIONS_PER_SECOND,
+                nullity,
+            )
+
+        case "ppinv":
+            # two pseudoinverses and a few products of square matrices
+            size = max(rows, columns)
+            operations = 2 * (4 * size**3 + 8 * size**3) + 6 * size**3
+            memory = 6 * _FLOAT_BYTES * (rows**2 + columns**2 + rows * columns)
+            return CostEstimate(
+                method,
+                2,
+                memory,
+                2 * _CALL_SECONDS + operations / _FLOATING_OPERATIONS_PER_SECOND,
+                nullity,
+            )
+
+        case "exact":
+            # elimination of all rows for every pivot, then the basis vectors
+            iterations = rank * rows
+            operations = iterations * columns + nullity * rank * columns
+            memory = 2 * _PYTHON_INTEGER_BYTES * rows * columns
+            return CostEstimate(
+                method,
+                iterations,
+                memory,
+                _CALL_SECONDS + operations / _EXACT_OPERATIONS_PER_SECOND,
+                nullity,
+            )
+
+        case "comb":
+            # the whole cube of every max coefficient is enumerated (in chunks)
+            bound = min(127, int(1e8 ** (1 / columns)))
+            iterations = sum(i**columns for i in range(1, bound + 1))
+            chunk = min(comb_chunk_size, bound**columns)
+            # arange, digits, candidates, their integer copy and the product
+            row_bytes = 8 + 8 * columns + 2 * columns + 8 * columns + 9 * rows
+            return CostEstimate(
+                method,
+                iterations,
+                chunk * row_bytes,
+                _CALL_SECONDS
+                + iterations * (columns + rows) / _COMB_ENTRIES_PER_SECOND,
+                nullity,
+            )
+
+        case _:
+            raise ValueError(f"No method {method}")
 
 
 class Balancer(BalancingAlgorithms):
@@ -17,20 +211,57 @@ class Balancer(BalancingAlgorithms):
         separator_pos (int): Position of the reaction separator (usually the separator is "=")
         round_precision (int): Coefficients rounding precision
         intify (bool): Determines whether the coefficients should be integers
+        exact_matrix (ExactMatrix | None): Reaction matrix of fractions for the exact balancing
+        of non-stoichiometric reactions (see [exact][chemsynthcalc.balancer.Balancer.exact])
+        timeout (float | None): Time budget (in seconds) of every balancing method call
+        and of [auto][chemsynthcalc.balancer.Balancer.auto] as a whole (no limit by default)
 
     Attributes:
         coef_limit (int): max integer coefficient for \
         [_intify_coefficients][chemsynthcalc.balancer.Balancer._intify_coefficients] method
+        max_denominator (int): max denominator of coefficient fractions in intification
+        intify_tolerance (float): max difference between a float coefficient and its fraction
+        intify_error (float | None): balance error (max absolute residual) of the last intified coefficients
+        attempts (list[BalancingAttempt]): Log of all balancing method calls of this balancer
+        memory_limit (int): Max estimated peak memory of a method call (in bytes, see
+        [estimate][chemsynthcalc.balancer.Balancer.estimate])
+
+    Note:
+        The budget is checked cooperatively: before every method call and between
+        the chunks of the combinatorial search. A call that runs out of time raises
+        [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout], and auto doesn't try
+        the next methods then. A deadline (a *time.monotonic()* time) can also be given
+        to every method call directly, for example to share one budget between reactions.
+
+    Note:
+        Before a method runs, its cost is estimated from the shape of the matrix
+        (see [estimate][chemsynthcalc.balancer.Balancer.estimate]). Methods over the memory
+        limit are not run, and neither are the methods that can't be interrupted
+        (all except comb) if they are estimated to take longer than the time left.
+        Both fail with a [BalancingError][chemsynthcalc.chem_errors.BalancingError],
+        so auto goes on to the next method.
+
+    Raise:
+        ValueError if precision or timeout <= 0
     """
 
+    memory_limit: int = 1 << 30
+
     def __init__(
         self,
         matrix: npt.NDArray[np.float64],
         separator_pos: int,
         round_precision: int,
         intify: bool = True,
+        exact_matrix: ExactMatrix | None = None,
+        timeout: float | None = None,
     ) -> None:
         super().__init__(matrix, separator_pos)
+        self.exact_matrix: ExactMatrix | None = exact_matrix
+
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout <= 0")
+        self.timeout: float | None = timeout
 
         if round_precision > 0:
             self.round_precision: int = round_precision
@@ -39,6 +270,10 @@ class Balancer(BalancingAlgorithms):
 
         self.intify: bool = intify
         self.coef_limit: int = 1_000_000
+        self.max_denominator: int = 1_000_000
+        self.intify_tolerance: float = 10 ** -(round_precision)
+        self.intify_error: float | None = None
+        self.attempts: list[BalancingAttempt] = []
 
     def __str__(self) -> str:
         return f"Balancer object for matrix \n {self.reaction_matrix}"
@@ -50,29 +285,29 @@ class Balancer(BalancingAlgorithms):
         self, coefficients: list[float], limit: int
     ) -> list[float | int] | list[int]:
         """
-        Reduce the coefficients to integers by finding the greatest common divider.
+        Reduce the coefficients to integers by the vectorized continued fraction
+        expansion, see [integerize][chemsynthcalc.integerize.integerize].
+        The balance error of the integer coefficients is stored in intify_error.
 
         Parameters:
             coefficients (list): List of coefficients to intify
             limit (int): Upper limit (max int coef)
 
         Returns:
-            A list of intified coefficients
-        """
-        initial_coefficients = coefficients
-        frac = [Fraction(x).limit_denominator() for x in coefficients]
-        vals = [
-            int(
-                fr.numerator
-                * find_lcm([fr.denominator for fr in frac])
-                / fr.denominator
-            )
-            for fr in frac
-        ]
-        coefficients = [int(val / find_gcd(vals)) for val in vals]
-        if any(x > limit for x in coefficients):
-            return initial_coefficients
-        return coefficients
+            A list of intified coefficients (or initial coefficients if they can't be intified)
+        """
+        result = integerize(
+            coefficients,
+            self.max_denominator,
+            self.intify_tolerance,
+            limit,
+            np.hstack((self.reactant_matrix, -self.product_matrix)),
+        )
+        if not result.success:
+            self.intify_error = None
+            return coefficients
+        self.intify_error = float(result.balance_error)
+        return result.coefficients.tolist()
 
     @staticmethod
     def is_reaction_balanced(
@@ -86,11 +321,16 @@ class Balancer(BalancingAlgorithms):
         by the respective coefficient vector. Method is static to call it outside of balancer
         instance.
 
+        If the matrices and the coefficients are whole numbers, the check is exact
+        (integer arithmetic that can't overflow, see
+        [checked_matmul][chemsynthcalc.reaction_matrix.checked_matmul]), otherwise
+        the sums are compared within the tolerance.
+
         Parameters:
             reactant_matrix (npt.NDArray[np.float64]): Matrix of reactants property generated by [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction] class
             product_matrix (npt.NDArray[np.float64]): Matrix of products property generated by [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction] class
             coefficients (list[float] | list[int]): Coefficients
-            tolerance (float): tolerance limit for the *np.allclose* function
+            tolerance (float): tolerance limit for the *np.allclose* function (for non-integer values)
 
         Returns:
             True if balanced within tolerance
@@ -104,138 +344,441 @@ class Balancer(BalancingAlgorithms):
             False
         """
         try:
-            reactants = np.multiply(
-                reactant_matrix.T,
-                np.array(coefficients)[: reactant_matrix.shape[1], None],
-            )
-            products = np.multiply(
-                product_matrix.T,
-                np.array(coefficients)[reactant_matrix.shape[1] :, None],
+            integer_coefficients = as_integer_array(coefficients)
+            integer_matrix = as_integer_array(
+                np.hstack((reactant_matrix, -product_matrix))
             )
-            return np.allclose(
-                reactants.sum(axis=0), products.sum(axis=0), rtol=tolerance
+            if integer_coefficients is not None and integer_matrix is not None:
+                if integer_coefficients.shape != (integer_matrix.shape[1],):
+                    return False
+                # the dtype of the product is widened (up to Python integers)
+                # if the sums could overflow
+                residuals = checked_matmul(integer_matrix, integer_coefficients[:, None])
+                return not (residuals != 0).any()
+            return bool(
+                Balancer.check_balance(
+                    reactant_matrix, product_matrix, [coefficients], tolerance
+                ).balanced[0]
             )
-
         except Exception:
             return False
 
-    def _calculate_by_method(self, method: str) -> list[float | int] | list[int]:
+    @staticmethod
+    def check_balance(
+        reactant_matrix: npt.NDArray[np.float64],
+        product_matrix: npt.NDArray[np.float64],
+        coefficients: npt.ArrayLike,
+        tolerance: float = 1e-8,
+    ) -> BalanceCheck:
         """
-        Compute the coefficients list by a specific method.
+        Vectorized [is_reaction_balanced][chemsynthcalc.balancer.Balancer.is_reaction_balanced]:
+        checks many coefficient vectors of one reaction with one matrix product.
+
+        If the matrices and all the coefficients are whole numbers, the check is exact
+        (see [checked_matmul][chemsynthcalc.reaction_matrix.checked_matmul]),
+        otherwise the atom sums are compared like *np.allclose* with rtol=tolerance.
 
         Parameters:
-            method (str): One of 4 currently implemented methods (inv, gpinv, ppinv, comb)
+            reactant_matrix (npt.NDArray[np.float64]): Matrix of reactants
+            product_matrix (npt.NDArray[np.float64]): Matrix of products
+            coefficients (npt.ArrayLike): A 2D array of coefficient vectors (vectors, compounds)
+            tolerance (float): Relative tolerance (for non-integer values)
 
         Returns:
-            A list of coefficients
+            A [BalanceCheck][chemsynthcalc.balancer.BalanceCheck] with a value for every vector
 
         Raise:
-            ValueError if method is not found. <br />
-            [BalancingError][chemsynthcalc.chem_errors.BalancingError] if can't balance reaction by specified method.
+            ValueError if the vectors are not of the number of compounds
+
+        Examples:
+            >>> balancer = ChemicalReaction("H2+O2=H2O").balancer
+            >>> Balancer.check_balance(balancer.reactant_matrix, balancer.product_matrix, [[2, 1, 2], [2, 2, 2]])
+            BalanceCheck(balanced=array([ True, False]), residuals=array([0., 2.]))
+        """
+        separator = reactant_matrix.shape[1]
+        compounds = separator + product_matrix.shape[1]
+        vectors = np.asarray(coefficients)
+        if vectors.ndim != 2 or vectors.shape[1] != compounds:
+            raise ValueError(
+                f"Coefficient vectors should be of {compounds} compounds, got shape {vectors.shape}"
+            )
+
+        signed_matrix = np.hstack((reactant_matrix, -product_matrix))
+        integer_matrix = as_integer_array(signed_matrix)
+        if vectors.dtype.kind in "iu":
+            integer_vectors: npt.NDArray[np.generic] | None = vectors
+        elif vectors.dtype.kind == "f" and np.array_equal(vectors, np.trunc(vectors)):
+            integer_vectors = vectors
+        else:
+            integer_vectors = as_integer_array(vectors)
+
+        if integer_vectors is not None and integer_matrix is not None:
+            # every residual is a sum over the compounds of one element row
+            bound = float(np.abs(integer_vectors).max(initial=0)) * float(
+                np.abs(signed_matrix).sum(axis=1).max(initial=0)
+            )
+            if bound < 2**53:
+                # float sums of integers below 2**53 are exact (and use BLAS)
+                residual = integer_vectors.astype(np.float64) @ signed_matrix.T
+                squares = np.einsum("ij,ij->i", residual, residual)
+                return BalanceCheck(squares == 0, np.sqrt(squares))
+            integer_vectors = as_integer_array(integer_vectors)
+            if integer_vectors is not None:
+                exact_residual = checked_matmul(integer_vectors, integer_matrix.T)
+                residual = exact_residual.astype(np.float64)
+                return BalanceCheck(
+                    ~(exact_residual != 0).any(axis=1),
+                    np.sqrt(np.einsum("ij,ij->i", residual, residual)),
+                )
+
+        # reactant and product atom sums of every vector in one product
+        elements = reactant_matrix.shape[0]
+        blocks = np.zeros((compounds, 2 * elements))
+        blocks[:separator, :elements] = reactant_matrix.T
+        blocks[separator:, elements:] = product_matrix.T
+        sums = vectors.astype(np.float64) @ blocks
+        reactants, products = sums[:, :elements], sums[:, elements:]
+        residual = reactants - products
+        squares = np.einsum("ij,ij->i", residual, residual)
+        return BalanceCheck(
+            np.all(np.abs(residual) <= 1e-8 + tolerance * np.abs(products), axis=1),
+            np.sqrt(squares),
+        )
+
+    def _failure_reason(self, coefficients: list[float] | list[int]) -> str:
+        """
+        Find why the coefficients are not a solution of the reaction.
+
+        Parameters:
+            coefficients (list[float] | list[int]): Coefficients
+
+        Returns:
+            Failure reason or empty string if the coefficients are right
+        """
+        if len(coefficients) != self.reaction_matrix.shape[1]:
+            return "length mismatch"
+        elif not all(x > 0 for x in coefficients):
+            return "non-positive coefficients"
+        elif not Balancer.is_reaction_balanced(
+            self.reactant_matrix, self.product_matrix, coefficients
+        ):
+            return "not balanced"
+        return ""
+
+    def estimate(self, method: str) -> CostEstimate:
+        """
+        Estimate the worst-case cost of a balancing method without running it
+        (see [estimate_cost][chemsynthcalc.balancer.estimate_cost]). No matrix
+        decomposition is made for the estimate: the rank is taken from the
+        [decomposition][chemsynthcalc.balancing_algos.BalancingAlgorithms.decomposition]
+        only if it is already computed.
+
+        Parameters:
+            method (str): One of 5 currently implemented methods (inv, gpinv, ppinv, comb, exact)
+
+        Returns:
+            A [CostEstimate][chemsynthcalc.balancer.CostEstimate]
+
+        Raise:
+            ValueError if method is not found.
+
+        Examples:
+            >>> ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer.estimate("comb")
+            CostEstimate(method='comb', iterations=302221931, peak_memory=42205184, seconds=41.5555655125, nullity=1)
+        """
+        rows, columns = self.reaction_matrix.shape
+        rank = None
+        if "decomposition" in self.__dict__:
+            _, singular_values, _ = self.decomposition
+            tolerance = (
+                singular_values.max(initial=0) * max(rows, columns) * np.finfo(np.float64).eps
+            )
+            rank = int(np.count_nonzero(singular_values > tolerance))
+        return estimate_cost(method, rows, columns, rank, self.comb_chunk_size)
+
+    def _cost_reason(self, method: str, deadline: float | None) -> str:
+        """
+        Why the method should not be run (empty string if it can be run).
+        """
+        if method not in ("inv", "gpinv", "ppinv", "comb", "exact"):
+            return ""
+        if method == "exact" and self.exact_matrix is None:
+            return ""
+        estimate = self.estimate(method)
+        if estimate.peak_memory > self.memory_limit:
+            return "memory limit"
+        if (
+            method != "comb"
+            and deadline is not None
+            and time.monotonic() + estimate.seconds > deadline
+        ):
+            return "over time budget"
+        return ""
+
+    def _deadline(self, deadline: float | None) -> float | None:
+        """
+        The given deadline, or the deadline of the timeout of the balancer starting now.
+        """
+        if deadline is None and self.timeout is not None:
+            return time.monotonic() + self.timeout
+        return deadline
+
+    def _coefficients_by_method(
+        self, method: str, deadline: float | None = None
+    ) -> list[float] | list[int] | None:
+        """
+        Compute the raw (not checked and not intified) coefficients list by a specific method.
+
+        Parameters:
+            method (str): One of 5 currently implemented methods (inv, gpinv, ppinv, comb, exact)
+            deadline (float | None): *time.monotonic()* time to give up at
+
+        Returns:
+            A list of coefficients or None if comb or exact method found no solution
+
+        Raise:
+            ValueError if method is not found.
         """
         match method:
             case "inv":
-                coefficients: list[float] = np.round(
+                return np.round(
                     self._inv_algorithm(), decimals=self.round_precision
                 ).tolist()  # type: ignore
 
             case "gpinv":
-                coefficients: list[float] = np.round(
+                return np.round(
                     self._gpinv_algorithm(), decimals=self.round_precision + 2
                 ).tolist()  # type: ignore
 
             case "ppinv":
-                coefficients: list[float] = np.round(
+                return np.round(
                     self._ppinv_algorithm(), decimals=self.round_precision + 2
                 ).tolist()  # type: ignore
 
             case "comb":
-                res: npt.NDArray[np.int32] | None = self._comb_algorithm()
-                if res is not None:
-                    return res.tolist()  # type: ignore
-                else:
-                    raise BalancingError(f"Can't balance reaction by {method} method")
+                res: npt.NDArray[np.int32] | None = self._comb_algorithm(
+                    deadline=deadline
+                )
+                return res.tolist() if res is not None else None  # type: ignore
+
+            case "exact":
+                if self.exact_matrix is None:
+                    raise ValueError("No exact matrix for exact method")
+                integers = exact_coefficients(
+                    self.exact_matrix, self.separator_pos, self.coef_limit
+                )
+                if integers is None:
+                    return None
+                return [round(x / min(integers), self.round_precision) for x in integers]
 
             case _:
                 raise ValueError(f"No method {method}")
 
-        if (
-            Balancer.is_reaction_balanced(
-                self.reactant_matrix, self.product_matrix, coefficients
-            )
-            and all(x > 0 for x in coefficients)
-            and len(coefficients) == self.reaction_matrix.shape[1]
-        ):
-            if self.intify:
-                intified = self._intify_coefficients(coefficients, self.coef_limit)
-                if all(x < self.coef_limit for x in intified):
-                    return intified
+    @timed(
+        "balancing",
+        lambda self, method, deadline=None: {
+            "method": method,
+            "shape": self.reaction_matrix.shape,
+            "reason": self.attempts[-1].reason,
+        },
+    )
+    def _calculate_by_method(
+        self, method: str, deadline: float | None = None
+    ) -> list[float | int] | list[int]:
+        """
+        Compute the coefficients list by a specific method. Every call is
+        recorded in [attempts][chemsynthcalc.balancer.Balancer] with its
+        failure reason and duration.
+
+        Parameters:
+            method (str): One of 5 currently implemented methods (inv, gpinv, ppinv, comb, exact)
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
+        Returns:
+            A list of coefficients
+
+        Raise:
+            ValueError if method is not found. <br />
+            [BalancingError][chemsynthcalc.chem_errors.BalancingError] if can't balance reaction by specified method. <br />
+            [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout] if the deadline has passed.
+        """
+        start = time.perf_counter_ns()
+        deadline = self._deadline(deadline)
+        reason = ""
+        try:
+            if deadline is not None and time.monotonic() > deadline:
+                raise BalancingTimeout(f"No time left to balance reaction by {method} method")
+            reason = self._cost_reason(method, deadline)
+            coefficients = None
+            if not reason:
+                coefficients = self._coefficients_by_method(method, deadline)
+                if coefficients is None:
+                    reason = "no solution"
                 else:
-                    return coefficients
-            else:
-                return coefficients
-        else:
-            raise BalancingError(f"Can't balance reaction by {method} method")
+                    reason = self._failure_reason(coefficients)
+            if not reason and self.intify and method != "comb":
+                intified = self._intify_coefficients(coefficients, self.coef_limit)  # type: ignore
+                if all(x < self.coef_limit for x in intified):
+                    coefficients = intified
+        except np.linalg.LinAlgError:
+            reason = "singular matrix"
+            raise
+        except BalancingTimeout:
+            reason = "timeout"
+            raise
+        except Exception as error:
+            reason = type(error).__name__
+            raise
+        finally:
+            self.attempts.append(
+                BalancingAttempt(method, reason, time.perf_counter_ns() - start)
+            )
 
-    def inv(self) -> list[float | int] | list[int]:
+        if reason:
+            raise BalancingError(f"Can't balance reaction by {method} method: {reason}")
+        return coefficients  # type: ignore
+
+    def inv(self, deadline: float | None = None) -> list[float | int] | list[int]:
         """
         A high-level function call to compute coefficients by Thorne method.
 
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
         Returns:
             A list of coefficients
         """
-        return self._calculate_by_method("inv")
+        return self._calculate_by_method("inv", deadline)
 
-    def gpinv(self) -> list[float | int] | list[int]:
+    def gpinv(self, deadline: float | None = None) -> list[float | int] | list[int]:
         """
         A high-level function call to compute coefficients by
         Risteski general pseudoinverse method.
 
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
         Returns:
             A list of coefficients
         """
-        return self._calculate_by_method("gpinv")
+        return self._calculate_by_method("gpinv", deadline)
 
-    def ppinv(self) -> list[float | int] | list[int]:
+    def ppinv(self, deadline: float | None = None) -> list[float | int] | list[int]:
         """
         A high-level function call to compute coefficients by
         Risteski partial pseudoinverse method.
 
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
         Returns:
             A list of coefficients
         """
-        return self._calculate_by_method("ppinv")
+        return self._calculate_by_method("ppinv", deadline)
 
-    def comb(self) -> list[float | int] | list[int]:
+    def comb(self, deadline: float | None = None) -> list[float | int] | list[int]:
         """
         A high-level function call to compute coefficients by
         combinatorial method.
 
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
+        Returns:
+            A list of coefficients
+        """
+        return self._calculate_by_method("comb", deadline)
+
+    def exact(self, deadline: float | None = None) -> list[float | int] | list[int]:
+        """
+        A high-level function call to compute coefficients in exact rational
+        arithmetic (for reactions with a single solution, see
+        [exact_coefficients][chemsynthcalc.exact.exact_coefficients]).
+        Requires the exact_matrix of the balancer.
+
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
         Returns:
             A list of coefficients
         """
-        return self._calculate_by_method("comb")
+        return self._calculate_by_method("exact", deadline)
 
-    def auto(self) -> tuple[list[float | int] | list[int], str]:
+    def plan(self, deadline: float | None = None) -> list[str]:
+        """
+        The methods that [auto][chemsynthcalc.balancer.Balancer.auto] tries, in its order:
+        exact first (if the balancer has an exact matrix), then inv, gpinv and ppinv
+        from the cheapest estimate. The methods over the memory limit or
+        the time budget are left out.
+
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
+
+        Returns:
+            A list of method names (empty if no method fits)
+
+        Examples:
+            >>> ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer.plan()
+            ['inv', 'gpinv', 'ppinv']
+        """
+        deadline = self._deadline(deadline)
+        return [
+            method
+            for method in self._auto_methods()
+            if not self._cost_reason(method, deadline)
+        ]
+
+    def _auto_methods(self) -> list[str]:
+        """
+        All methods of auto in the order they are tried.
+        """
+        methods = sorted(
+            ("inv", "gpinv", "ppinv"), key=lambda method: self.estimate(method).seconds
+        )
+        if self.exact_matrix is not None:
+            methods.insert(0, "exact")
+        return methods
+
+    @timed(
+        "auto balancing",
+        lambda self, deadline=None: {"shape": self.reaction_matrix.shape},
+    )
+    def auto(
+        self, deadline: float | None = None
+    ) -> tuple[list[float | int] | list[int], str]:
         """
         A high-level function call to automatically compute coefficients
-        by sequentially calling inv, gpinv, ppinv methods.
+        by sequentially calling inv, gpinv, ppinv methods from the cheapest
+        [estimate][chemsynthcalc.balancer.Balancer.estimate] (the exact method is
+        called first if the balancer has an exact matrix). Failed methods
+        (and the methods over the memory limit or the time budget) are recorded in
+        [attempts][chemsynthcalc.balancer.Balancer] with the failure reason.
+        All methods share one deadline.
+
+        Parameters:
+            deadline (float | None): *time.monotonic()* time to give up at
+            (the timeout of the balancer from now by default)
 
         Returns:
             A list of coefficients
 
         Raise:
-            [BalancingError][chemsynthcalc.chem_errors.BalancingError] if can't balance reaction by any method.
+            [BalancingError][chemsynthcalc.chem_errors.BalancingError] if can't balance reaction by any method. <br />
+            [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout] if the deadline has passed.
         """
-        try:
-            return (self.inv(), "inverse")
-        except Exception:
-            pass
-        try:
-            return (self.gpinv(), "general pseudoinverse")
-        except Exception:
-            pass
-        try:
-            return (self.ppinv(), "partial pseudoinverse")
-        except Exception:
-            raise BalancingError("Can't balance this reaction by any method")
+        deadline = self._deadline(deadline)
+        for method in self._auto_methods():
+            try:
+                return (self._calculate_by_method(method, deadline), _AUTO_NAMES[method])
+            except BalancingTimeout:
+                raise
+            except Exception:
+                pass
+        raise BalancingError("Can't balance this reaction by any method")
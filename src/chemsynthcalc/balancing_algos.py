@@ -1,8 +1,12 @@
-import gc
+import time
+from functools import cached_property
 
 import numpy as np
 import numpy.typing as npt
 
+from .chem_errors import BalancingTimeout
+from .reaction_matrix import IntegerArray, as_integer_array, checked_matmul
+
 
 class BalancingAlgorithms:
     """
@@ -22,10 +26,18 @@ class BalancingAlgorithms:
         separator_pos (int): Position of the reaction separator (usually the separator is "=")
 
     Attributes:
+        comb_chunk_size (int): Number of candidate vectors checked at once by the combinatorial algorithm
         reactant_matrix (npt.NDArray[np.float64]): A matrix of the left part of the equation
         product_matrix (npt.NDArray[np.float64]): A matrix of the right part of the equation
+
+    Note:
+        The inv and gpinv algorithms share one singular value decomposition of the
+        reaction matrix (see [decomposition][chemsynthcalc.balancing_algos.BalancingAlgorithms.decomposition]),
+        so it is computed once per matrix.
     """
 
+    comb_chunk_size: int = 1 << 18
+
     def __init__(self, matrix: npt.NDArray[np.float64], separator_pos: int) -> None:
         self.separator_pos = separator_pos
         self.reaction_matrix: npt.NDArray[np.float64] = matrix
@@ -36,6 +48,40 @@ class BalancingAlgorithms:
             :, self.separator_pos :
         ]
 
+    @cached_property
+    def decomposition(
+        self,
+    ) -> tuple[
+        npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]
+    ]:
+        """
+        Full singular value decomposition of the reaction matrix,
+        computed on first use and shared by the balancing algorithms.
+
+        The rank of the matrix is the number of singular values above a tolerance,
+        the rows of vt above the rank span the row space of the matrix and
+        the rows below the rank span its null space.
+
+        Returns:
+            A tuple of (u, s, vt) (see *np.linalg.svd*)
+        """
+        u, s, vt = np.linalg.svd(self.reaction_matrix)
+        return u, s, vt
+
+    @cached_property
+    def integer_matrix(self) -> IntegerArray | None:
+        """
+        The reaction matrix in the narrowest integer dtype that holds it
+        (see [as_integer_array][chemsynthcalc.reaction_matrix.as_integer_array]),
+        or None if any atom count is not a whole number.
+
+        Note:
+            The float matrix is the primary one, since the inv, gpinv and ppinv
+            methods work on it. This integer copy is made only on first use
+            (by the comb method), and in int32 it takes half the memory of the float matrix.
+        """
+        return as_integer_array(self.reaction_matrix)
+
     def _calculate_rtol(self, matrix: npt.NDArray[np.float64]) -> float:
         minimum: int = min(matrix.shape[0], matrix.shape[1])
         return minimum * np.finfo(np.float64).eps
@@ -86,38 +132,37 @@ class BalancingAlgorithms:
             easily see that each vector will contain nullity-1 zeroes,
             therefore they cannot be a correct vector of coefficients.
 
+        Note:
+            The singular values and vectors are taken from the shared
+            [decomposition][chemsynthcalc.balancing_algos.BalancingAlgorithms.decomposition],
+            so no extra SVD is computed: a square (or padded) matrix gives the
+            last right singular vector, and the rank of the other matrices selects
+            the augmentation, whose last inverse column is found by one solve.
+
         Returns:
             A 1D NumPy array of calculated coefficients
         """
-        reaction_matrix = self.reaction_matrix
-
-        if reaction_matrix.shape[0] > reaction_matrix.shape[1]:
-            zeros_added = reaction_matrix.shape[0] - reaction_matrix.shape[1]
-            zero_columns = np.zeros(
-                (
-                    reaction_matrix.shape[0],
-                    zeros_added,
-                )
-            )
-            reaction_matrix = np.hstack((reaction_matrix, zero_columns))
+        rows, columns = self.reaction_matrix.shape
+        _, singular_values, vt = self.decomposition
+
+        if rows >= columns:
+            # the right singular vectors of the added zero columns come last,
+            # so the needed column of the inversed (orthogonal) matrix is
+            # the last right singular vector of the reaction matrix
+            vector = vt[-1]
         else:
-            zeros_added = 0
-
-        if reaction_matrix.shape[0] == reaction_matrix.shape[1]:
-            _, _, reaction_matrix = np.linalg.svd(reaction_matrix)
-
-        number_of_cols = reaction_matrix.shape[1]
-        rank = np.linalg.matrix_rank(reaction_matrix, tol=1e-100)
-        nullity = number_of_cols - rank
-        augument = np.flip(np.identity(reaction_matrix.shape[1])[:nullity], axis=1)
-        augumented_matrix = np.vstack((reaction_matrix, augument))
-        if np.where(~augumented_matrix.any(axis=1))[0].size > 0:
-            augumented_matrix = augumented_matrix[
-                ~np.all(augumented_matrix == 0, axis=1)
-            ]
-        inversed_matrix = np.linalg.inv(augumented_matrix)
-        vector = inversed_matrix[:, -zeros_added - 1].T
-        vector = np.absolute(np.squeeze(np.asarray(vector)))
+            rank = int(np.count_nonzero(singular_values > 1e-100))
+            nullity = columns - rank
+            augument = np.flip(np.identity(columns)[:nullity], axis=1)
+            augumented_matrix = np.vstack((self.reaction_matrix, augument))
+            augumented_matrix = augumented_matrix[augumented_matrix.any(axis=1)]
+            # the last column of the inversed augmented matrix
+            # (LinAlgError if the matrix is not square or singular)
+            unit = np.zeros(columns)
+            unit[-1] = 1.0
+            vector = np.linalg.solve(augumented_matrix, unit)
+
+        vector = np.absolute(vector)
         vector = vector[vector != 0]
         coefs = np.divide(vector, vector.min())
         return coefs
@@ -148,16 +193,22 @@ class BalancingAlgorithms:
             not always leads to a good result. Secondly, MP pseudoinverse
             is sensetive to row order in the reaction matrix. The rows should
             be ordered by atoms apperances in the reaction string.
+            The pseudoinverse is taken from the shared
+            [decomposition][chemsynthcalc.balancing_algos.BalancingAlgorithms.decomposition]
+            of the reaction matrix (negating the product columns only changes the signs of vt).
 
         Returns:
             A 1D NumPy array of calculated coefficients
         """
-        matrix = np.hstack((self.reactant_matrix, -self.product_matrix))
-        inverse = np.linalg.pinv(matrix, rtol=self._calculate_rtol(matrix))
-        a = np.ones((matrix.shape[1], 1))
-        i = np.identity(matrix.shape[1])
-        coefs = (i - inverse @ matrix) @ a
-        return coefs.flat[:]
+        _, singular_values, vt = self.decomposition
+        # A+A is the projector on the row space of A; negating the product
+        # columns flips the signs of the same rows and columns of the projector
+        cutoff = self._calculate_rtol(self.reaction_matrix) * singular_values.max()
+        row_space = vt[: np.count_nonzero(singular_values > cutoff)]
+        signs = np.ones(self.reaction_matrix.shape[1])
+        signs[self.separator_pos :] = -1.0
+        coefs = 1.0 - signs * (row_space.T @ (row_space @ signs))
+        return coefs
 
     def _ppinv_algorithm(self) -> npt.NDArray[np.float64]:
         """
@@ -216,21 +267,21 @@ class BalancingAlgorithms:
         return coefs
 
     def _comb_algorithm(
-        self, max_number_of_iterations: float = 1e8
+        self, max_number_of_iterations: float = 1e8, deadline: float | None = None
     ) -> npt.NDArray[np.int32] | None:
         """
         Matrix combinatorial algorithm for reaction balancing.
 
         Finds a solution solution of a Diophantine matrix equation
         by simply enumerating of all possible solutions of number_of_iterations
-        coefficients. The solution space is created by Cartesian product
-        (in this case, *np.meshgrid* function), and therefore it is very
-        limited by memory. There must a better, clever and fast solution
-        to this!
+        coefficients. The solution space is a Cartesian product that is
+        enumerated in chunks of comb_chunk_size vectors (in the order of
+        *np.meshgrid*), so the memory is bounded, but the time is not.
+        There must a better, clever and fast solution to this!
 
         Important:
-            Only for integer coefficients less than 128. Only for reactions
-            with total compound count <=10.
+            Only for integer coefficients less than 128 and integer atom counts.
+            Only for reactions with total compound count <=10.
             A GPU-accelerated version of this method can be done by importing
             CuPy and replacing np. with cp.
 
@@ -238,15 +289,28 @@ class BalancingAlgorithms:
             All possible variations of coefficients vectors are
             combinations = max_coefficients**number_of_compounds,
             therefore this method is most effective for reaction with
-            small numbers of compounds.
+            small numbers of compounds. The element balance of all candidate
+            vectors is one integer matrix product with the
+            [integer_matrix][chemsynthcalc.balancing_algos.BalancingAlgorithms.integer_matrix]
+            (in a dtype that can't overflow, see
+            [checked_matmul][chemsynthcalc.reaction_matrix.checked_matmul]).
+
+        Parameters:
+            max_number_of_iterations (float): Max number of candidate vectors
+            deadline (float | None): *time.monotonic()* time to give up at (checked before every chunk)
 
         Returns:
             A 1D NumPy array of calculated coefficients of None if can't compute
+
+        Raise:
+            [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout] if the deadline has passed
         """
         byte = 127
         number_of_compounds = self.reaction_matrix.shape[1]
         if number_of_compounds > 10:
             raise ValueError("Sorry, this method is only for n of compound <=10")
+        if self.integer_matrix is None:
+            return None
 
         number_of_iterations = int(
             max_number_of_iterations ** (1 / number_of_compounds)
@@ -255,45 +319,32 @@ class BalancingAlgorithms:
         if number_of_iterations > byte:
             number_of_iterations = byte
 
-        trans_reaction_matrix = (self.reaction_matrix).T
-        lenght = self.reactant_matrix.shape[1]
-        old_reactants = trans_reaction_matrix[:lenght].astype("ushort")
-        old_products = trans_reaction_matrix[lenght:].astype("ushort")
+        # products with minus sign: a balanced vector gives a zero row
+        signed_matrix = self.integer_matrix.T.copy()
+        signed_matrix[self.separator_pos :] *= -1
+        # np.meshgrid(...).T.reshape order: the last compound changes slowest,
+        # then the previous ones, then the first, and the second changes fastest
+        order = list(range(number_of_compounds - 1, 1, -1)) + [0, 1][
+            :number_of_compounds
+        ]
         for i in range(2, number_of_iterations + 2):
-            cart_array = (np.arange(1, i, dtype="ubyte"),) * number_of_compounds
-            permuted = np.array(np.meshgrid(*cart_array), dtype="ubyte").T.reshape(
-                -1, number_of_compounds
-            )
-            filter = np.asarray([i - 1], dtype="ubyte")
-            permuted = permuted[np.any(permuted == filter, axis=1)]
-            # print("calculating max coef %s of %s" % (i-1, number_of_iterations), end='\r', flush=False)
-            reactants_vectors = permuted[:, :lenght]
-            products_vectors = permuted[:, lenght:]
-            del permuted
-            reactants = (old_reactants[None, :, :] * reactants_vectors[:, :, None]).sum(
-                axis=1
-            )
-            products = (old_products[None, :, :] * products_vectors[:, :, None]).sum(
-                axis=1
-            )
-            diff = np.subtract(reactants, products)
-            del reactants
-            del products
-            where = np.where(~diff.any(axis=1))[0]
-            if np.any(where):
-                if where.shape[0] == 1:
-                    idx = where
-                else:
-                    idx = where[0]
-                # print("")
-                return np.array(
-                    np.concatenate(
-                        (
-                            reactants_vectors[idx].flatten(),
-                            products_vectors[idx].flatten(),
-                        )
+            shape = (i - 1,) * number_of_compounds
+            total = (i - 1) ** number_of_compounds
+            for start in range(0, total, self.comb_chunk_size):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise BalancingTimeout(
+                        f"Combinatorial search timed out at max coefficient {i - 1}"
                     )
+                digits = np.unravel_index(
+                    np.arange(start, min(start + self.comb_chunk_size, total)), shape
                 )
-            gc.collect()
-        # print("")
+                permuted = np.empty((digits[0].size, number_of_compounds), "ubyte")
+                for digit, compound in zip(digits, order):
+                    permuted[:, compound] = digit + 1
+                # only the vectors with the new max coefficient
+                permuted = permuted[np.any(permuted == i - 1, axis=1)]
+                diff = checked_matmul(permuted, signed_matrix)
+                where = np.flatnonzero(~(diff != 0).any(axis=1))
+                if where.size:
+                    return permuted[where[0]].astype(np.int32)
         return None
@@ -0,0 +1,470 @@
+"""
+Batch calculation of many reactions.
+
+Duplicate reactions (see [dedupe][chemsynthcalc.canonical.dedupe]) are
+balanced once, and the coefficients are fanned back out to every
+spelling of the reaction in the input order.
+
+A compiled corpus (see [compile_corpus][chemsynthcalc.corpus.compile_corpus])
+is calculated in parallel: every worker process maps the same file and reads
+its own range of reactions, so only the (start, end) ranges and the results
+cross the process boundary. The ranges are of about the same estimated
+balancing time (see [estimate_cost][chemsynthcalc.balancer.estimate_cost]
+of the stored matrix shapes), and the reactions that no balancing method
+fits are rejected before they are sent to the workers. Plain text files are
+split the same way into byte ranges at line boundaries
+(see [line_offsets][chemsynthcalc.corpus.line_offsets]).
+The results are yielded in the input order as soon as every range is done
+(see [iter_corpus][chemsynthcalc.batch.iter_corpus] and [iter_file][chemsynthcalc.batch.iter_file]).
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+from .balancer import BalanceCheck, Balancer, estimate_cost
+from .canonical import dedupe
+from .chem_errors import BalancingError, BalancingTimeout
+from .chemical_reaction import ChemicalReaction
+from .corpus import CompiledCorpus, line_offsets, line_ranges, read_lines
+from .reaction_decomposer import ReactionDecomposer
+
+
+def calculate_batch(
+    reactions: Iterable[str],
+    mode: str = "balance",
+    target: int = 0,
+    target_mass: float = 1.0,
+    precision: int = 8,
+    intify: bool = True,
+    return_exceptions: bool = True,
+    timeout: float | None = None,
+) -> list[dict[str, object] | Exception]:
+    """
+    Calculate the output results of many reactions.
+
+    Parameters:
+        reactions (Iterable[str]): Reaction strings
+        mode (str): Coefficients calculation mode
+        target (int): Index of target compound
+        target_mass (float): Desired mass of target compound (in grams)
+        precision (int): Value of rounding precision
+        intify (bool): Is it required to convert the coefficients to integer values?
+        return_exceptions (bool): Return the exceptions of failed reactions instead of raising them
+        timeout (float | None): Time budget of balancing of every reaction (in seconds, no limit by default).
+        The reactions that run out of it fail with [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout],
+        The reactions that no balancing method fits by estimate (see
+        [estimate_cost][chemsynthcalc.balancer.estimate_cost]) fail without balancing:
+        with BalancingTimeout if they are over the time budget, with
+        [BalancingError][chemsynthcalc.chem_errors.BalancingError] if they are over the memory limit
+
+    Returns:
+        [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results]
+        or exception for every reaction (in the input order)
+
+    Examples:
+        >>> calculate_batch(["H2+O2=H2O", "O2+H2->H2O"])
+        [{'initial reaction': 'H2+O2=H2O', ..., 'coefficients': [2, 1, 2], ...},
+        {'initial reaction': 'O2+H2->H2O', ..., 'coefficients': [1, 2, 2], ...}]
+    """
+    reactions = list(reactions)
+    deduped = dedupe(reactions, with_coefficients=mode != "balance")
+    kwargs = {
+        "mode": mode,
+        "target": target,
+        "target_mass": target_mass,
+        "precision": precision,
+        "intify": intify,
+        "timeout": timeout,
+    }
+
+    balanced: list[ChemicalReaction | Exception] = []
+    for index in deduped.unique:
+        try:
+            reaction = ChemicalReaction(reactions[index], **kwargs)  # type: ignore
+            _, reason = _shape_estimate(*reaction.matrix.shape, mode, timeout)
+            if reason:
+                raise _rejection(reason)
+            reaction.coefficients
+            balanced.append(reaction)
+        except Exception as error:
+            balanced.append(error)
+
+    results: list[dict[str, object] | Exception] = []
+    for index, reaction_string in enumerate(reactions):
+        first = balanced[deduped.groups[index]]
+        try:
+            if isinstance(first, Exception):
+                raise first
+            first_index = deduped.unique[deduped.groups[index]]
+            if first_index == index or reaction_string == reactions[first_index]:
+                reaction = first
+            else:
+                reaction = ChemicalReaction(reaction_string, **kwargs)  # type: ignore
+                reaction.coefficients = deduped.permute(index, first.coefficients)
+                reaction.algorithm = first.algorithm
+            results.append(dict(reaction.output_results))
+        except Exception as error:
+            if not return_exceptions:
+                raise
+            results.append(error)
+    return results
+
+
+def check_batch(reactions: Iterable[str], tolerance: float = 1e-8) -> BalanceCheck:
+    """
+    Check if many reactions are balanced with their own coefficients (like the
+    check mode, without exceptions). Reactions with the same compounds
+    (see [dedupe][chemsynthcalc.canonical.dedupe]) share one reaction matrix,
+    and all their coefficient vectors are checked in one
+    [check_balance][chemsynthcalc.balancer.Balancer.check_balance] call.
+
+    Parameters:
+        reactions (Iterable[str]): Reaction strings with coefficients
+        tolerance (float): Relative tolerance (for non-integer values)
+
+    Returns:
+        A [BalanceCheck][chemsynthcalc.balancer.BalanceCheck] with a value for every
+        reaction (reactions that can't be parsed are not balanced, with NaN residuals)
+
+    Examples:
+        >>> check_batch(["2H2+O2=2H2O", "O2+2H2=2H2O", "H2+O2=H2O", "H2+O2H2O"])
+        BalanceCheck(balanced=array([ True,  True, False, False]), residuals=array([0., 0., 1., nan]))
+    """
+    reactions = list(reactions)
+    deduped = dedupe(reactions)
+    balanced = np.zeros(len(reactions), dtype=bool)
+    residuals = np.full(len(reactions), np.nan)
+    members: dict[int, list[int]] = {}
+    for index, group in enumerate(deduped.groups):
+        members.setdefault(group, []).append(index)
+
+    for group, indices in members.items():
+        first = deduped.unique[group]
+        first_order = deduped.orders[first]
+        if not first_order:
+            continue
+        try:
+            balancer = ChemicalReaction(reactions[first]).balancer
+        except Exception:
+            continue
+        vectors: list[list[float]] = []
+        for index in indices:
+            coefficients = ReactionDecomposer(
+                reactions[index].replace(" ", "")
+            ).initial_coefficients
+            # to the compound order of the first reaction of the group
+            vector = [0.0] * len(coefficients)
+            for position, first_position in zip(deduped.orders[index], first_order):
+                vector[first_position] = coefficients[position]
+            vectors.append(vector)
+        check = Balancer.check_balance(
+            balancer.reactant_matrix, balancer.product_matrix, vectors, tolerance
+        )
+        balanced[indices] = check.balanced
+        residuals[indices] = check.residuals
+    return BalanceCheck(balanced, residuals)
+
+
+def _calculate_corpus_range(
+    path: str, start: int, end: int, kwargs: dict[str, Any]
+) -> list[dict[str, object] | Exception]:
+    """
+    Calculate the reactions start..end of a compiled corpus (a worker task).
+    """
+    results: list[dict[str, object] | Exception] = []
+    with CompiledCorpus(path) as corpus:
+        for i in range(start, end):
+            try:
+                results.append(dict(corpus.chemical_reaction(i, **kwargs).output_results))
+            except Exception as error:
+                results.append(error)
+    return results
+
+
+def iter_corpus(
+    path: str,
+    mode: str = "balance",
+    target: int = 0,
+    target_mass: float = 1.0,
+    precision: int = 8,
+    intify: bool = True,
+    workers: int | None = None,
+    timeout: float | None = None,
+) -> Iterator[dict[str, object] | Exception]:
+    """
+    Calculate the output results of all reactions of a compiled corpus
+    in parallel processes and yield them in the corpus order as soon as
+    every range of reactions is done. Only a few ranges per worker are
+    calculated ahead, so the results of a large corpus are not held in memory.
+
+    Parameters:
+        path (str): Path of the compiled corpus (.csc) file
+        mode (str): Coefficients calculation mode
+        target (int): Index of target compound
+        target_mass (float): Desired mass of target compound (in grams)
+        precision (int): Value of rounding precision
+        intify (bool): Is it required to convert the coefficients to integer values?
+        workers (int | None): Number of processes (os.cpu_count() by default, 1 runs in this process)
+        timeout (float | None): Time budget of balancing of every reaction (in seconds, no limit by default)
+
+    Yields:
+        [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results]
+        or exception for every reaction (in the corpus order)
+
+    Examples:
+        >>> for result in iter_corpus(compile_corpus("bench/text_mined_reactions.txt"), workers=4):
+        ...     print(result["final reaction"])
+    """
+    kwargs: dict[str, Any] = {
+        "mode": mode,
+        "target": target,
+        "target_mass": target_mass,
+        "precision": precision,
+        "intify": intify,
+        "timeout": timeout,
+    }
+    workers = workers or os.cpu_count() or 1
+    with CompiledCorpus(path) as corpus:
+        costs, rejected = _estimate_corpus(*corpus.shapes(), mode, timeout)
+        # a few ranges per worker to even out the load
+        ranges = corpus.ranges(workers * 4 if workers > 1 else 1, costs)
+        size = len(corpus)
+
+    accepted = [
+        part for start, end in ranges for part in _split_range(start, end, rejected)
+    ]
+    calculated = _run_ranges(_calculate_corpus_range, path, accepted, kwargs, workers)
+    for i in range(size):
+        yield rejected[i] if i in rejected else next(calculated)
+
+
+def calculate_corpus(
+    path: str,
+    mode: str = "balance",
+    target: int = 0,
+    target_mass: float = 1.0,
+    precision: int = 8,
+    intify: bool = True,
+    workers: int | None = None,
+    timeout: float | None = None,
+) -> list[dict[str, object] | Exception]:
+    """
+    All results of [iter_corpus][chemsynthcalc.batch.iter_corpus] in one list
+    (for small corpora: iterate over iter_corpus to process a large corpus).
+
+    Returns:
+        [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results]
+        or exception for every reaction (in the corpus order)
+
+    Examples:
+        >>> calculate_corpus(compile_corpus("bench/text_mined_reactions.txt"), workers=4)
+    """
+    return list(
+        iter_corpus(path, mode, target, target_mass, precision, intify, workers, timeout)
+    )
+
+
+def _shape_estimate(
+    rows: int, columns: int, mode: str, timeout: float | None
+) -> tuple[float, str]:
+    """
+    Estimated balancing time of a reaction matrix of this shape (by the cheapest
+    float method of auto that fits) and the reason to reject the reaction
+    (empty string if some method fits or the mode is not balance).
+    """
+    estimates = [
+        estimate_cost(method, rows, columns) for method in ("inv", "gpinv", "ppinv")
+    ]
+    fitting = [
+        e.seconds
+        for e in estimates
+        if e.peak_memory <= Balancer.memory_limit
+        and (timeout is None or e.seconds <= timeout)
+    ]
+    seconds = min(fitting, default=min(e.seconds for e in estimates))
+    if fitting or mode != "balance":
+        return seconds, ""
+    if all(e.peak_memory > Balancer.memory_limit for e in estimates):
+        return seconds, "memory limit"
+    return seconds, "over time budget"
+
+
+def _rejection(reason: str) -> BalancingError:
+    """
+    The error of a reaction rejected by estimate.
+    """
+    message = f"Can't balance reaction by any method: {reason}"
+    if reason == "over time budget":
+        return BalancingTimeout(message)
+    return BalancingError(message)
+
+
+def _estimate_corpus(
+    rows: npt.NDArray[np.int64],
+    columns: npt.NDArray[np.int64],
+    mode: str,
+    timeout: float | None,
+) -> tuple[npt.NDArray[np.float64], dict[int, Exception]]:
+    """
+    Estimated balancing time of every reaction of a corpus and the errors of the
+    rejected reactions (see _shape_estimate), estimated once for every distinct shape.
+    """
+    shapes, inverse = np.unique(np.stack((rows, columns)), axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    estimates = [
+        _shape_estimate(shape_rows, shape_columns, mode, timeout)
+        for shape_rows, shape_columns in shapes.T.tolist()
+    ]
+    costs = np.array([seconds for seconds, _ in estimates])[inverse]
+    rejected: dict[int, Exception] = {
+        i: _rejection(estimates[j][1])
+        for i, j in enumerate(inverse.tolist())
+        if estimates[j][1]
+    }
+    return costs, rejected
+
+
+def _split_range(
+    start: int, end: int, rejected: dict[int, Exception]
+) -> list[tuple[int, int]]:
+    """
+    The parts of a range without the rejected reactions.
+    """
+    parts: list[tuple[int, int]] = []
+    for i in sorted(i for i in rejected if start <= i < end):
+        if i > start:
+            parts.append((start, i))
+        start = i + 1
+    if end > start:
+        parts.append((start, end))
+    return parts
+
+
+def _run_ranges(
+    task: Callable[[str, int, int, dict[str, Any]], list[dict[str, object] | Exception]],
+    path: str,
+    ranges: list[tuple[int, int]],
+    kwargs: dict[str, Any],
+    workers: int,
+) -> Iterator[dict[str, object] | Exception]:
+    """
+    Run a range task of a file over all ranges (in a process pool if
+    there is more than one worker) and yield the results in the range order
+    as soon as every range is done. Only two ranges per worker are submitted
+    ahead; the ranges that are not started are cancelled if the iteration stops.
+    """
+    if workers == 1:
+        for start, end in ranges:
+            yield from task(path, start, end, kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queued = iter(ranges)
+        pending: deque[Future[list[dict[str, object] | Exception]]] = deque(
+            executor.submit(task, path, start, end, kwargs)
+            for start, end in islice(queued, 2 * workers)
+        )
+        try:
+            while pending:
+                results = pending.popleft().result()
+                for start, end in islice(queued, 1):
+                    pending.append(executor.submit(task, path, start, end, kwargs))
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _calculate_text_range(
+    path: str, start: int, end: int, kwargs: dict[str, Any]
+) -> list[dict[str, object] | Exception]:
+    """
+    Calculate the reactions of a byte range of a text file (a worker task).
+    """
+    return calculate_batch(read_lines(path, start, end), **kwargs)
+
+
+def iter_file(
+    path: str,
+    mode: str = "balance",
+    target: int = 0,
+    target_mass: float = 1.0,
+    precision: int = 8,
+    intify: bool = True,
+    workers: int | None = None,
+    timeout: float | None = None,
+    offsets: npt.NDArray[Any] | None = None,
+) -> Iterator[dict[str, object] | Exception]:
+    """
+    Calculate the output results of all reactions of a text file (one per
+    line, empty lines are skipped) in parallel processes and yield them in the
+    file order as soon as every byte range is done. Every worker reads
+    its own byte range of the file and calculates it with
+    [calculate_batch][chemsynthcalc.batch.calculate_batch].
+
+    Parameters:
+        path (str): Path of the text file
+        mode (str): Coefficients calculation mode
+        target (int): Index of target compound
+        target_mass (float): Desired mass of target compound (in grams)
+        precision (int): Value of rounding precision
+        intify (bool): Is it required to convert the coefficients to integer values?
+        workers (int | None): Number of processes (os.cpu_count() by default, 1 runs in this process)
+        timeout (float | None): Time budget of balancing of every reaction (in seconds, no limit by default)
+        offsets (npt.NDArray[Any] | None): Line offsets of the file if they are already known (see [line_offsets][chemsynthcalc.corpus.line_offsets])
+
+    Yields:
+        [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results]
+        or exception for every non-empty line (in the file order)
+
+    Examples:
+        >>> for result in iter_file("bench/text_mined_reactions.txt", workers=4):
+        ...     print(result["final reaction"])
+    """
+    kwargs: dict[str, Any] = {
+        "mode": mode,
+        "target": target,
+        "target_mass": target_mass,
+        "precision": precision,
+        "intify": intify,
+        "timeout": timeout,
+    }
+    workers = workers or os.cpu_count() or 1
+    if offsets is None:
+        offsets = line_offsets(path)
+    ranges = line_ranges(offsets, workers * 4 if workers > 1 else 1)
+    yield from _run_ranges(_calculate_text_range, path, ranges, kwargs, workers)
+
+
+def calculate_file(
+    path: str,
+    mode: str = "balance",
+    target: int = 0,
+    target_mass: float = 1.0,
+    precision: int = 8,
+    intify: bool = True,
+    workers: int | None = None,
+    timeout: float | None = None,
+    offsets: npt.NDArray[Any] | None = None,
+) -> list[dict[str, object] | Exception]:
+    """
+    All results of [iter_file][chemsynthcalc.batch.iter_file] in one list
+    (for small files: iterate over iter_file to process a large file).
+
+    Returns:
+        [output_results][chemsynthcalc.chemical_reaction.ChemicalReaction.output_results]
+        or exception for every non-empty line (in the file order)
+
+    Examples:
+        >>> calculate_file("bench/text_mined_reactions.txt", workers=4)
+    """
+    return list(
+        iter_file(
+            path, mode, target, target_mass, precision, intify, workers, timeout, offsets
+        )
+    )
@@ -0,0 +1,227 @@
+"""
+Exception-free validation of many formulas or reactions.
+
+[ReactionValidator][chemsynthcalc.reaction_validator.ReactionValidator] and
+[FormulaValidator][chemsynthcalc.formula_validator.FormulaValidator] raise on
+the first problem. Here every input gets a report with all of its problems
+(named after the errors the validators would raise), so noisy inputs can be
+screened without exceptions. An input is valid here only when the
+validators accept it. Misordered brackets like )O( are also reported
+(the validators only compare the counts of brackets, and the parser can't
+handle them).
+
+All regular expressions are compiled once, the positions of the problems
+are searched for only if a cheap check fails, and the results of the compound
+checks are cached (the same compounds repeat a lot in large inputs).
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+from .formula import Formula
+from .periodic_table import ATOMS
+from .reaction import Reaction
+
+_FORMULA = Formula("")
+_REACTION = Reaction("")
+_INVALID_FORMULA_CHARACTER = re.compile(_FORMULA.allowed_symbols)
+_INVALID_REACTION_CHARACTER = re.compile(_REACTION.allowed_symbols)
+_ATOM = re.compile(_FORMULA.atom_regex)
+_LOWERCASE = re.compile(r"[a-z]")
+_COEFFICIENT = re.compile(r"\d[\d.]*")
+
+
+class ValidationIssue(NamedTuple):
+    """
+    One problem of a formula or a reaction.
+
+    Attributes:
+        error (str): Name of the error that the validators would raise (like "NoSuchAtom")
+        text (str): The offending substring (empty if not applicable)
+        position (int): Position of the substring in the formula or compound (-1 if not applicable)
+        compound (int): Index of the compound in the reaction (-1 for the problems of the whole reaction)
+    """
+
+    error: str
+    text: str
+    position: int
+    compound: int
+
+
+class ValidationReport(NamedTuple):
+    """
+    Validation result of one input string.
+
+    Attributes:
+        text (str): The input string
+        issues (list[ValidationIssue]): All problems found (empty if the input is valid)
+    """
+
+    text: str
+    issues: list[ValidationIssue]
+
+    @property
+    def valid(self) -> bool:
+        return not self.issues
+
+
+@lru_cache(maxsize=65536)
+def _formula_issues(
+    formula: str, in_reaction: bool = False
+) -> tuple[tuple[str, str, int], ...]:
+    """
+    All problems of a formula string (without spaces) as (error, text, position)
+    tuples, cached by formula: the compounds repeat a lot in large inputs.
+    In reactions, the characters that are invalid in any reaction are not
+    reported (they are reported for the whole reaction).
+    """
+    if formula == "":
+        return (("EmptyFormula", "", -1),)
+
+    issues: list[tuple[str, str, int]] = []
+    if _INVALID_FORMULA_CHARACTER.search(formula):
+        issues.extend(
+            ("InvalidCharacter", match.group(), match.start())
+            for match in _INVALID_FORMULA_CHARACTER.finditer(formula)
+            if not (in_reaction and _INVALID_REACTION_CHARACTER.match(match.group()))
+        )
+
+    atoms = _ATOM.findall(formula)
+    if not ATOMS.issuperset(atoms) or _LOWERCASE.search(_ATOM.sub("", formula)):
+        covered: set[int] = set()
+        for match in _ATOM.finditer(formula):
+            covered.update(range(match.start(), match.end()))
+            if match.group() not in ATOMS:
+                issues.append(("NoSuchAtom", match.group(), match.start()))
+        issues.extend(
+            ("NoSuchAtom", match.group(), match.start())
+            for match in _LOWERCASE.finditer(formula)
+            if match.start() not in covered
+        )
+
+    for opener, closer in zip(_FORMULA.opener_brackets, _FORMULA.closer_brackets):
+        # the counts can be equal for misordered brackets like )O(
+        if opener in formula or closer in formula:
+            openers: list[int] = []
+            unpaired: list[int] = []
+            for position, symbol in enumerate(formula):
+                if symbol == opener:
+                    openers.append(position)
+                elif symbol == closer:
+                    if openers:
+                        openers.pop()
+                    else:
+                        unpaired.append(position)
+            issues.extend(
+                ("BracketsNotPaired", formula[position], position)
+                for position in sorted(unpaired + openers)
+            )
+
+    if sum(formula.count(adduct) for adduct in _FORMULA.adduct_symbols) > 1:
+        adducts = [i for i, s in enumerate(formula) if s in _FORMULA.adduct_symbols]
+        issues.extend(
+            ("MoreThanOneAdduct", formula[position], position)
+            for position in adducts[1:]
+        )
+    return tuple(issues)
+
+
+@lru_cache(maxsize=65536)
+def _compound_issues(compound: str) -> tuple[tuple[str, str, int], ...]:
+    """
+    All problems of a compound of a reaction (a formula with an optional coefficient).
+    The coefficient is split off the same way as in
+    [ReactionDecomposer][chemsynthcalc.reaction_decomposer.ReactionDecomposer].
+    """
+    coefficient = _COEFFICIENT.match(compound)
+    if coefficient is None:
+        return _formula_issues(compound, True)
+    # a compound of digits only keeps its last symbol
+    end = min(coefficient.end(), len(compound) - 1)
+    issues = _formula_issues(compound[end:], True)
+    if compound[:end].count(".") > 1:
+        # ReactionDecomposer can't convert the coefficient to float
+        return (("ValueError", compound[:end], 0),) + issues
+    return issues
+
+
+def _reaction_issues(reaction: str) -> list[ValidationIssue]:
+    """
+    All problems of a reaction string and of its compounds.
+    """
+    if reaction == "":
+        return [ValidationIssue("EmptyReaction", "", -1, -1)]
+
+    issues: list[ValidationIssue] = []
+    if _INVALID_REACTION_CHARACTER.search(reaction):
+        issues.extend(
+            ValidationIssue("InvalidCharacter", match.group(), match.start(), -1)
+            for match in _INVALID_REACTION_CHARACTER.finditer(reaction)
+        )
+    stripped = reaction.replace(" ", "")
+    separator = Reaction(stripped).extract_separator()
+    if separator == "":
+        issues.append(ValidationIssue("NoSeparator", "", -1, -1))
+        return issues
+    if _REACTION.reactant_separator not in reaction:
+        issues.append(
+            ValidationIssue("NoSeparator", _REACTION.reactant_separator, -1, -1)
+        )
+
+    reactants, products = stripped.split(separator)[:2]
+    compounds = reactants.split(_REACTION.reactant_separator) + products.split(
+        _REACTION.reactant_separator
+    )
+    for index, compound in enumerate(compounds):
+        for error, text, position in _compound_issues(compound):
+            issues.append(ValidationIssue(error, text, position, index))
+    return issues
+
+
+def validate_formulas(formulas: Iterable[str]) -> list[ValidationReport]:
+    """
+    Validate many formula strings without raising exceptions.
+
+    Parameters:
+        formulas (Iterable[str]): Formula strings
+
+    Returns:
+        A [ValidationReport][chemsynthcalc.batch_validation.ValidationReport] for every formula
+
+    Examples:
+        >>> validate_formulas(["H2O", "Xx2(SO4"])[1].issues
+        [ValidationIssue(error='NoSuchAtom', text='Xx', position=0, compound=-1),
+        ValidationIssue(error='BracketsNotPaired', text='(', position=3, compound=-1)]
+    """
+    return [
+        ValidationReport(
+            formula,
+            [
+                ValidationIssue(error, text, position, -1)
+                for error, text, position in _formula_issues(formula.replace(" ", ""))
+            ],
+        )
+        for formula in formulas
+    ]
+
+
+def validate_reactions(reactions: Iterable[str]) -> list[ValidationReport]:
+    """
+    Validate many reaction strings (and all of their compounds) without raising exceptions.
+
+    Parameters:
+        reactions (Iterable[str]): Reaction strings
+
+    Returns:
+        A [ValidationReport][chemsynthcalc.batch_validation.ValidationReport] for every reaction
+        (the positions of compound problems are in the compound string)
+
+    Examples:
+        >>> validate_reactions(["H2+O2=H2O", "H2+O2$=H2O*H2O*H2O"])[1].issues
+        [ValidationIssue(error='InvalidCharacter', text='$', position=5, compound=-1),
+        ValidationIssue(error='MoreThanOneAdduct', text='*', position=7, compound=2)]
+    """
+    return [
+        ValidationReport(reaction, _reaction_issues(reaction)) for reaction in reactions
+    ]
@@ -0,0 +1,241 @@
+"""
+Canonical (spelling-independent) forms of formulas and reactions.
+
+Two formulas with the same element counts, like Y2(CO3)3 and Y2C3O9, have
+the same Hill formula. Two reactions that differ only in the order of
+compounds, whitespace, separator or formula spelling have the same
+[ReactionKey][chemsynthcalc.canonical.ReactionKey].
+"""
+
+import hashlib
+from typing import Iterable, NamedTuple, Sequence, TypeVar
+
+from .formula_parser import ChemicalFormulaParser
+from .reaction_decomposer import ReactionDecomposer
+from .reaction_validator import ReactionValidator
+
+T = TypeVar("T")
+
+
+def _format_count(count: float) -> str:
+    if count == 1:
+        return ""
+    if float(count).is_integer():
+        return str(int(count))
+    return f"{count:.12g}"
+
+
+def hill_formula(parsed_formula: dict[str, float]) -> str:
+    """
+    A formula in [Hill notation](https://en.wikipedia.org/wiki/Chemical_formula#Hill_system):
+    C first, H second, then all other elements in alphabetical order
+    (all elements in alphabetical order if there is no C).
+
+    Parameters:
+        parsed_formula (dict[str, float]): A parsed formula (counts of the same element are already merged)
+
+    Returns:
+        The canonical formula string
+
+    Examples:
+        >>> hill_formula(ChemicalFormulaParser("(CO3)3Y2").parse_formula())
+        C3O9Y2
+        >>> hill_formula({"H": 2.0, "O": 1.0})
+        H2O
+    """
+    if "C" in parsed_formula:
+        order = ["C"] + (["H"] if "H" in parsed_formula else [])
+        order += sorted(set(parsed_formula) - {"C", "H"})
+    else:
+        order = sorted(parsed_formula)
+    return "".join(
+        element + _format_count(parsed_formula[element])
+        for element in order
+        if parsed_formula[element] != 0
+    )
+
+
+def composition_hash(parsed_formula: dict[str, float]) -> int:
+    """
+    A stable (the same in every process and Python version) 64-bit hash
+    of the element counts of a formula.
+
+    Parameters:
+        parsed_formula (dict[str, float]): A parsed formula
+
+    Returns:
+        An unsigned 64-bit integer
+
+    Examples:
+        >>> composition_hash({"H": 2.0, "O": 1.0}) == composition_hash({"O": 1, "H": 2})
+        True
+    """
+    digest = hashlib.blake2b(
+        hill_formula(parsed_formula).encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+class ReactionKey(NamedTuple):
+    """
+    Canonical key of a reaction: sorted Hill formulas of reactants and products
+    (prefixed with the coefficients if they are a part of the key).
+    """
+
+    reactants: tuple[str, ...]
+    products: tuple[str, ...]
+
+    @property
+    def hash(self) -> int:
+        """
+        A stable 64-bit hash of the key.
+        """
+        text = "+".join(self.reactants) + "=" + "+".join(self.products)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+
+def _canonical_compounds(
+    reaction: str, with_coefficients: bool, formulas: dict[str, str] | None = None
+) -> tuple[ReactionKey, tuple[int, ...]]:
+    """
+    Reaction key and the canonical order of compounds: the i-th compound
+    of the key is the order[i]-th compound of the reaction string.
+    Hill formulas of the compounds are looked up in (and added to) the formulas dict.
+    """
+    ReactionValidator(reaction).validate_reaction()
+    decomposed = ReactionDecomposer(reaction.replace(" ", ""))
+    if formulas is None:
+        formulas = {}
+    entries: list[str] = []
+    for compound in decomposed.compounds:
+        entry = formulas.get(compound)
+        if entry is None:
+            entry = hill_formula(ChemicalFormulaParser(compound).parse_formula())
+            formulas[compound] = entry
+        entries.append(entry)
+    if with_coefficients:
+        entries = [
+            _format_count(coefficient) + entry
+            for coefficient, entry in zip(decomposed.initial_coefficients, entries)
+        ]
+    separator = len(decomposed.reactants)
+    order = tuple(
+        sorted(range(separator), key=entries.__getitem__)
+        + sorted(range(separator, len(entries)), key=entries.__getitem__)
+    )
+    key = ReactionKey(
+        tuple(entries[i] for i in order[:separator]),
+        tuple(entries[i] for i in order[separator:]),
+    )
+    return key, order
+
+
+def reaction_key(reaction: str, with_coefficients: bool = False) -> ReactionKey:
+    """
+    Canonical key of a reaction string.
+
+    Parameters:
+        reaction (str): A reaction string
+        with_coefficients (bool): Make the coefficients of the reaction string a part of the key
+
+    Returns:
+        A [ReactionKey][chemsynthcalc.canonical.ReactionKey]
+
+    Raise:
+        The errors of [ReactionValidator][chemsynthcalc.reaction_validator.ReactionValidator]
+        and [ChemicalFormulaParser][chemsynthcalc.formula_parser.ChemicalFormulaParser]
+
+    Examples:
+        >>> reaction_key("H2 + O2 -> H2O") == reaction_key("O2+H2=H2O")
+        True
+        >>> reaction_key("Y2(CO3)3=Y2O3+CO2")
+        ReactionKey(reactants=('C3O9Y2',), products=('CO2', 'O3Y2'))
+    """
+    return _canonical_compounds(reaction, with_coefficients)[0]
+
+
+class DedupedReactions(NamedTuple):
+    """
+    Result of [dedupe][chemsynthcalc.canonical.dedupe].
+
+    Attributes:
+        unique (list[int]): Input index of the first reaction of every group
+        groups (list[int]): Group number of every input reaction
+        orders (list[tuple[int, ...]]): Canonical order of compounds of every
+        input reaction (empty for reactions that can't be parsed, each of them is a group of its own)
+    """
+
+    unique: list[int]
+    groups: list[int]
+    orders: list[tuple[int, ...]]
+
+    def expand(self, values: Sequence[T]) -> list[T]:
+        """
+        Fan out one value per group to every input reaction.
+
+        Parameters:
+            values (Sequence[T]): A value for every group (in the order of unique)
+
+        Returns:
+            A value for every input reaction
+        """
+        return [values[group] for group in self.groups]
+
+    def permute(self, index: int, compound_values: Sequence[T]) -> list[T]:
+        """
+        Reorder the per-compound values (like coefficients) of the first
+        reaction of a group to the compound order of another reaction of the group.
+
+        Parameters:
+            index (int): Input index of a reaction
+            compound_values (Sequence[T]): Values in the compound order of the group's first reaction
+
+        Returns:
+            Values in the compound order of the reaction
+        """
+        first = self.orders[self.unique[self.groups[index]]]
+        order = self.orders[index]
+        result: list[T] = list(compound_values)
+        for canonical_position, position in enumerate(order):
+            result[position] = compound_values[first[canonical_position]]
+        return result
+
+
+def dedupe(reactions: Iterable[str], with_coefficients: bool = False) -> DedupedReactions:
+    """
+    Group the reactions that have the same canonical key.
+
+    Parameters:
+        reactions (Iterable[str]): Reaction strings
+        with_coefficients (bool): Reactions with different coefficients are different (for force and check modes)
+
+    Returns:
+        [DedupedReactions][chemsynthcalc.canonical.DedupedReactions]
+
+    Examples:
+        >>> deduped = dedupe(["H2+O2=H2O", "O2 + H2 -> H2O", "CaCO3=CaO+CO2"])
+        >>> deduped.unique, deduped.groups
+        ([0, 2], [0, 0, 1])
+        >>> deduped.permute(1, [2, 1, 2])
+        [1, 2, 2]
+    """
+    seen: dict[ReactionKey, int] = {}
+    formulas: dict[str, str] = {}
+    unique: list[int] = []
+    groups: list[int] = []
+    orders: list[tuple[int, ...]] = []
+    for index, reaction in enumerate(reactions):
+        try:
+            key, order = _canonical_compounds(reaction, with_coefficients, formulas)
+        except Exception:
+            key, order = None, ()
+        group = seen.get(key) if key is not None else None
+        if group is None:
+            group = len(unique)
+            unique.append(index)
+            if key is not None:
+                seen[key] = group
+        groups.append(group)
+        orders.append(order)
+    return DedupedReactions(unique, groups, orders)
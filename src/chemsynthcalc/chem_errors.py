@@ -110,3 +110,11 @@ class BalancingError(Exception):
     """
 
     pass
+
+
+class BalancingTimeout(BalancingError):
+    """
+    The time budget of balancing ran out
+    """
+
+    pass
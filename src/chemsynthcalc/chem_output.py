@@ -2,8 +2,7 @@ import sys
 import time
 import json
 
-import numpy as np
-
+from .instrumentation import timed
 from .utils import round_dict_content
 
 
@@ -46,6 +45,7 @@ class ChemicalOutput:
         self.rounded_values: dict[str, object] = self._round_values()
         self.original_stdout = sys.stdout
 
+    @timed("output", lambda self: {"object": self.obj})
     def _round_values(self) -> dict[str, object]:
         """
         Round values of output dictionary to the print_precision.
@@ -63,6 +63,8 @@ class ChemicalOutput:
             elif name == "masses":
                 rounded_value = [round(v, self.print_precision) for v in value]  # type: ignore
             elif name == "reaction matrix":
+                import numpy as np
+
                 rounded_value = np.array2string(value)  # type: ignore
             else:
                 rounded_value = value
@@ -141,6 +143,7 @@ class ChemicalOutput:
 
         sys.stdout = self.original_stdout
 
+    @timed("serialization", lambda self: {"object": self.obj})
     def dump_to_json(self) -> str:
         """
         Serialization of output into JSON object.
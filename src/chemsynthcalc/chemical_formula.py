@@ -1,12 +1,33 @@
-from functools import lru_cache
+from fractions import Fraction
+from functools import cached_property, lru_cache
 
+from .canonical import composition_hash, hill_formula
 from .chem_output import ChemicalOutput
 from .formula_parser import ChemicalFormulaParser
 from .formula_validator import FormulaValidator
 from .molar_mass import MolarMassCalculation
+from .periodic_table import element_mask
 from .utils import round_dict_content
 
 
+@lru_cache(maxsize=8192)
+def _parse(formula: str, precision: int) -> tuple[tuple[str, float], ...]:
+    """
+    Parse a formula string (cached by spelling and precision).
+    """
+    parsed: dict[str, float] = ChemicalFormulaParser(formula).parse_formula()
+    return tuple(round_dict_content(parsed, precision, plus=3).items())
+
+
+@lru_cache(maxsize=8192)
+def _molar_mass(composition: tuple[tuple[str, float], ...]) -> float:
+    """
+    Molar mass of a composition (cached by composition, so different
+    spellings of the same formula share a cache entry).
+    """
+    return MolarMassCalculation(dict(composition)).calculate_molar_mass()
+
+
 class ChemicalFormula:
     """A class for operations on a single chemical formula.
 
@@ -58,7 +79,6 @@ class ChemicalFormula:
         return f"ChemicalFormula('{self.formula}', {self.precision})"
 
     @property
-    @lru_cache(maxsize=1)
     def formula(self) -> str:
         """
         A string of chemical formula.
@@ -73,8 +93,7 @@ class ChemicalFormula:
         """
         return self.initial_formula
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def parsed_formula(self) -> dict[str, float]:
         """
         Formula parsed into dictionary keeping the initial atom order.
@@ -87,11 +106,75 @@ class ChemicalFormula:
             >>> ChemicalFormula("K2SO4").parsed_formula
             {'K': 2.0, 'S': 1.0, 'O': 4.0}
         """
-        parsed: dict[str, float] = ChemicalFormulaParser(self.formula).parse_formula()
-        return round_dict_content(parsed, self.precision, plus=3)
+        return dict(_parse(self.formula, self.precision))
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
+    def canonical(self) -> str:
+        """
+        Formula in [Hill notation](https://en.wikipedia.org/wiki/Chemical_formula#Hill_system)
+        with merged atom counts: the same string for every spelling of a composition.
+
+        Returns:
+            The canonical formula string, see [hill_formula][chemsynthcalc.canonical.hill_formula]
+
+        Examples:
+            >>> ChemicalFormula("Y2(CO3)3").canonical
+            C3O9Y2
+            >>> ChemicalFormula("(CO3)3Y2").canonical
+            C3O9Y2
+        """
+        return hill_formula(self.parsed_formula)
+
+    @cached_property
+    def composition_hash(self) -> int:
+        """
+        A stable 64-bit hash of the composition (the same for every spelling,
+        every process and every Python version), to be used as a cache key.
+
+        Returns:
+            An unsigned 64-bit integer, see [composition_hash][chemsynthcalc.canonical.composition_hash]
+
+        Examples:
+            >>> ChemicalFormula("Y2(CO3)3").composition_hash == ChemicalFormula("Y2C3O9").composition_hash
+            True
+        """
+        return composition_hash(self.parsed_formula)
+
+    @cached_property
+    def element_mask(self) -> int:
+        """
+        Element-presence bitmask of the formula: bit i is set if the formula
+        contains the i-th element of the periodic table (see
+        [element_mask][chemsynthcalc.periodic_table.element_mask]).
+
+        Returns:
+            A 128-bit integer
+
+        Examples:
+            >>> ChemicalFormula("H2O").element_mask
+            129
+            >>> ChemicalFormula("H2O").element_mask ^ ChemicalFormula("H2O2").element_mask
+            0
+        """
+        return element_mask(self.parsed_formula)
+
+    @cached_property
+    def exact_parsed_formula(self) -> dict[str, Fraction]:
+        """
+        Formula parsed into dictionary of exact (not rounded) fractions.
+        Used to balance non-stoichiometric compounds without rounding errors.
+
+        Returns:
+            Parsed dictionary of fractions created by \
+            [ChemicalFormulaParser][chemsynthcalc.formula_parser.ChemicalFormulaParser]
+
+        Examples:
+            >>> ChemicalFormula("Li0.95CoO2").exact_parsed_formula
+            {'Li': Fraction(19, 20), 'Co': Fraction(1, 1), 'O': Fraction(2, 1)}
+        """
+        return ChemicalFormulaParser(self.formula, exact=True).parse_formula()  # type: ignore
+
+    @cached_property
     def molar_mass(self) -> float:
         """
         Molar mass of the compound.
@@ -105,13 +188,10 @@ class ChemicalFormula:
             >>> ChemicalFormula("K2SO4").molar_mass
             174.252
         """
-        return round(
-            MolarMassCalculation(self.parsed_formula).calculate_molar_mass(),
-            self.precision,
-        )
+        composition = tuple(sorted(self.parsed_formula.items()))
+        return round(_molar_mass(composition), self.precision)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def mass_percent(self) -> dict[str, float]:
         """
         The percentage of mass of atoms in the formula.
@@ -129,8 +209,7 @@ class ChemicalFormula:
         output = MolarMassCalculation(self.parsed_formula).calculate_mass_percent()
         return round_dict_content(output, self.precision)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def atomic_percent(self) -> dict[str, float]:
         """
         Atomic percents of atoms in the formula.
@@ -149,8 +228,7 @@ class ChemicalFormula:
         output = MolarMassCalculation(self.parsed_formula).calculate_atomic_percent()
         return round_dict_content(output, self.precision)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def oxide_percent(self) -> dict[str, float]:
         """
         Oxide percents of metals in formula. Custom oxide formulas can be provided
@@ -175,8 +253,7 @@ class ChemicalFormula:
         )
         return round_dict_content(output, self.precision)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def output_results(self) -> dict[str, object]:
         """
         Dictionary of the calculation result output for class.
@@ -1,17 +1,38 @@
+import copy
 from functools import cached_property, lru_cache
+from typing import Any, NamedTuple
 
 import numpy as np
 import numpy.typing as npt
 
-from .balancer import Balancer
+from .balancer import Balancer, BalancingAttempt
 from .chem_output import ChemicalOutput
 from .chemical_formula import ChemicalFormula
 from .coefs import Coefficients
+from .exact import ExactMatrix, exact_reaction_matrix, is_stoichiometric
 from .reaction_decomposer import ReactionDecomposer
 from .reaction_matrix import ChemicalReactionMatrix
 from .reaction_validator import ReactionValidator
 
 
+class LimitingReagents(NamedTuple):
+    """
+    Result of [limiting_reagents][chemsynthcalc.chemical_reaction.ChemicalReaction.limiting_reagents]
+    for every experiment (a vector of available masses of the reactants).
+
+    Attributes:
+        limiting (npt.NDArray[np.int64]): Index of the limiting reactant
+        theoretical_yield (npt.NDArray[np.float64]): Mass of the target compound (in grams)
+        excess (npt.NDArray[np.float64]): Unreacted mass of every reactant (in grams), shape (experiments, reactants)
+        masses (npt.NDArray[np.float64]): Reacted (or formed) mass of every compound (in grams), shape (experiments, compounds)
+    """
+
+    limiting: npt.NDArray[np.int64]
+    theoretical_yield: npt.NDArray[np.float64]
+    excess: npt.NDArray[np.float64]
+    masses: npt.NDArray[np.float64]
+
+
 class ChemicalReaction:
     """
     A class that represents a chemical reaction and do operations on it.
@@ -32,6 +53,12 @@ class ChemicalReaction:
         Unlike other properties of this class, the [coefficients][chemsynthcalc.chemical_reaction.ChemicalReaction.coefficients]
         property can be set directly.
 
+    Note:
+        The target, target_mass, precision, mode, intify and coefficients can be changed
+        after the object creation. Only the cached properties that depend on the changed
+        value (see `_dependents`) are recalculated, so changing the target or the target
+        mass reuses the decomposition, matrix and coefficients of the reaction.
+
     Arguments:
         reaction (str): A reaction string
         mode (str): Coefficients calculation mode
@@ -39,14 +66,37 @@ class ChemicalReaction:
         target_mass (float): Desired mass of target compound (in grams)
         precision (int): Value of rounding precision (8 by default)
         intify (bool): Is it required to convert the coefficients to integer values?
+        timeout (float | None): Time budget of balancing (in seconds, no limit by default),
+        see [Balancer][chemsynthcalc.balancer.Balancer]
 
     Attributes:
         algorithm (str): Currently used calculation algorithm
 
     Raise:
-        ValueError if precision or target mass <= 0
+        ValueError if precision, target mass or timeout <= 0
     """
 
+    _dependents: dict[str, tuple[str, ...]] = {
+        "precision": ("chemformula_objs", "balancer", "normalized_coefficients"),
+        "chemformula_objs": ("parsed_formulas", "exact_matrix", "molar_masses"),
+        "parsed_formulas": ("matrix",),
+        "exact_matrix": ("balancer",),
+        "matrix": ("balancer",),
+        "intify": ("balancer",),
+        "timeout": ("balancer",),
+        "balancer": ("coefficients",),
+        "mode": ("coefficients", "output_results"),
+        "coefficients": ("normalized_coefficients", "final_reaction"),
+        "initial_target": ("_calculated_target",),
+        "_calculated_target": ("normalized_coefficients", "masses", "output_results"),
+        "normalized_coefficients": ("final_reaction_normalized", "masses"),
+        "molar_masses": ("masses",),
+        "target_mass": ("masses",),
+        "final_reaction": ("output_results",),
+        "final_reaction_normalized": ("output_results",),
+        "masses": ("output_results",),
+    }
+
     def __init__(
         self,
         reaction: str = "",
@@ -55,31 +105,185 @@ class ChemicalReaction:
         target_mass: float = 1.0,
         precision: int = 8,
         intify: bool = True,
+        timeout: float | None = None,
     ) -> None:
         if ReactionValidator(reaction).validate_reaction():
             self.initial_reaction = reaction.replace(" ", "")
+        self._set_arguments(mode, target, target_mass, precision, intify, timeout)
 
-        if precision > 0:
-            self.precision: int = precision
-        else:
-            raise ValueError("precision <= 0")
-
-        if target_mass > 0:
-            self.target_mass: float = target_mass
-        else:
-            raise ValueError("target mass <= 0")
-
+    def _set_arguments(
+        self,
+        mode: str = "balance",
+        target: int = 0,
+        target_mass: float = 1.0,
+        precision: int = 8,
+        intify: bool = True,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Set the calculation arguments of the reaction (see the class arguments).
+        """
+        self.precision = precision
+        self.target_mass = target_mass
         self.intify: bool = intify
+        self.timeout = timeout
         self.mode: str = mode
         self.algorithm: str = "user"
         self.initial_target: int = target
 
+    @classmethod
+    def from_decomposition(
+        cls, decomposed_reaction: ReactionDecomposer, **kwargs: Any
+    ) -> "ChemicalReaction":
+        """
+        A ChemicalReaction of an already validated and decomposed reaction
+        (for example, of a [CompiledCorpus][chemsynthcalc.corpus.CompiledCorpus]):
+        the reaction string is not validated and decomposed again.
+
+        Arguments:
+            decomposed_reaction (ReactionDecomposer): Decomposition of a valid reaction
+            **kwargs (Any): Other ChemicalReaction arguments (mode, target, target_mass, precision, intify, timeout)
+
+        Returns:
+            A ChemicalReaction object
+
+        Examples:
+            >>> ChemicalReaction.from_decomposition(ReactionDecomposer("H2+O2=H2O")).coefficients
+            [2, 1, 2]
+        """
+        reaction = cls.__new__(cls)
+        reaction.initial_reaction = decomposed_reaction.reaction
+        reaction._set_arguments(**kwargs)
+        reaction.decomposed_reaction = decomposed_reaction
+        return reaction
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        self._invalidate(name)
+
+    def _invalidate(self, name: str) -> None:
+        """
+        Drop the cached properties that depend on the changed attribute
+        (directly or through other cached properties).
+
+        Arguments:
+            name (str): Name of the changed attribute or property
+        """
+        for dependent in self._dependents.get(name, ()):
+            self.__dict__.pop(dependent, None)
+            self._invalidate(dependent)
+
     def __repr__(self) -> str:
         return f"ChemicalReaction({self.reaction}, {self.mode}, {self.initial_target}, {self.target_mass}, {self.precision}, {self.intify})"
 
     def __str__(self) -> str:
         return self.reaction
 
+    @property
+    def precision(self) -> int:
+        """
+        Value of rounding precision. Changing it recalculates everything
+        except the decomposed reaction.
+
+        Raise:
+            ValueError if precision <= 0
+        """
+        return self._precision
+
+    @precision.setter
+    def precision(self, value: int) -> None:
+        if value > 0:
+            self._precision: int = value
+        else:
+            raise ValueError("precision <= 0")
+
+    @property
+    def timeout(self) -> float | None:
+        """
+        Time budget of balancing (in seconds). If the coefficients can't be
+        calculated in time, [BalancingTimeout][chemsynthcalc.chem_errors.BalancingTimeout] is raised.
+
+        Raise:
+            ValueError if timeout <= 0
+
+        Examples:
+            >>> ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl", timeout=0.5).coefficients
+            [2, 16, 2, 5, 8, 2]
+        """
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: float | None) -> None:
+        if value is None or value > 0:
+            self._timeout: float | None = value
+        else:
+            raise ValueError("timeout <= 0")
+
+    @property
+    def target_mass(self) -> float:
+        """
+        Desired mass of target compound (in grams). Changing it
+        recalculates only the masses.
+
+        Raise:
+            ValueError if target mass <= 0
+
+        Examples:
+            >>> reaction = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl")
+            >>> reaction.target_mass = 2
+            >>> reaction.masses
+            [2.51167356, 4.63554571, 2.0, 2.8171131, 1.14528164, 1.18482453]
+        """
+        return self._target_mass
+
+    @target_mass.setter
+    def target_mass(self, value: float) -> None:
+        if value > 0:
+            self._target_mass: float = value
+        else:
+            raise ValueError("target mass <= 0")
+
+    @property
+    def target(self) -> int:
+        """
+        Index of target compound (same as initial_target). Changing it
+        recalculates only the normalized coefficients and the masses.
+
+        Examples:
+            >>> reaction = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl")
+            >>> reaction.target = -1
+            >>> reaction.normalized_coefficients
+            [0.125, 1, 0.125, 0.3125, 0.5, 0.125]
+        """
+        return self.initial_target
+
+    @target.setter
+    def target(self, value: int) -> None:
+        self.initial_target = value
+
+    def with_target(
+        self, target: int | None = None, target_mass: float | None = None
+    ) -> "ChemicalReaction":
+        """
+        A copy of the reaction with a new target and/or target mass, for
+        calls like `reaction.with_target(1, 3.0).masses`. The copy shares the
+        cached decomposition, matrix and coefficients of this object, which
+        itself is not changed.
+
+        Arguments:
+            target (int | None): New index of target compound
+            target_mass (float | None): New mass of target compound (in grams)
+
+        Returns:
+            A new ChemicalReaction object
+        """
+        reaction = copy.copy(self)
+        if target is not None:
+            reaction.target = target
+        if target_mass is not None:
+            reaction.target_mass = target_mass
+        return reaction
+
     @property
     @lru_cache(maxsize=1)
     def reaction(self) -> str:
@@ -96,8 +300,7 @@ class ChemicalReaction:
         """
         return self.initial_reaction
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def decomposed_reaction(self) -> ReactionDecomposer:
         """
         Decomposition of chemical reaction string and extraction of
@@ -112,8 +315,7 @@ class ChemicalReaction:
         """
         return ReactionDecomposer(self.reaction)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def _calculated_target(self) -> int:
         """
         Checks if initial_target is in the reaction's compounds range,
@@ -129,17 +331,32 @@ class ChemicalReaction:
             >>> ChemicalReaction("H2+O2=H2O")._calculated_target
             2
         """
+        return self._target_to_index(self.initial_target)
+
+    def _target_to_index(self, target: int) -> int:
+        """
+        Convert a target integer (index in products, can be negative)
+        to the index of the compound in the compounds list.
+
+        Arguments:
+            target (int): Target integer
+
+        Returns:
+            Index of the target compound
+
+        Raise:
+            IndexError if The target integer is not in the range
+        """
         high = len(self.decomposed_reaction.products) - 1
         low = -len(self.decomposed_reaction.reactants)
-        if self.initial_target <= high and self.initial_target >= low:
-            return self.initial_target - low
+        if target <= high and target >= low:
+            return target - low
         else:
             raise IndexError(
-                f"The target integer {self.initial_target} should be in range {low} : {high}"
+                f"The target integer {target} should be in range {low} : {high}"
             )
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def chemformula_objs(self) -> list[ChemicalFormula]:
         """Decomposition of a list of formulas from the decomposed_reaction.
 
@@ -155,8 +372,7 @@ class ChemicalReaction:
             for formula in self.decomposed_reaction.compounds
         ]
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def parsed_formulas(self) -> list[dict[str, float]]:
         """
         List of formulas parsed by [ChemicalFormulaParser][chemsynthcalc.formula_parser.ChemicalFormulaParser]
@@ -167,8 +383,7 @@ class ChemicalReaction:
         """
         return [compound.parsed_formula for compound in self.chemformula_objs]
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def matrix(self) -> npt.NDArray[np.float64]:
         """Chemical reaction matrix.
 
@@ -191,8 +406,30 @@ class ChemicalReaction:
         """
         return ChemicalReactionMatrix(self.parsed_formulas).matrix
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
+    def exact_matrix(self) -> ExactMatrix | None:
+        """
+        Reaction matrix of exact fractions for reactions with non-stoichiometric
+        (decimal) compounds, so that they are balanced in exact arithmetic
+        (see [exact][chemsynthcalc.balancer.Balancer.exact]).
+
+        Returns:
+            A list of rows of fractions or None if all atom amounts are integers
+
+        Examples:
+            >>> ChemicalReaction("Li2CO3+CoO+O2=Li0.95CoO2+Li2O+CO2").exact_matrix
+            [[Fraction(2, 1), Fraction(0, 1), Fraction(0, 1), Fraction(19, 20), Fraction(2, 1), Fraction(0, 1)], ...]
+            >>> ChemicalReaction("H2+O2=H2O").exact_matrix
+            None
+        """
+        if not any("." in compound.formula for compound in self.chemformula_objs):
+            return None
+        parsed = [compound.exact_parsed_formula for compound in self.chemformula_objs]
+        if is_stoichiometric(parsed):
+            return None
+        return exact_reaction_matrix(parsed)
+
+    @cached_property
     def balancer(self) -> Balancer:
         """
         A balancer to  automatically balance chemical reaction by different matrix methods.
@@ -214,10 +451,11 @@ class ChemicalReaction:
             len(self.decomposed_reaction.reactants),
             self.precision,
             intify=self.intify,
+            exact_matrix=self.exact_matrix,
+            timeout=self.timeout,
         )
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def molar_masses(self) -> list[float]:
         """
         List of molar masses (in g/mol)
@@ -260,7 +498,24 @@ class ChemicalReaction:
         return coefs
 
     @property
-    @lru_cache(maxsize=1)
+    def balancing_attempts(self) -> list[BalancingAttempt]:
+        """
+        Log of balancing method calls made to calculate the coefficients
+        (and of all later calls of the balancer methods).
+
+        Returns:
+            A list of [BalancingAttempt][chemsynthcalc.balancer.BalancingAttempt]
+
+        Examples:
+            >>> reaction = ChemicalReaction("Fe2O3+C=Fe3O4+FeO+Fe+Fe3C+CO+CO2")
+            >>> reaction.coefficients
+            >>> reaction.balancing_attempts
+            [BalancingAttempt(method='inv', reason='length mismatch', duration_ns=694520),
+            BalancingAttempt(method='gpinv', reason='', duration_ns=727975)]
+        """
+        return self.balancer.attempts
+
+    @cached_property
     def normalized_coefficients(self) -> list[float | int] | list[int]:
         """
         List of coefficients normalized on target compound.
@@ -341,8 +596,7 @@ class ChemicalReaction:
         )
         return final_reaction
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def final_reaction(self) -> str:
         """
         Final representation of the reaction with coefficients.
@@ -356,8 +610,7 @@ class ChemicalReaction:
         """
         return self._generate_final_reaction(self.coefficients)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def final_reaction_normalized(self) -> str:
         """
         Final representation of the reaction with normalized coefficients.
@@ -371,8 +624,7 @@ class ChemicalReaction:
         """
         return self._generate_final_reaction(self.normalized_coefficients)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def masses(self) -> list[float]:
         """
         List of masses of compounds (in grams).
@@ -397,8 +649,129 @@ class ChemicalReaction:
         ]
         return masses
 
-    @property
-    @lru_cache(maxsize=1)
+    def masses_for(
+        self,
+        target_masses: float | list[float] | npt.ArrayLike,
+        targets: int | list[int] | npt.ArrayLike | str = "all",
+    ) -> npt.NDArray[np.float64]:
+        """
+        Masses of compounds (in grams) for many target masses and targets at once.
+
+        The same calculation as in [masses][chemsynthcalc.chemical_reaction.ChemicalReaction.masses],
+        but done as an outer product of target moles, coefficients normalized on each target and
+        molar masses, so a full weighing table is calculated in one call.
+
+        Note:
+            The rounding is done by *np.round*, so in rare cases the last
+            digit can differ from the [masses][chemsynthcalc.chemical_reaction.ChemicalReaction.masses] list.
+
+        Arguments:
+            target_masses (float | list[float] | npt.ArrayLike): Desired masses of target compound (in grams)
+            targets (int | list[int] | npt.ArrayLike | str): Target integer(s) in the same notation as
+            the target argument of the class, or "all" for every compound in the reaction
+
+        Returns:
+            A 2D array of shape (target masses, compounds) if targets is an integer,
+            otherwise a 3D array of shape (targets, target masses, compounds)
+
+        Raise:
+            ValueError if any of target masses <= 0 <br />
+            IndexError if any target integer is not in the range
+
+        Examples:
+            >>> ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").masses_for([1, 2], 0)
+            [[1.25583678 2.31777285 1.         1.40855655 0.57264082 0.59241226]
+            [2.51167356 4.63554571 2.         2.8171131  1.14528164 1.18482453]]
+        """
+        masses = np.atleast_1d(np.asarray(target_masses, dtype=np.float64))
+        if np.any(masses <= 0):
+            raise ValueError("target mass <= 0")
+
+        if isinstance(targets, str):
+            if targets != "all":
+                raise ValueError(f"No targets {targets}")
+            indices = np.arange(len(self.decomposed_reaction.compounds))
+        else:
+            indices = np.array(
+                [self._target_to_index(int(t)) for t in np.atleast_1d(targets)]
+            )
+
+        Coefficients(
+            self.mode,
+            self.parsed_formulas,
+            self.matrix,
+            self.balancer,
+            self.decomposed_reaction,
+        ).coefficients_validation(self.coefficients)
+
+        coefs = np.array(self.coefficients, dtype=np.float64)
+        molar = np.array(self.molar_masses, dtype=np.float64)
+        normalized = np.round(coefs[None, :] / coefs[indices, None], self.precision)
+        nu = masses[None, :] / molar[indices, None]
+        table = np.round(
+            molar[None, None, :] * nu[:, :, None] * normalized[:, None, :],
+            self.precision,
+        )
+        if np.ndim(targets) == 0 and not isinstance(targets, str):
+            return table[0]
+        return table
+
+    def limiting_reagents(
+        self, available_masses: list[float] | list[list[float]] | npt.ArrayLike
+    ) -> LimitingReagents:
+        """
+        Limiting reactant, theoretical yield of the target compound and excess
+        of the other reactants for many experiments at once.
+
+        The amount of reaction every reactant allows is its moles divided by its
+        normalized coefficient; the smallest one is the amount that really reacts.
+
+        Arguments:
+            available_masses (list[float] | list[list[float]] | npt.ArrayLike): Available masses of
+            the reactants (in grams), one vector per experiment (shape (experiments, reactants))
+
+        Returns:
+            [LimitingReagents][chemsynthcalc.chemical_reaction.LimitingReagents] (with one
+            experiment less dimension if a single vector is given)
+
+        Raise:
+            ValueError if the shape of available masses doesn't match the reactants or any mass < 0
+
+        Examples:
+            >>> reaction = ChemicalReaction("H2+O2=H2O")
+            >>> result = reaction.limiting_reagents([[1, 10], [1, 4]])
+            >>> result.limiting
+            [0 1]
+            >>> result.theoretical_yield
+            [8.9360119 4.5040315]
+        """
+        available = np.asarray(available_masses, dtype=np.float64)
+        single = available.ndim == 1
+        available = np.atleast_2d(available)
+        reactants = len(self.decomposed_reaction.reactants)
+        if available.ndim != 2 or available.shape[1] != reactants:
+            raise ValueError(
+                f"Available masses should have {reactants} values per experiment"
+            )
+        if np.any(available < 0):
+            raise ValueError("available mass < 0")
+
+        normalized = np.array(self.normalized_coefficients, dtype=np.float64)
+        molar = np.array(self.molar_masses, dtype=np.float64)
+        # amount of the reaction (in moles of target) allowed by every reactant
+        allowed = available / (molar[:reactants] * normalized[:reactants])
+        limiting = np.argmin(allowed, axis=1)
+        extent = allowed[np.arange(allowed.shape[0]), limiting]
+        masses = np.round(extent[:, None] * normalized * molar, self.precision)
+        excess = np.round(available - masses[:, :reactants], self.precision)
+        result = LimitingReagents(
+            limiting, masses[:, self._calculated_target], excess, masses
+        )
+        if single:
+            return LimitingReagents(*(value[0] for value in result))
+        return result
+
+    @cached_property
     def output_results(self) -> dict[str, object]:
         """
         Collection of every output of calculated ChemicalReaction properties.
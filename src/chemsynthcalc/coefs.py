@@ -9,6 +9,7 @@ from .chem_errors import (
     BadCoeffiecients,
     ReactantProductDifference,
 )
+from .periodic_table import element_mask, mask_elements
 from .utils import to_integer
 
 
@@ -104,27 +105,23 @@ class Coefficients:
     def _element_count_validation(self) -> None:
         """
         Calculate a [symmetric difference](https://en.wikipedia.org/wiki/Symmetric_difference)
-        of two sets - left and right parts of the reaction. If this set is not empty, than
-        some atoms are only in one part of the reaction (which is impossible).
+        of two sets - left and right parts of the reaction - as XOR of their element bitmasks.
+        If it is not empty, than some atoms are only in one part of the reaction (which is impossible).
 
         Raise:
             [ReactantProductDifference][chemsynthcalc.chem_errors.ReactantProductDifference] if diff set is not empty.
         """
         if self.mode != "force":
-            reactants = {
-                k: v
-                for d in self.parsed_formulas[: len(self.decomposed_reaction.reactants)]
-                for k, v in d.items()
-            }
-            products = {
-                k: v
-                for d in self.parsed_formulas[len(self.decomposed_reaction.reactants) :]
-                for k, v in d.items()
-            }
-            diff = set(reactants.keys()) ^ (set(products.keys()))
+            separator = len(self.decomposed_reaction.reactants)
+            reactants = products = 0
+            for formula in self.parsed_formulas[:separator]:
+                reactants |= element_mask(formula)
+            for formula in self.parsed_formulas[separator:]:
+                products |= element_mask(formula)
+            diff = reactants ^ products
             if diff:
                 raise ReactantProductDifference(
-                    f"Cannot balance this reaction, because element(s) {diff} are only in one part of the reaction"
+                    f"Cannot balance this reaction, because element(s) {set(mask_elements(diff))} are only in one part of the reaction"
                 )
 
     def get_coefficients(self) -> tuple[list[float | int] | list[int], str]:
@@ -0,0 +1,120 @@
+"""
+Element-bitset index over compound libraries.
+
+Every compound is reduced to its 128-bit element-presence bitmask
+(see [element_mask][chemsynthcalc.periodic_table.element_mask]). The masks
+are stored as two uint64 arrays (low and high 64 bits), so queries like
+"all compounds made only of these elements" are a few vectorized bitwise
+operations over the whole library.
+"""
+
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from .chemical_formula import ChemicalFormula
+from .periodic_table import ELEMENT_BITS, element_mask
+
+_LOW = (1 << 64) - 1
+
+
+def _split(mask: int) -> tuple[np.uint64, np.uint64]:
+    return np.uint64(mask & _LOW), np.uint64(mask >> 64)
+
+
+class CompoundIndex:
+    """
+    A library of compounds indexed by their element bitmasks.
+
+    Parameters:
+        formulas (Iterable[str]): Formula strings of the compounds
+
+    Attributes:
+        formulas (list[str]): Formulas of the compounds (in the input order)
+        masks (list[int]): Element bitmask of every compound
+
+    Raise:
+        The errors of [ChemicalFormula][chemsynthcalc.chemical_formula.ChemicalFormula] for wrong formulas
+
+    Examples:
+        >>> index = CompoundIndex(["BaCO3", "TiO2", "Ba(NO3)2", "SrTiO3", "O2"])
+        >>> index.subset_of(["Ba", "Ti", "O", "C"])
+        ['BaCO3', 'TiO2', 'O2']
+        >>> index.containing("Ti")
+        ['TiO2', 'SrTiO3']
+    """
+
+    def __init__(self, formulas: Iterable[str]) -> None:
+        compounds = [ChemicalFormula(formula) for formula in formulas]
+        self.formulas: list[str] = [compound.formula for compound in compounds]
+        self.masks: list[int] = [compound.element_mask for compound in compounds]
+        self._low: npt.NDArray[np.uint64] = np.array(
+            [mask & _LOW for mask in self.masks], dtype=np.uint64
+        )
+        self._high: npt.NDArray[np.uint64] = np.array(
+            [mask >> 64 for mask in self.masks], dtype=np.uint64
+        )
+
+    def __len__(self) -> int:
+        return len(self.formulas)
+
+    def _select(self, selected: npt.NDArray[np.bool_]) -> list[str]:
+        return [self.formulas[i] for i in np.flatnonzero(selected)]
+
+    def subset_mask(self, elements: Iterable[str] | int) -> npt.NDArray[np.bool_]:
+        """
+        Which compounds consist only of the given elements.
+
+        Parameters:
+            elements (Iterable[str] | int): Atom symbols or an element bitmask
+
+        Returns:
+            A boolean array (one value per compound)
+        """
+        mask = elements if isinstance(elements, int) else element_mask(elements)
+        low, high = _split(~mask & ((1 << 128) - 1))
+        return ((self._low & low) == 0) & ((self._high & high) == 0)
+
+    def subset_of(self, elements: Iterable[str] | int) -> list[str]:
+        """
+        All compounds whose elements are a subset of the given elements.
+
+        Parameters:
+            elements (Iterable[str] | int): Atom symbols or an element bitmask
+
+        Returns:
+            A list of formulas
+        """
+        return self._select(self.subset_mask(elements))
+
+    def containing_mask(self, elements: Iterable[str] | str | int) -> npt.NDArray[np.bool_]:
+        """
+        Which compounds contain all the given elements.
+
+        Parameters:
+            elements (Iterable[str] | str | int): An atom symbol, atom symbols or an element bitmask
+
+        Returns:
+            A boolean array (one value per compound)
+        """
+        if isinstance(elements, str):
+            mask = ELEMENT_BITS[elements]
+        elif isinstance(elements, int):
+            mask = elements
+        else:
+            mask = element_mask(elements)
+        low, high = _split(mask)
+        return ((self._low & low) == low) & ((self._high & high) == high)
+
+    def containing(self, elements: Iterable[str] | str | int) -> list[str]:
+        """
+        All compounds that contain the given element (or all the given elements).
+
+        Parameters:
+            elements (Iterable[str] | str | int): An atom symbol, atom symbols or an element bitmask
+
+        Returns:
+            A list of formulas
+        """
+        return self._select(self.containing_mask(elements))
@@ -0,0 +1,559 @@
+"""
+Compiled binary reaction corpus (.csc) with memory-mapped random access.
+
+[compile_corpus][chemsynthcalc.corpus.compile_corpus] validates, decomposes
+and parses a text file of reactions (one per line) once and stores the result
+(with the molar masses and the exact matrices of non-stoichiometric reactions)
+in a single binary file. [CompiledCorpus][chemsynthcalc.corpus.CompiledCorpus]
+maps the file into memory: all arrays are zero-copy views of the mapping, so
+any number of processes can open the same file and read their own range of
+reactions without parsing or pickling the inputs.
+
+File layout (little-endian): a header with the magic, version, parsing
+precision and a table of (offset, length) of the sections, then the sections
+(8-byte aligned):
+
+* reaction_text (uint64, n_reactions + 1): offsets of the reaction strings in text
+* reaction_compounds (uint64, n_reactions + 1): ranges of the compounds of every reaction
+* reactant_count (uint32, n_reactions): number of reactants of every reaction
+* valid (uint8, n_reactions): 0 if the reaction can't be parsed
+* separator (uint8, n_reactions): index of the reaction separator (see Reaction.possible_reaction_separators)
+* exact (uint8, n_reactions): 0 if the reaction has no exact matrix, 1 if it is stored, 2 if it is not stored
+* exact_entries (uint64, n_reactions + 1): ranges of the stored exact matrices (rows x compounds, row-major)
+* exact_numerators, exact_denominators (int64, n_exact): fractions of the exact matrices
+* compound_text (uint64, n_compounds + 1): offsets of the formula strings in text
+* coefficients (float64, n_compounds): coefficients of the reaction strings
+* molar_masses (float64, n_compounds): molar masses of the compounds
+* compound_entries (uint64, n_compounds + 1): CSR row pointers of the element counts
+* elements (uint8, n_entries): element indexes (see chemsynthcalc.periodic_table.ELEMENTS)
+* counts (float64, n_entries): element counts
+* text (uint8): UTF-8 strings
+
+Plain text files are not compiled: [line_offsets][chemsynthcalc.corpus.line_offsets]
+indexes the line starts in one pass over the mapped file, and
+[line_ranges][chemsynthcalc.corpus.line_ranges] splits the file into byte
+ranges at line boundaries that workers can read on their own.
+"""
+
+import mmap
+import os
+import struct
+from fractions import Fraction
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .chemical_reaction import ChemicalReaction
+from .exact import ExactMatrix
+from .periodic_table import ELEMENT_INDEX, ELEMENTS
+from .reaction import Reaction
+from .reaction_decomposer import ReactionDecomposer
+
+MAGIC: bytes = b"CSC1"
+VERSION: int = 2
+
+_SECTIONS: tuple[tuple[str, str], ...] = (
+    ("reaction_text", "<u8"),
+    ("reaction_compounds", "<u8"),
+    ("reactant_count", "<u4"),
+    ("valid", "u1"),
+    ("separator", "u1"),
+    ("exact", "u1"),
+    ("exact_entries", "<u8"),
+    ("exact_numerators", "<i8"),
+    ("exact_denominators", "<i8"),
+    ("compound_text", "<u8"),
+    ("coefficients", "<f8"),
+    ("molar_masses", "<f8"),
+    ("compound_entries", "<u8"),
+    ("elements", "u1"),
+    ("counts", "<f8"),
+    ("text", "u1"),
+)
+_HEADER = struct.Struct("<4sII")
+_SECTION = struct.Struct("<QQ")
+_SEPARATORS: list[str] = Reaction("").possible_reaction_separators
+_INT64_MAX = 2**63 - 1
+
+
+def compile_corpus(
+    in_fname: str, out_fname: str | None = None, precision: int = 8
+) -> str:
+    """
+    Compile a text file of reactions (one per line, empty lines are skipped)
+    into a binary corpus.
+
+    Parameters:
+        in_fname (str): Input text file
+        out_fname (str | None): Output file (input file name with .csc extension by default)
+        precision (int): Rounding precision of the parsed formulas (the same as in ChemicalFormula)
+
+    Returns:
+        Output file name
+
+    Examples:
+        >>> compile_corpus("bench/text_mined_reactions.txt")
+        'bench/text_mined_reactions.csc'
+    """
+    if out_fname is None:
+        out_fname = in_fname.rsplit(".", 1)[0] + ".csc"
+
+    text = bytearray()
+    compound_strings = bytearray()
+    reaction_text: list[int] = [0]
+    reaction_compounds: list[int] = [0]
+    reactant_count: list[int] = []
+    valid: list[int] = []
+    separator: list[int] = []
+    exact: list[int] = []
+    exact_entries: list[int] = [0]
+    exact_numerators: list[int] = []
+    exact_denominators: list[int] = []
+    compound_text: list[int] = [0]
+    coefficients: list[float] = []
+    molar_masses: list[float] = []
+    compound_entries: list[int] = [0]
+    elements: list[int] = []
+    counts: list[float] = []
+
+    with open(in_fname, encoding="utf-8") as reactions:
+        for line in reactions:
+            reaction = line.strip()
+            if not reaction:
+                continue
+            text += reaction.encode("utf-8")
+            reaction_text.append(len(text))
+            try:
+                compiled = ChemicalReaction(reaction, precision=precision)
+                decomposed = compiled.decomposed_reaction
+                parsed = compiled.parsed_formulas
+                masses = compiled.molar_masses
+                exact_matrix = compiled.exact_matrix
+            except Exception:
+                reaction_compounds.append(reaction_compounds[-1])
+                reactant_count.append(0)
+                valid.append(0)
+                separator.append(0)
+                exact.append(0)
+                exact_entries.append(exact_entries[-1])
+                continue
+
+            for compound, coefficient, formula, mass in zip(
+                decomposed.compounds, decomposed.initial_coefficients, parsed, masses
+            ):
+                compound_strings += compound.encode("utf-8")
+                compound_text.append(len(compound_strings))
+                coefficients.append(coefficient)
+                molar_masses.append(mass)
+                elements.extend(ELEMENT_INDEX[atom] for atom in formula)
+                counts.extend(formula.values())
+                compound_entries.append(len(elements))
+            reaction_compounds.append(len(coefficients))
+            reactant_count.append(len(decomposed.reactants))
+            valid.append(1)
+            separator.append(_SEPARATORS.index(decomposed.separator))
+
+            fractions = [value for row in exact_matrix or [] for value in row]
+            if exact_matrix is None:
+                exact.append(0)
+            elif all(
+                abs(value.numerator) <= _INT64_MAX and value.denominator <= _INT64_MAX
+                for value in fractions
+            ):
+                exact.append(1)
+                exact_numerators.extend(value.numerator for value in fractions)
+                exact_denominators.extend(value.denominator for value in fractions)
+            else:
+                # too large for the file, calculated again when read
+                exact.append(2)
+            exact_entries.append(len(exact_numerators))
+
+    # the formula strings are stored after all the reaction strings
+    compound_text = [len(text) + offset for offset in compound_text]
+    text += compound_strings
+    arrays = [
+        np.asarray(values, dtype=dtype)
+        for values, (_, dtype) in zip(
+            (
+                reaction_text,
+                reaction_compounds,
+                reactant_count,
+                valid,
+                separator,
+                exact,
+                exact_entries,
+                exact_numerators,
+                exact_denominators,
+                compound_text,
+                coefficients,
+                molar_masses,
+                compound_entries,
+                elements,
+                counts,
+                text,
+            ),
+            _SECTIONS,
+        )
+    ]
+    offset = _HEADER.size + _SECTION.size * len(_SECTIONS)
+    table: list[tuple[int, int]] = []
+    for array in arrays:
+        offset += -offset % 8
+        table.append((offset, array.size))
+        offset += array.nbytes
+
+    with open(out_fname, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, precision))
+        for section in table:
+            out.write(_SECTION.pack(*section))
+        for (section_offset, _), array in zip(table, arrays):
+            out.write(b"\0" * (section_offset - out.tell()))
+            out.write(array.tobytes())
+    return out_fname
+
+
+class CompiledCorpus:
+    """
+    Reader of a compiled corpus. The file is memory-mapped and
+    all the data is read lazily (zero-copy).
+
+    Parameters:
+        path (str): Path of the .csc file
+
+    Attributes:
+        precision (int): Rounding precision of the parsed formulas
+
+    Raise:
+        ValueError if the file is not a compiled corpus of a supported version
+
+    Examples:
+        >>> with CompiledCorpus("bench/text_mined_reactions.csc") as corpus:
+        ...     corpus.reaction(0), corpus.compounds(0)
+        ('0.5Li2CO3+1Fe2O3==1LiFe5O8+0.5CO2', ['Li2CO3', 'Fe2O3', 'LiFe5O8', 'CO2'])
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.precision = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a compiled corpus of version {VERSION}")
+        self._arrays: dict[str, npt.NDArray[Any]] = {}
+        offset = 0
+        for i, (name, dtype) in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                self._mmap, _HEADER.size + i * _SECTION.size
+            )
+            self._arrays[name] = np.frombuffer(
+                self._mmap, dtype=dtype, count=length, offset=offset
+            )
+        # the text is the last section
+        self._text: memoryview = memoryview(self._mmap)[offset:]
+
+    def __len__(self) -> int:
+        return len(self._arrays["valid"])
+
+    def __enter__(self) -> "CompiledCorpus":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the memory mapping.
+        """
+        self._arrays.clear()
+        self._text.release()
+        self._mmap.close()
+
+    def _string(self, offsets: npt.NDArray[np.uint64], i: int) -> str:
+        return str(self._text[int(offsets[i]) : int(offsets[i + 1])], "utf-8")
+
+    def reaction(self, i: int) -> str:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            The reaction string
+        """
+        return self._string(self._arrays["reaction_text"], i)
+
+    def is_valid(self, i: int) -> bool:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            False if the reaction couldn't be parsed at compilation
+        """
+        return bool(self._arrays["valid"][i])
+
+    def _compound_range(self, i: int) -> range:
+        bounds = self._arrays["reaction_compounds"]
+        return range(int(bounds[i]), int(bounds[i + 1]))
+
+    def reactant_count(self, i: int) -> int:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            Number of reactants (the position of the reaction separator)
+        """
+        return int(self._arrays["reactant_count"][i])
+
+    def compounds(self, i: int) -> list[str]:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            Formulas of the reaction compounds (empty if the reaction is not valid)
+        """
+        offsets = self._arrays["compound_text"]
+        return [self._string(offsets, j) for j in self._compound_range(i)]
+
+    def coefficients(self, i: int) -> list[float]:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            Coefficients of the reaction string
+        """
+        compounds = self._compound_range(i)
+        return self._arrays["coefficients"][compounds.start : compounds.stop].tolist()
+
+    def parsed_formulas(self, i: int) -> list[dict[str, float]]:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            Parsed formulas of the reaction compounds (the same as
+            [parsed_formulas][chemsynthcalc.chemical_reaction.ChemicalReaction.parsed_formulas])
+        """
+        entries = self._arrays["compound_entries"]
+        elements = self._arrays["elements"]
+        counts = self._arrays["counts"]
+        parsed: list[dict[str, float]] = []
+        for j in self._compound_range(i):
+            start, stop = int(entries[j]), int(entries[j + 1])
+            parsed.append(
+                dict(
+                    zip(
+                        [ELEMENTS[e] for e in elements[start:stop].tolist()],
+                        counts[start:stop].tolist(),
+                    )
+                )
+            )
+        return parsed
+
+    def molar_masses(self, i: int) -> list[float]:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            Molar masses of the reaction compounds (at the precision of the corpus)
+        """
+        compounds = self._compound_range(i)
+        return self._arrays["molar_masses"][compounds.start : compounds.stop].tolist()
+
+    def exact_matrix(self, i: int) -> ExactMatrix | None:
+        """
+        Parameters:
+            i (int): Reaction index
+
+        Returns:
+            The exact matrix of the reaction (the same as
+            [exact_matrix][chemsynthcalc.chemical_reaction.ChemicalReaction.exact_matrix])
+
+        Raise:
+            ValueError if the matrix is too large to be stored in the corpus
+        """
+        state = int(self._arrays["exact"][i])
+        if state == 0:
+            return None
+        if state == 2:
+            raise ValueError(f"The exact matrix of reaction {i} is not stored")
+        bounds = self._arrays["exact_entries"]
+        start, stop = int(bounds[i]), int(bounds[i + 1])
+        fractions = [
+            Fraction(numerator, denominator)
+            for numerator, denominator in zip(
+                self._arrays["exact_numerators"][start:stop].tolist(),
+                self._arrays["exact_denominators"][start:stop].tolist(),
+            )
+        ]
+        columns = len(self._compound_range(i))
+        return [fractions[j : j + columns] for j in range(0, len(fractions), columns)]
+
+    def chemical_reaction(self, i: int, **kwargs: Any) -> ChemicalReaction:
+        """
+        A ChemicalReaction of the i-th reaction built from the corpus data:
+        the reaction is not validated, decomposed or parsed again. The parsed
+        formulas, molar masses and exact matrix are taken from the corpus
+        if the precision is the same as at compilation.
+
+        Parameters:
+            i (int): Reaction index
+            **kwargs (Any): Other [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction] arguments
+
+        Returns:
+            A ChemicalReaction object
+
+        Raise:
+            The validation errors of ChemicalReaction if the reaction is not valid
+        """
+        if not self.is_valid(i):
+            return ChemicalReaction(self.reaction(i), **kwargs)
+        decomposed = ReactionDecomposer.from_parts(
+            self.reaction(i).replace(" ", ""),
+            _SEPARATORS[int(self._arrays["separator"][i])],
+            self.compounds(i),
+            self.coefficients(i),
+            self.reactant_count(i),
+        )
+        reaction = ChemicalReaction.from_decomposition(decomposed, **kwargs)
+        if reaction.precision == self.precision:
+            reaction.parsed_formulas = self.parsed_formulas(i)
+            reaction.molar_masses = self.molar_masses(i)
+            if int(self._arrays["exact"][i]) != 2:
+                reaction.exact_matrix = self.exact_matrix(i)
+        return reaction
+
+    def shapes(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Shapes of the reaction matrices of all reactions, read from the
+        stored parsed formulas without building the matrices.
+
+        Returns:
+            Arrays of the numbers of elements (rows) and of compounds (columns)
+            of every reaction (zeros for the reactions that are not valid)
+        """
+        bounds = self._arrays["reaction_compounds"].astype(np.int64)
+        entries = self._arrays["compound_entries"].astype(np.int64)
+        columns = np.diff(bounds)
+        compound_reaction = np.repeat(np.arange(len(self)), columns)
+        entry_reaction = np.repeat(compound_reaction, np.diff(entries))
+        # distinct (reaction, element) pairs
+        pairs = np.unique(entry_reaction * 256 + self._arrays["elements"])
+        rows = np.bincount(pairs // 256, minlength=len(self))
+        return rows, columns
+
+    def ranges(
+        self, parts: int, weights: npt.NDArray[np.float64] | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Split the corpus into (start, end) index ranges of about the same size
+        (or of about the same total weight).
+
+        Parameters:
+            parts (int): Number of ranges
+            weights (npt.NDArray[np.float64] | None): Weight of every reaction,
+            for example its estimated balancing time
+
+        Returns:
+            A list of (start, end) tuples
+        """
+        if weights is None:
+            bounds = np.linspace(0, len(self), max(1, parts) + 1).astype(int)
+        else:
+            cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+            targets = np.linspace(0, cumulative[-1], max(1, parts) + 1)
+            bounds = np.searchsorted(cumulative, targets)
+            bounds[0], bounds[-1] = 0, len(self)
+        return [
+            (int(start), int(end))
+            for start, end in zip(bounds[:-1], bounds[1:])
+            if end > start
+        ]
+
+
+def line_offsets(path: str, chunk_size: int = 1 << 26) -> npt.NDArray[np.uint64]:
+    """
+    Byte offsets of the line starts of a text file. The file is memory-mapped
+    and scanned in chunks, so the memory use doesn't depend on the file size
+    (except for the index itself).
+
+    Parameters:
+        path (str): Path of the text file
+        chunk_size (int): Number of bytes scanned at once
+
+    Returns:
+        An array of n_lines + 1 offsets: the i-th line is the bytes offsets[i]..offsets[i + 1]
+
+    Examples:
+        >>> line_offsets("bench/text_mined_reactions.txt")[:3]
+        array([  0,  68, 105], dtype=uint64)
+    """
+    size = os.path.getsize(path)
+    starts: list[npt.NDArray[np.uint64]] = [np.zeros(1, dtype=np.uint64)]
+    if size:
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, chunk_size):
+                    starts.append(_newlines(mapped, offset, min(chunk_size, size - offset)))
+    offsets = np.concatenate(starts)
+    if offsets[-1] != size:
+        offsets = np.append(offsets, np.uint64(size))
+    return offsets
+
+
+def _newlines(mapped: mmap.mmap, offset: int, count: int) -> npt.NDArray[np.uint64]:
+    """
+    Offsets of the bytes after the newlines of a chunk
+    (the view of the mapping is released on return).
+    """
+    chunk = np.frombuffer(mapped, dtype=np.uint8, count=count, offset=offset)
+    return np.flatnonzero(chunk == ord("\n")).astype(np.uint64) + np.uint64(offset + 1)
+
+
+def line_ranges(offsets: npt.NDArray[np.uint64], parts: int) -> list[tuple[int, int]]:
+    """
+    Split a text file into byte ranges of about the same size at line boundaries.
+
+    Parameters:
+        offsets (npt.NDArray[np.uint64]): Line offsets of the file (see [line_offsets][chemsynthcalc.corpus.line_offsets])
+        parts (int): Number of ranges
+
+    Returns:
+        A list of (start, end) byte ranges covering the whole file
+    """
+    targets = np.linspace(0, int(offsets[-1]), max(1, parts) + 1)
+    # the last line start at or before every target
+    bounds = np.unique(offsets[np.searchsorted(offsets, targets, side="right") - 1])
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def read_lines(path: str, start: int, end: int) -> list[str]:
+    """
+    Read the non-empty lines of a byte range of a text file.
+
+    Parameters:
+        path (str): Path of the text file
+        start (int): Offset of the first line
+        end (int): Offset after the last line
+
+    Returns:
+        The stripped non-empty lines
+    """
+    lines: list[str] = []
+    with open(path, "rb") as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            text = line.decode("utf-8").strip()
+            if text:
+                lines.append(text)
+    return lines
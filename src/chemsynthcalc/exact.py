@@ -0,0 +1,132 @@
+"""
+Exact (rational) reaction balancing for non-stoichiometric compounds.
+
+Decimal atom amounts like Li0.95 are kept as fractions, so the null space
+of the reaction matrix is found by Gauss-Jordan elimination without rounding
+and the coefficients are integers by construction.
+"""
+
+from fractions import Fraction
+from math import gcd, lcm
+
+ExactMatrix = list[list[Fraction]]
+
+_ZERO = Fraction(0)
+
+
+def is_stoichiometric(parsed_formulas: list[dict[str, Fraction]]) -> bool:
+    """
+    Check if all atom amounts of the formulas are integers.
+
+    Parameters:
+        parsed_formulas (list[dict[str, Fraction]]): Formulas parsed with exact=True
+
+    Returns:
+        True if there are no fractional amounts
+    """
+    return all(
+        amount.denominator == 1
+        for formula in parsed_formulas
+        for amount in formula.values()
+    )
+
+
+def exact_reaction_matrix(parsed_formulas: list[dict[str, Fraction]]) -> ExactMatrix:
+    """
+    Reaction matrix of fractions with the same row order as
+    [ChemicalReactionMatrix][chemsynthcalc.reaction_matrix.ChemicalReactionMatrix].
+
+    Parameters:
+        parsed_formulas (list[dict[str, Fraction]]): Formulas parsed with exact=True
+
+    Returns:
+        A list of rows (one per element)
+    """
+    elements = dict.fromkeys(atom for formula in parsed_formulas for atom in formula)
+    return [
+        [formula.get(element, _ZERO) for formula in parsed_formulas]
+        for element in elements
+    ]
+
+
+def exact_nullspace(matrix: ExactMatrix) -> list[list[int]]:
+    """
+    Basis of the null space of a rational matrix by fraction-free Gauss-Jordan
+    elimination: every row is scaled to integers (which doesn't change the null space)
+    and the elimination runs in Python integers.
+
+    Parameters:
+        matrix (ExactMatrix): A list of rows
+
+    Returns:
+        A list of integer basis vectors (empty if the null space is trivial)
+    """
+    rows: list[list[int]] = []
+    for row in matrix:
+        multiplier = lcm(*(x.denominator for x in row))
+        rows.append([x.numerator * (multiplier // x.denominator) for x in row])
+    columns = len(rows[0]) if rows else 0
+    pivots: list[int] = []
+    rank = 0
+    for column in range(columns):
+        pivot = next((r for r in range(rank, len(rows)) if rows[r][column]), None)
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        head_row = rows[rank]
+        head = head_row[column]
+        for r, row in enumerate(rows):
+            factor = row[column]
+            if r != rank and factor:
+                reduced = [head * x - factor * y for x, y in zip(row, head_row)]
+                divisor = gcd(*reduced)
+                rows[r] = [x // divisor for x in reduced] if divisor > 1 else reduced
+        pivots.append(column)
+        rank += 1
+
+    heads = [rows[r][column] for r, column in enumerate(pivots)]
+    multiplier = lcm(*heads) if heads else 1
+    basis: list[list[int]] = []
+    for free in (c for c in range(columns) if c not in pivots):
+        vector = [0] * columns
+        vector[free] = multiplier
+        for r, column in enumerate(pivots):
+            vector[column] = -rows[r][free] * multiplier // heads[r]
+        divisor = gcd(*vector)
+        basis.append([x // divisor for x in vector])
+    return basis
+
+
+def exact_coefficients(
+    matrix: ExactMatrix, separator_pos: int, limit: int = 1_000_000
+) -> list[int] | None:
+    """
+    The smallest integer coefficients of a reaction with a one-dimensional
+    solution space.
+
+    Parameters:
+        matrix (ExactMatrix): Exact reaction matrix (products with plus sign)
+        separator_pos (int): Position of the reaction separator
+        limit (int): Upper limit of integer coefficients
+
+    Returns:
+        A list of positive integer coefficients or None if the reaction has
+        no unique positive solution within the limit
+
+    Examples:
+        >>> formulas = ["Li2CO3", "NiO", "Co3O4", "Al2O3", "O2", "Li0.95Ni0.8Co0.15Al0.05O2", "CO2"]
+        >>> parsed = [ChemicalFormulaParser(f, exact=True).parse_formula() for f in formulas]
+        >>> exact_coefficients(exact_reaction_matrix(parsed), 5)
+        [19, 32, 2, 1, 9, 40, 19]
+    """
+    basis = exact_nullspace(matrix)
+    if len(basis) != 1:
+        return None
+    # null vector of [reactants | products] -> coefficients of [reactants | -products]
+    sign = -1 if basis[0][0] < 0 else 1
+    integers = [sign * x for x in basis[0][:separator_pos]] + [
+        -sign * x for x in basis[0][separator_pos:]
+    ]
+    if any(x <= 0 or x >= limit for x in integers):
+        return None
+    return integers
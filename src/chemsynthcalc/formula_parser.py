@@ -1,6 +1,8 @@
 import re
+from fractions import Fraction
 
 from .formula import Formula
+from .instrumentation import timed
 
 
 class ChemicalFormulaParser(Formula):
@@ -9,8 +11,17 @@ class ChemicalFormulaParser(Formula):
 
     Methods of this class take string of compound's chemical formula
     and turn it into a dict of atoms as keys and their coefficients as values.
+
+    Parameters:
+        formula (str): Formula string
+        exact (bool): Keep the atom amounts as exact fractions (a decimal amount
+        like 0.95 becomes Fraction(19, 20)) instead of floats
     """
 
+    def __init__(self, formula: str, exact: bool = False) -> None:
+        super().__init__(formula)
+        self.number: type[float] | type[Fraction] = Fraction if exact else float
+
     def _dictify(self, tuples: list[tuple[str, ...]]) -> dict[str, float]:
         """
         Transform list of tuples to a dict of atoms.
@@ -25,13 +36,13 @@ class ChemicalFormulaParser(Formula):
         result: dict[str, float] = dict()
         for atom, n, _, _ in tuples:
             try:
-                result[atom] += float(n or 1)
+                result[atom] += self.number(n or 1)
             except KeyError:
-                result[atom] = float(n or 1)
+                result[atom] = self.number(n or 1)
         return result
 
     def _fuse(
-        self, mol1: dict[str, float], mol2: dict[str, float], weight: float = 1.0
+        self, mol1: dict[str, float], mol2: dict[str, float], weight: float = 1
     ) -> dict[str, float]:
         """Fuse together 2 dicts representing molecules.
 
@@ -78,12 +89,12 @@ class ChemicalFormulaParser(Formula):
                     self.coefficient_regex, formula[i + 1 :]
                 )
                 if coefficient_match and coefficient_match.group(0) != "":
-                    weight: float = float(coefficient_match.group(0))
-                    i += len(coefficient_match.group(0))
+                    weight_string: str = coefficient_match.group(0)
+                    i += len(weight_string)
                 else:
-                    weight = 1.0
+                    weight_string = "1"
                 recursive_dive: tuple[dict[str, float], int] = self._parse(
-                    f"({formula[i + 1 :]}){weight}"
+                    f"({formula[i + 1 :]}){weight_string}"
                 )
                 submol = recursive_dive[0]
                 lenght: int = recursive_dive[1]
@@ -95,10 +106,10 @@ class ChemicalFormulaParser(Formula):
                     self.coefficient_regex, formula[i + 1 :]
                 )
                 if coefficient_match and coefficient_match.group(0) != "":
-                    weight: float = float(coefficient_match.group(0))
+                    weight: float = self.number(coefficient_match.group(0))
                     i += len(coefficient_match.group(0))
                 else:
-                    weight = 1.0
+                    weight = self.number(1)
                 submol: dict[str, float] = self._dictify(
                     re.findall(self.atom_and_coefficient_regex, "".join(token_list))
                 )
@@ -143,6 +154,7 @@ class ChemicalFormulaParser(Formula):
             weights.append(parsed[atom])
         return dict(zip(atoms_list, weights))
 
+    @timed("parsing", lambda self: {"formula": self.formula})
     def parse_formula(self) -> dict[str, float]:
         """
         Parsing and ordering of formula
@@ -0,0 +1,156 @@
+"""
+Opt-in instrumentation of the calculation stages.
+
+Instrumented functions send `(stage, duration_ns, metadata)` events to
+every registered callback. When no callback is registered, the only
+overhead is one check of an empty list per call.
+
+Examples:
+    >>> from chemsynthcalc.instrumentation import StageTimings
+    >>> with StageTimings() as timings:
+    ...     ChemicalReaction("H2+O2=H2O").output_results
+    >>> timings.summary()
+    {'reaction validation': {'count': 1, 'total_ns': 10863, 'max_ns': 10863, 'errors': 0}, ...}
+"""
+
+import time
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+Callback = Callable[[str, int, dict[str, object]], None]
+F = TypeVar("F", bound=Callable[..., Any])
+
+_callbacks: list[Callback] = []
+
+
+def add_callback(callback: Callback) -> None:
+    """
+    Register a callback that receives `(stage, duration_ns, metadata)` events.
+
+    Parameters:
+        callback (Callback): A function of (stage, duration_ns, metadata)
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback: Callback) -> None:
+    """
+    Unregister a previously registered callback.
+
+    Parameters:
+        callback (Callback): A registered callback
+
+    Raise:
+        ValueError if the callback is not registered
+    """
+    _callbacks.remove(callback)
+
+
+def timed(
+    stage: str, metadata: Callable[..., dict[str, object]] | None = None
+) -> Callable[[F], F]:
+    """
+    Decorator that sends a timing event of the function call to the callbacks.
+
+    Parameters:
+        stage (str): Name of the stage
+        metadata (Callable[..., dict[str, object]] | None): Optional function of the
+        call arguments that returns event metadata (called only if instrumentation is on)
+
+    Returns:
+        A decorator
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _callbacks:
+                return func(*args, **kwargs)
+            error: str | None = None
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                duration = time.perf_counter_ns() - start
+                event: dict[str, object] = metadata(*args, **kwargs) if metadata else {}
+                if error is not None:
+                    event["error"] = error
+                for callback in tuple(_callbacks):
+                    callback(stage, duration, event)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+class StageTimings:
+    """
+    Aggregator of stage timing events: count, total and max duration of every stage.
+    Can be used as a context manager or started and stopped explicitly.
+
+    Attributes:
+        stages (dict[str, list[int]]): [count, total_ns, max_ns] of every stage
+        errors (dict[str, int]): Number of failed calls of every stage
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, list[int]] = {}
+        self.errors: dict[str, int] = {}
+
+    def __enter__(self) -> "StageTimings":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def __call__(self, stage: str, duration_ns: int, metadata: dict[str, object]) -> None:
+        record = self.stages.get(stage)
+        if record is None:
+            self.stages[stage] = [1, duration_ns, duration_ns]
+        else:
+            record[0] += 1
+            record[1] += duration_ns
+            if duration_ns > record[2]:
+                record[2] = duration_ns
+        if "error" in metadata:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def start(self) -> None:
+        """
+        Start receiving events.
+        """
+        add_callback(self)
+
+    def stop(self) -> None:
+        """
+        Stop receiving events.
+        """
+        remove_callback(self)
+
+    def reset(self) -> None:
+        """
+        Drop all collected timings.
+        """
+        self.stages.clear()
+        self.errors.clear()
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """
+        Collected timings of every stage.
+
+        Returns:
+            Dictionary of stage: {count, total_ns, max_ns, errors}
+        """
+        return {
+            stage: {
+                "count": count,
+                "total_ns": total,
+                "max_ns": maximum,
+                "errors": self.errors.get(stage, 0),
+            }
+            for stage, (count, total, maximum) in self.stages.items()
+        }
@@ -0,0 +1,141 @@
+"""
+Vectorized conversion of float coefficients to integers.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class IntegerizedCoefficients(NamedTuple):
+    """
+    Result of [integerize][chemsynthcalc.integerize.integerize]: integer coefficients,
+    a mask of successfully converted vectors and the balance error
+    (max absolute residual of the matrix equation, NaN if no matrix is given)
+    of every integer vector.
+    """
+
+    coefficients: npt.NDArray[np.int64]
+    success: npt.NDArray[np.bool_]
+    balance_error: npt.NDArray[np.float64]
+
+
+def _rational_approximation(
+    x: npt.NDArray[np.float64], max_denominator: int
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Approximate every element of an array by the closest fraction p/q with
+    q <= max_denominator (as *Fraction.limit_denominator* does): the continued
+    fraction expansion runs up to the last convergent that fits, which is then
+    compared with the closest semiconvergent.
+
+    Parameters:
+        x (npt.NDArray[np.float64]): Array of non-negative floats
+        max_denominator (int): Max denominator of the fractions
+
+    Returns:
+        A tuple of numerators and denominators arrays (as exact integer floats)
+    """
+    p_prev, q_prev = np.zeros_like(x), np.ones_like(x)
+    p, q = np.ones_like(x), np.zeros_like(x)
+    best_p, best_q = np.rint(x), np.ones_like(x)
+    value = x.copy()
+    active = np.ones(x.shape, dtype=bool)
+    # a float64 continued fraction expansion converges in < 40 steps
+    for _ in range(40):
+        a = np.floor(value)
+        p_next = a * p + p_prev
+        q_next = a * q + q_prev
+        fits = active & (q_next <= max_denominator)
+
+        # the closest semiconvergent between the last two convergents
+        overflow = active & ~fits & (q > 0)
+        k = np.floor((max_denominator - q_prev) / np.where(overflow, q, 1))
+        semi_p, semi_q = p_prev + k * p, q_prev + k * q
+        closer = overflow & (
+            np.abs(x - semi_p / semi_q) < np.abs(x - p / np.where(overflow, q, 1))
+        )
+        best_p = np.where(fits, p_next, np.where(closer, semi_p, best_p))
+        best_q = np.where(fits, q_next, np.where(closer, semi_q, best_q))
+
+        remainder = value - a
+        active = fits & (remainder > 0)
+        if not active.any():
+            break
+        value = np.where(active, 1 / np.where(active, remainder, 1), 1)
+        p_prev, p = p, p_next
+        q_prev, q = q, q_next
+    return best_p, best_q
+
+
+def integerize(
+    coefficients: npt.ArrayLike,
+    max_denominator: int = 1_000_000,
+    tolerance: float = 1e-8,
+    limit: int = 1_000_000,
+    matrix: npt.NDArray[np.float64] | None = None,
+) -> IntegerizedCoefficients:
+    """
+    Convert vectors of float coefficients to the smallest proportional integer vectors.
+
+    Every coefficient is approximated by the closest fraction with a bounded denominator
+    (vectorized continued fraction expansion), then each vector is multiplied by the least common multiple of its
+    denominators and divided by the greatest common divisor of the result.
+
+    Parameters:
+        coefficients (npt.ArrayLike): A vector of coefficients or a 2D array of vectors (one per row)
+        max_denominator (int): Max denominator of the fractions
+        tolerance (float): Max absolute difference between a coefficient and its fraction
+        limit (int): Upper limit of integer coefficients
+        matrix (npt.NDArray[np.float64] | None): Optional stoichiometric matrix (products with minus sign)
+        to calculate the balance error of the integer vectors
+
+    Returns:
+        [IntegerizedCoefficients][chemsynthcalc.integerize.IntegerizedCoefficients] with the same leading shape as input.
+        Vectors that can't be converted within tolerance and limit are marked as not successful.
+
+    Examples:
+        >>> integerize([0.5, 0.33333333, 1.0]).coefficients
+        [3 2 6]
+        >>> integerize([[1.5, 1.0], [0.25, 1.0]]).coefficients
+        [[3 2]
+        [1 4]]
+    """
+    x = np.asarray(coefficients, dtype=np.float64)
+    single = x.ndim == 1
+    x = np.atleast_2d(x)
+
+    signs = np.sign(x)
+    absolute = np.abs(x)
+    rounded = np.rint(absolute)
+    if np.array_equal(absolute, rounded):
+        # already integer vectors (the most common output of inv method)
+        numerators, denominators = rounded, np.ones_like(rounded)
+    else:
+        numerators, denominators = _rational_approximation(absolute, max_denominator)
+    success = np.all(np.abs(absolute - numerators / denominators) <= tolerance, axis=1)
+    success &= np.all(np.isfinite(x), axis=1) & np.any(numerators > 0, axis=1)
+
+    q = denominators.astype(np.int64)
+    lcm = np.lcm.reduce(q, axis=1)
+    # overflow of the lcm or of the multiplied numerators
+    success &= (lcm > 0) & np.all(lcm[:, None] % q == 0, axis=1)
+    scaled = numerators / denominators * np.where(success, lcm, 0)[:, None]
+    success &= np.all(scaled < 2**62, axis=1)
+
+    lcm = np.where(success, lcm, 1)
+    numerators = np.where(success[:, None], signs * numerators, 0)
+    integers = numerators.astype(np.int64) * (lcm[:, None] // q)
+    gcd = np.gcd.reduce(integers, axis=1)
+    integers //= np.where(gcd == 0, 1, gcd)[:, None]
+    success &= np.all(np.abs(integers) < limit, axis=1)
+
+    if matrix is not None:
+        balance_error = np.abs(integers.astype(np.float64) @ matrix.T).max(axis=1)
+    else:
+        balance_error = np.full(integers.shape[0], np.nan)
+
+    if single:
+        return IntegerizedCoefficients(integers[0], success[0], balance_error[0])
+    return IntegerizedCoefficients(integers, success, balance_error)
@@ -1,4 +1,4 @@
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 
 class Atom(NamedTuple):
@@ -151,3 +151,44 @@ class PeriodicTable:
 
 PERIODIC_TABLE: dict[str, Atom] = _PERIODIC_TABLE_DATA
 ATOMS: set[str] = _ATOMS
+ELEMENTS: tuple[str, ...] = tuple(_PERIODIC_TABLE_DATA)
+ELEMENT_INDEX: dict[str, int] = {atom: i for i, atom in enumerate(ELEMENTS)}
+# element-presence bitmasks: bit i is the i-th element of ELEMENTS (118 bits)
+ELEMENT_BITS: dict[str, int] = {atom: 1 << i for i, atom in enumerate(ELEMENTS)}
+
+
+def element_mask(atoms: Iterable[str]) -> int:
+    """
+    Element-presence bitmask of a set of atoms (like the keys of a parsed formula).
+
+    Parameters:
+        atoms (Iterable[str]): Atom symbols
+
+    Returns:
+        An integer with the bits of the atoms set
+
+    Examples:
+        >>> element_mask({"H": 2.0, "O": 1.0})
+        129
+    """
+    mask = 0
+    for atom in atoms:
+        mask |= ELEMENT_BITS[atom]
+    return mask
+
+
+def mask_elements(mask: int) -> list[str]:
+    """
+    Atom symbols of an element-presence bitmask (in the periodic table order).
+
+    Parameters:
+        mask (int): Element-presence bitmask
+
+    Returns:
+        A list of atom symbols
+
+    Examples:
+        >>> mask_elements(129)
+        ['H', 'O']
+    """
+    return [ELEMENTS[i] for i in range(mask.bit_length()) if mask >> i & 1]
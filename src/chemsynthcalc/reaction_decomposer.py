@@ -1,3 +1,4 @@
+from .instrumentation import timed
 from .reaction import Reaction
 
 
@@ -17,6 +18,7 @@ class ReactionDecomposer(Reaction):
         compounds (list[str]): reactants + products
     """
 
+    @timed("decomposition")
     def __init__(self, reaction: str) -> None:
         super().__init__(reaction)
 
@@ -40,6 +42,40 @@ class ReactionDecomposer(Reaction):
         self.reactants: list[str] = self.compounds[: len(self._initial_reactants)]
         self.products: list[str] = self.compounds[len(self._initial_reactants) :]
 
+    @classmethod
+    def from_parts(
+        cls,
+        reaction: str,
+        separator: str,
+        compounds: list[str],
+        initial_coefficients: list[float],
+        reactant_count: int,
+    ) -> "ReactionDecomposer":
+        """
+        A decomposition made of already extracted parts of the reaction
+        (for example, stored in a compiled corpus), without splitting
+        the reaction string again.
+
+        Parameters:
+            reaction (str): A reaction string (without spaces)
+            separator (str): The reactants - products separator of the reaction
+            compounds (list[str]): Formulas of the reactants and the products
+            initial_coefficients (list[float]): Coefficients striped from the formulas
+            reactant_count (int): Number of reactants
+
+        Returns:
+            A ReactionDecomposer object
+        """
+        decomposed = cls.__new__(cls)
+        Reaction.__init__(decomposed, reaction)
+        decomposed.separator = separator
+        decomposed._splitted_compounds = list(zip(initial_coefficients, compounds))
+        decomposed.initial_coefficients = list(initial_coefficients)
+        decomposed.compounds = list(compounds)
+        decomposed.reactants = decomposed.compounds[:reactant_count]
+        decomposed.products = decomposed.compounds[reactant_count:]
+        return decomposed
+
     def __str__(self) -> str:
         return f"separator: {self.separator}; reactants: {self.reactants}; products: {self.products}"
 
@@ -1,6 +1,97 @@
 import numpy as np
 import numpy.typing as npt
 
+from .instrumentation import timed
+
+IntegerArray = npt.NDArray[np.int32] | npt.NDArray[np.int64] | npt.NDArray[np.object_]
+
+# floats above 2**53 are not exact integers anymore
+_EXACT_FLOAT_LIMIT = 2**53
+
+
+def integer_dtype(bound: int) -> np.dtype:
+    """
+    The narrowest integer dtype that holds values up to the bound (by absolute value):
+    int32, int64, or object (Python integers) if int64 would overflow.
+
+    Parameters:
+        bound (int): Max absolute value
+
+    Returns:
+        A NumPy dtype
+    """
+    if bound <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    if bound <= np.iinfo(np.int64).max:
+        return np.dtype(np.int64)
+    return np.dtype(object)
+
+
+def _bound(array: IntegerArray) -> int:
+    """
+    Max absolute value of an integer array (as a Python integer).
+    """
+    if array.size == 0:
+        return 0
+    return max(abs(int(array.max())), abs(int(array.min())))
+
+
+def as_integer_array(values: npt.ArrayLike) -> IntegerArray | None:
+    """
+    Convert an array of whole numbers to the narrowest integer dtype
+    (see [integer_dtype][chemsynthcalc.reaction_matrix.integer_dtype]).
+
+    Parameters:
+        values (npt.ArrayLike): Numbers (like a reaction matrix or coefficients)
+
+    Returns:
+        An integer array, or None if any value is not a whole number
+        (or is a float too big to be exact)
+
+    Examples:
+        >>> as_integer_array([[1.0, 2.0], [0.0, 4.0]])
+        [[1 2]
+        [0 4]]
+        >>> as_integer_array([1.5, 2.0]) is None
+        True
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        return array.astype(integer_dtype(_bound(array)), copy=False)
+    if array.dtype.kind == "O":
+        if all(isinstance(x, int) for x in array.flat):
+            return array
+        try:
+            array = array.astype(np.float64)
+        except (TypeError, ValueError):
+            return None
+    if array.dtype.kind != "f":
+        return None
+    if not np.all(np.isfinite(array)) or not np.all(array == np.trunc(array)):
+        return None
+    bound = float(np.abs(array).max(initial=0))
+    if bound >= _EXACT_FLOAT_LIMIT:
+        return None
+    return array.astype(integer_dtype(int(bound)))
+
+
+def checked_matmul(left: IntegerArray, right: IntegerArray) -> IntegerArray:
+    """
+    Integer matrix product without overflow: the dtype of the product is
+    chosen by the bound max|left| * max column sum of |right|, falling back to
+    int64 or Python integers when int32 could overflow.
+
+    Parameters:
+        left (IntegerArray): A 2D integer array (k, n)
+        right (IntegerArray): A 2D integer array (n, m)
+
+    Returns:
+        The exact (k, m) product
+    """
+    column_sums = np.abs(right.astype(object)).sum(axis=0) if right.size else right
+    dtype = integer_dtype(_bound(left) * _bound(column_sums))
+    return left.astype(dtype, copy=False) @ right.astype(dtype, copy=False)
+
 
 class ChemicalReactionMatrix:
     """
@@ -8,16 +99,25 @@ class ChemicalReactionMatrix:
 
     Arguments:
         parsed_formulas (list[dict[str, float]]): A list of formulas parsed by [ChemicalFormulaParser][chemsynthcalc.formula_parser.ChemicalFormulaParser]
+        elements (list[str] | None): Row keys of the matrix (in the order of first appearance in the formulas by default).
+        Any keys can be used, like species of a reaction network.
+
+    Attributes:
+        matrix (npt.NDArray[np.float64]): The reaction matrix
     """
 
-    def __init__(self, parsed_formulas: list[dict[str, float]]) -> None:
+    def __init__(
+        self, parsed_formulas: list[dict[str, float]], elements: list[str] | None = None
+    ) -> None:
         self._parsed_formulas = parsed_formulas
-        self._merged_dict: dict[str, float] = {
-            k: v for d in self._parsed_formulas for k, v in d.items()
-        }
-        self._elements: list[str] = list(self._merged_dict.keys())
+        if elements is None:
+            elements = list(
+                dict.fromkeys(k for d in self._parsed_formulas for k in d.keys())
+            )
+        self._elements: list[str] = elements
         self.matrix: npt.NDArray[np.float64] = self.create_reaction_matrix()
 
+    @timed("matrix")
     def create_reaction_matrix(self) -> npt.NDArray[np.float64]:
         """
         Creates a 2D NumPy array from nested Python lists.
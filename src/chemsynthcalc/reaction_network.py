@@ -0,0 +1,233 @@
+"""
+Net reactions of reaction networks.
+
+All reactions of a network are balanced and put into one global
+stoichiometric matrix (species × reactions) by
+[ChemicalReactionMatrix][chemsynthcalc.reaction_matrix.ChemicalReactionMatrix]
+with a global species index (canonical formulas, so different spellings
+of the same compound are the same species). The multipliers of the
+reactions that cancel the intermediates are the null space of the
+intermediate rows of that matrix, and the net reaction is the matrix
+times the multipliers.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import numpy.typing as npt
+
+from .chemical_formula import ChemicalFormula
+from .chemical_reaction import ChemicalReaction
+from .integerize import integerize
+from .reaction_matrix import ChemicalReactionMatrix
+
+
+class ReactionNetwork:
+    """
+    A set of reactions that share species.
+
+    Arguments:
+        reactions (list[str]): Reaction strings
+        intermediates (list[str] | None): Formulas of the species that should
+        cancel out in the net reaction (by default every species that is
+        formed in one reaction and consumed in another)
+        mode (str): Coefficients calculation mode of the reactions
+        precision (int): Value of rounding precision (8 by default)
+
+    Raise:
+        ValueError if there are no reactions
+
+    Examples:
+        >>> network = ReactionNetwork(["N2+O2=NO", "NO+O2=NO2"])
+        >>> network.multipliers
+        [1, 1]
+        >>> network.net_reaction
+        N2+2O2=2NO2
+    """
+
+    def __init__(
+        self,
+        reactions: list[str],
+        intermediates: list[str] | None = None,
+        mode: str = "balance",
+        precision: int = 8,
+    ) -> None:
+        if not reactions:
+            raise ValueError("No reactions in the network")
+        self.reactions: list[ChemicalReaction] = [
+            ChemicalReaction(reaction, mode=mode, precision=precision)
+            for reaction in reactions
+        ]
+        self.precision: int = precision
+        self._intermediates = intermediates
+
+    def __repr__(self) -> str:
+        return f"ReactionNetwork({[r.reaction for r in self.reactions]})"
+
+    @cached_property
+    def formulas(self) -> dict[str, str]:
+        """
+        Global species index: canonical formula of every species (in the order
+        of first appearance) and its formula as first written in the network.
+        """
+        formulas: dict[str, str] = {}
+        for reaction in self.reactions:
+            for compound in reaction.chemformula_objs:
+                formulas.setdefault(compound.canonical, compound.formula)
+        return formulas
+
+    @cached_property
+    def species(self) -> list[str]:
+        """
+        Canonical formulas of all species of the network (rows of the stoichiometric matrix).
+        """
+        return list(self.formulas)
+
+    @cached_property
+    def stoichiometric_matrix(self) -> npt.NDArray[np.float64]:
+        """
+        Global stoichiometric matrix: coefficients of every species (rows)
+        in every balanced reaction (columns), reactants with minus sign.
+
+        Examples:
+            >>> ReactionNetwork(["N2+O2=NO", "NO+O2=NO2"]).stoichiometric_matrix
+            [[-1.  0.]
+            [-1. -1.]
+            [ 2. -2.]
+            [ 0.  2.]]
+        """
+        columns: list[dict[str, float]] = []
+        for reaction in self.reactions:
+            separator = len(reaction.decomposed_reaction.reactants)
+            column: dict[str, float] = {}
+            for i, (compound, coefficient) in enumerate(
+                zip(reaction.chemformula_objs, reaction.coefficients)
+            ):
+                sign = -1 if i < separator else 1
+                column[compound.canonical] = (
+                    column.get(compound.canonical, 0.0) + sign * coefficient
+                )
+            columns.append(column)
+        return ChemicalReactionMatrix(columns, self.species).matrix
+
+    @cached_property
+    def intermediates(self) -> list[str]:
+        """
+        Canonical formulas of the species that cancel out in the net reaction.
+        """
+        if self._intermediates is not None:
+            return [ChemicalFormula(f).canonical for f in self._intermediates]
+        formed = (self.stoichiometric_matrix > 0).any(axis=1)
+        consumed = (self.stoichiometric_matrix < 0).any(axis=1)
+        return [
+            species
+            for i, species in enumerate(self.species)
+            if formed[i] and consumed[i]
+        ]
+
+    @cached_property
+    def multipliers(self) -> list[float | int] | list[int]:
+        """
+        Multiplier of every reaction in the net reaction (negative if the
+        reaction runs in reverse): the one-dimensional null space of the
+        intermediate rows of the stoichiometric matrix.
+
+        Returns:
+            Smallest integer multipliers (or floats normalized to the smallest one
+            if they can't be converted to integers)
+
+        Raise:
+            ValueError if the intermediates can't be cancelled, or can be
+            cancelled by more than one independent combination of reactions
+        """
+        columns = len(self.reactions)
+        rows = [self.species.index(species) for species in self.intermediates]
+        system = self.stoichiometric_matrix[rows]
+        if rows:
+            _, s, vt = np.linalg.svd(system)
+        else:
+            s, vt = np.zeros(0), np.ones((1, columns))
+        tolerance = s.max(initial=0) * max(system.shape) * np.finfo(np.float64).eps
+        nullity = columns - int(np.count_nonzero(s > tolerance))
+        if nullity == 0:
+            raise ValueError("No combination of reactions cancels the intermediates")
+        if nullity > 1:
+            raise ValueError(
+                f"{nullity} independent combinations of reactions cancel the intermediates"
+            )
+        vector = vt[-1]
+        # most of the reactions run forward
+        vector = vector if np.sum(vector) > 0 else -vector
+        vector[np.abs(vector) < tolerance] = 0
+        integers = integerize(vector)
+        if integers.success:
+            return integers.coefficients.tolist()
+        smallest = np.abs(vector[vector != 0]).min()
+        return np.round(vector / smallest, self.precision).tolist()
+
+    @cached_property
+    def net_coefficients(self) -> dict[str, float | int]:
+        """
+        Coefficients of the species in the net reaction (reactants with minus sign,
+        intermediates and cancelled species are omitted). Integer coefficients
+        are divided by their greatest common divisor.
+        """
+        net = self.stoichiometric_matrix @ np.array(self.multipliers, dtype=np.float64)
+        net[[self.species.index(species) for species in self.intermediates]] = 0
+        net = np.round(net, self.precision)
+        if np.array_equal(net, np.rint(net)) and net.any():
+            net /= np.gcd.reduce(net.astype(np.int64))
+        return {
+            self.formulas[species]: int(value) if value.is_integer() else float(value)
+            for species, value in zip(self.species, net.tolist())
+            if value != 0
+        }
+
+    @cached_property
+    def net_reaction(self) -> str:
+        """
+        The net reaction string.
+
+        Examples:
+            >>> ReactionNetwork(["C+O2=CO2", "CO2+C=CO"]).net_reaction
+            2C+O2=2CO
+            >>> ReactionNetwork(["C+O2=CO", "CO+O2=CO2"]).net_reaction
+            C+O2=CO2
+        """
+
+        def term(formula: str, coefficient: float | int) -> str:
+            return formula if coefficient == 1 else f"{coefficient}{formula}"
+
+        reactants = [
+            term(formula, -value)
+            for formula, value in self.net_coefficients.items()
+            if value < 0
+        ]
+        products = [
+            term(formula, value)
+            for formula, value in self.net_coefficients.items()
+            if value > 0
+        ]
+        return "+".join(reactants) + "=" + "+".join(products)
+
+    def to_chemical_reaction(
+        self, target: int = 0, target_mass: float = 1.0
+    ) -> ChemicalReaction:
+        """
+        The net reaction as a ChemicalReaction (in the check mode, with the
+        net coefficients) to calculate the masses.
+
+        Arguments:
+            target (int): Index of target compound
+            target_mass (float): Desired mass of target compound (in grams)
+
+        Returns:
+            A ChemicalReaction object
+        """
+        return ChemicalReaction(
+            self.net_reaction,
+            mode="check",
+            target=target,
+            target_mass=target_mass,
+            precision=self.precision,
+        )
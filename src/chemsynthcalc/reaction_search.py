@@ -0,0 +1,202 @@
+"""
+Search of precursor sets that form a target compound.
+
+Candidate reactions are subsets of the precursors (plus subsets of the
+by-products) that are enumerated with cheap filters first:
+
+1. Precursors with elements that can't end up in the target or in a by-product are dropped.
+2. Precursor subsets that don't cover the elements of the target are skipped.
+3. By-products are chosen only to carry away the precursor elements that are not in the target.
+4. The reaction matrix of every candidate should have a one-dimensional null space
+(rank = compounds - 1), otherwise the reaction has no or many solutions, and
+the null vector should give positive coefficients to all compounds.
+
+Only the candidates that pass all filters are balanced (in parallel processes).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from .chemical_formula import ChemicalFormula
+from .chemical_reaction import ChemicalReaction
+from .reaction_matrix import ChemicalReactionMatrix
+
+
+class FoundReaction(NamedTuple):
+    """
+    A balanced reaction found by [find_reactions][chemsynthcalc.reaction_search.find_reactions].
+
+    Attributes:
+        reaction (str): The final reaction string
+        coefficients (list[float | int] | list[int]): Coefficients of the reaction
+        coefficient_sum (float): Sum of the coefficients
+        precursor_mass (float): Total mass of the precursors (in grams) for the target mass
+    """
+
+    reaction: str
+    coefficients: list[float | int] | list[int]
+    coefficient_sum: float
+    precursor_mass: float
+
+
+def _union(formulas: Iterable[ChemicalFormula]) -> int:
+    mask = 0
+    for formula in formulas:
+        mask |= formula.element_mask
+    return mask
+
+
+def _is_balanceable(formulas: list[ChemicalFormula], separator_pos: int) -> bool:
+    """
+    Rank test: a reaction has a unique (up to a factor) solution only if the
+    null space of its matrix is one-dimensional. The null vector (with
+    the sign of products flipped) should also be strictly positive.
+    """
+    matrix = ChemicalReactionMatrix([f.parsed_formula for f in formulas]).matrix
+    _, s, vt = np.linalg.svd(matrix)
+    tolerance = s.max(initial=0) * max(matrix.shape) * np.finfo(np.float64).eps
+    if int(np.count_nonzero(s > tolerance)) != len(formulas) - 1:
+        return False
+    vector = vt[-1].copy()
+    vector[separator_pos:] *= -1
+    vector *= np.sign(vector[0])
+    return bool(np.all(vector > 1e-8))
+
+
+def _candidates(
+    target: ChemicalFormula,
+    precursors: list[ChemicalFormula],
+    byproducts: list[ChemicalFormula],
+    max_size: int,
+) -> list[tuple[list[str], list[str]]]:
+    """
+    Enumerate the (reactants, products) formula lists that pass the filters.
+    """
+    # element sets are bitmasks: a <= b is a & ~b == 0
+    target_elements = target.element_mask
+    allowed = target_elements | _union(byproducts)
+    usable = [
+        p
+        for p in precursors
+        if p.element_mask & target_elements and not p.element_mask & ~allowed
+    ]
+    candidates: list[tuple[list[str], list[str]]] = []
+    for size in range(1, max_size + 1):
+        for subset in combinations(usable, size):
+            elements = _union(subset)
+            if target_elements & ~elements:
+                continue
+            extra = elements & ~target_elements
+            eligible = [b for b in byproducts if not b.element_mask & ~elements]
+            for count in range(len(eligible) + 1):
+                for chosen in combinations(eligible, count):
+                    if extra & ~_union(chosen):
+                        continue
+                    compounds = [*subset, target, *chosen]
+                    if _is_balanceable(compounds, size):
+                        candidates.append(
+                            (
+                                [p.formula for p in subset],
+                                [target.formula, *(b.formula for b in chosen)],
+                            )
+                        )
+    return candidates
+
+
+def _balance_candidate(
+    candidate: tuple[list[str], list[str]], target_mass: float, precision: int
+) -> FoundReaction | None:
+    """
+    Balance one candidate reaction (a worker task).
+    """
+    reactants, products = candidate
+    try:
+        reaction = ChemicalReaction(
+            "+".join(reactants) + "=" + "+".join(products),
+            target_mass=target_mass,
+            precision=precision,
+        )
+        coefficients = reaction.coefficients
+        masses = reaction.masses
+    except Exception:
+        return None
+    return FoundReaction(
+        reaction.final_reaction,
+        coefficients,
+        float(sum(coefficients)),
+        round(sum(masses[: len(reactants)]), precision),
+    )
+
+
+def find_reactions(
+    target: str,
+    precursors: list[str],
+    byproducts: list[str] | None = None,
+    max_size: int = 3,
+    rank_by: str = "coefficients",
+    target_mass: float = 1.0,
+    precision: int = 8,
+    workers: int | None = None,
+) -> list[FoundReaction]:
+    """
+    Find the balanceable reactions of up to max_size precursors that form the target
+    (with some of the by-products).
+
+    Parameters:
+        target (str): Formula of the target compound
+        precursors (list[str]): Formulas of the available precursors
+        byproducts (list[str] | None): Formulas of the possible by-products (like CO2, H2O, NO2)
+        max_size (int): Max number of precursors in a reaction
+        rank_by (str): Sort the reactions by "coefficients" (sum of the coefficients)
+        or "mass" (total mass of the precursors)
+        target_mass (float): Desired mass of target compound (in grams)
+        precision (int): Value of rounding precision
+        workers (int | None): Number of processes (os.cpu_count() by default, 1 runs in this process)
+
+    Returns:
+        A list of [FoundReaction][chemsynthcalc.reaction_search.FoundReaction] sorted by rank_by
+
+    Raise:
+        ValueError if rank_by is unknown or max_size < 1
+
+    Examples:
+        >>> found = find_reactions("BaTiO3", ["BaCO3", "BaO", "TiO2", "Ba(NO3)2"], ["CO2", "NO2", "O2"])
+        >>> [r.reaction for r in found]
+        ['BaO+TiO2=BaTiO3', 'BaCO3+TiO2=BaTiO3+CO2', '2TiO2+2Ba(NO3)2=2BaTiO3+4NO2+O2']
+    """
+    if rank_by not in ("coefficients", "mass"):
+        raise ValueError(f"No ranking {rank_by}")
+    if max_size < 1:
+        raise ValueError("max_size < 1")
+    candidates = _candidates(
+        ChemicalFormula(target),
+        [ChemicalFormula(p) for p in dict.fromkeys(precursors)],
+        [ChemicalFormula(b) for b in dict.fromkeys(byproducts or [])],
+        max_size,
+    )
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(candidates) < 2:
+        results = [_balance_candidate(c, target_mass, precision) for c in candidates]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _balance_candidate,
+                    candidates,
+                    [target_mass] * len(candidates),
+                    [precision] * len(candidates),
+                    chunksize=max(1, len(candidates) // (workers * 4)),
+                )
+            )
+
+    found = [result for result in results if result is not None]
+    if rank_by == "mass":
+        found.sort(key=lambda result: result.precursor_mass)
+    else:
+        found.sort(key=lambda result: result.coefficient_sum)
+    return found
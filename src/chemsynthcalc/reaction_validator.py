@@ -1,6 +1,7 @@
 import re
 
 from .chem_errors import EmptyReaction, InvalidCharacter, NoSeparator
+from .instrumentation import timed
 from .reaction import Reaction
 
 
@@ -36,6 +37,7 @@ class ReactionValidator(Reaction):
         """
         return self.reaction.find(self.reactant_separator) == -1
 
+    @timed("reaction validation")
     def validate_reaction(self) -> bool:
         """
         Validation of the reaction string.
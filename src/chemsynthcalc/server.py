@@ -0,0 +1,418 @@
+"""
+A local HTTP/JSON service for chemsynthcalc (stdlib only).
+
+Endpoints:
+    POST /formula: {"formula": "H2O", "precision": 8, "custom_oxides": []}
+    POST /reaction: {"reaction": "H2+O2=H2O", "mode": "balance", "target": 0,
+    "target_mass": 1.0, "precision": 8, "intify": true}
+    GET /stats: request count and latency percentiles
+
+Concurrent requests are gathered into micro-batches: a batch is split into one
+chunk per worker of a warm worker pool, and identical requests in a batch
+are calculated once (reactions that differ only in the compound order, too).
+
+Examples:
+    $ chemsynthcalc serve --port 8000
+    $ curl -d '{"reaction": "H2+O2=H2O"}' localhost:8000/reaction
+    {"initial reaction": "H2+O2=H2O", ..., "masses": [0.11189565, 0.88810435, 1.0]}
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .batch import calculate_batch
+from .chemical_formula import ChemicalFormula
+from .chemical_reaction import ChemicalReaction
+
+Request = tuple[str, tuple[tuple[str, object], ...]]
+
+_REACTION_ARGUMENTS: set[str] = {
+    "reaction",
+    "mode",
+    "target",
+    "target_mass",
+    "precision",
+    "intify",
+    "timeout",
+}
+_FORMULA_ARGUMENTS: set[str] = {"formula", "precision", "custom_oxides"}
+
+
+def _jsonable(results: dict[str, object]) -> dict[str, object]:
+    """
+    Convert NumPy arrays of the output to lists.
+    """
+    return {
+        name: value.tolist() if hasattr(value, "tolist") else value  # type: ignore
+        for name, value in results.items()
+    }
+
+
+def _error(error: Exception) -> dict[str, object]:
+    """
+    The output of a failed request.
+    """
+    return {"error": type(error).__name__, "message": str(error)}
+
+
+def _calculate(request: Request) -> dict[str, object]:
+    """
+    Calculate one request in a worker.
+
+    Returns:
+        Output results or {"error": error class name, "message": error message}
+    """
+    kind, arguments = request
+    kwargs = dict(arguments)
+    try:
+        if kind == "reaction":
+            return _jsonable(ChemicalReaction(**kwargs).output_results)  # type: ignore
+        oxides = kwargs.pop("custom_oxides", ())
+        return _jsonable(
+            ChemicalFormula(kwargs.pop("formula"), *oxides, **kwargs).output_results  # type: ignore
+        )
+    except Exception as error:
+        return _error(error)
+
+
+def _calculate_batch(requests: list[Request]) -> list[dict[str, object]]:
+    """
+    Calculate a micro-batch of requests in a worker. Reaction requests with
+    the same arguments are calculated together by
+    [calculate_batch][chemsynthcalc.batch.calculate_batch], so the reactions
+    that differ only in the compound order are balanced once.
+    """
+    results: list[dict[str, object] | None] = [None] * len(requests)
+    groups: dict[tuple[tuple[str, object], ...], list[int]] = {}
+    for index, (kind, arguments) in enumerate(requests):
+        if kind == "reaction" and "reaction" in dict(arguments):
+            options = tuple(item for item in arguments if item[0] != "reaction")
+            groups.setdefault(options, []).append(index)
+        else:
+            results[index] = _calculate(requests[index])
+
+    for options, indices in groups.items():
+        reactions = [dict(requests[index][1])["reaction"] for index in indices]
+        try:
+            outputs = calculate_batch(reactions, **dict(options))  # type: ignore
+        except Exception:
+            # bad arguments of the group: fail every request on its own
+            outputs = [None] * len(indices)
+        for index, output in zip(indices, outputs):
+            if output is None:
+                results[index] = _calculate(requests[index])
+            elif isinstance(output, Exception):
+                results[index] = _error(output)
+            else:
+                results[index] = _jsonable(output)
+    return results  # type: ignore
+
+
+def _warm_up() -> int:
+    """
+    Import everything the worker needs before the first request.
+    """
+    ChemicalReaction("H2+O2=H2O").output_results
+    return os.getpid()
+
+
+class LatencyStats:
+    """
+    Request latencies (of the last `window` requests) and batch sizes.
+
+    Parameters:
+        window (int): Number of latest requests to keep
+    """
+
+    def __init__(self, window: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.requests: int = 0
+        self.errors: int = 0
+        self.batches: int = 0
+        self.batched_requests: int = 0
+
+    def add_request(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self.requests += 1
+            self.errors += error
+
+    def add_batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += size
+
+    def summary(self) -> dict[str, object]:
+        """
+        Returns:
+            Request and batch counts and latency percentiles (in ms)
+        """
+        with self._lock:
+            ordered = sorted(self._latencies)
+            output: dict[str, object] = {
+                "requests": self.requests,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean batch size": (
+                    self.batched_requests / self.batches if self.batches else 0.0
+                ),
+            }
+        for percentile in (50, 90, 99):
+            value = ordered[int(percentile / 100 * (len(ordered) - 1))] if ordered else 0.0
+            output[f"p{percentile} ms"] = round(value * 1000, 3)
+        return output
+
+
+class MicroBatcher:
+    """
+    Gathers requests that arrive within a short window into batches and
+    splits every batch into about equal chunks, one task of the executor
+    per worker. Every chunk resolves its own requests when it is done.
+
+    Parameters:
+        executor (Executor): Worker pool
+        max_batch (int): Max number of requests in a batch
+        window (float): Time (in seconds) to wait for more requests after the first one
+        stats (LatencyStats | None): Stats to record batch sizes
+        workers (int): Number of workers of the executor
+
+    Raise:
+        ValueError if max_batch <= 0, window < 0 or workers <= 0
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_batch: int = 64,
+        window: float = 0.002,
+        stats: LatencyStats | None = None,
+        workers: int = 1,
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch <= 0")
+        if window < 0:
+            raise ValueError("window < 0")
+        if workers <= 0:
+            raise ValueError("workers <= 0")
+        self.executor = executor
+        self.workers = workers
+        self.max_batch = max_batch
+        self.window = window
+        self.stats = stats
+        self._queue: queue.SimpleQueue[tuple[Request, Future[dict[str, object]]]] = (
+            queue.SimpleQueue()
+        )
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, request: Request) -> "Future[dict[str, object]]":
+        """
+        Add a request to the next batch.
+
+        Parameters:
+            request (Request): (kind, sorted arguments) of the request
+
+        Returns:
+            A future of the request result
+        """
+        future: Future[dict[str, object]] = Future()
+        self._queue.put((request, future))
+        return future
+
+    def _gather(self) -> list[tuple[Request, "Future[dict[str, object]]"]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._gather()
+            waiting: dict[Request, list[Future[dict[str, object]]]] = {}
+            for request, future in batch:
+                waiting.setdefault(request, []).append(future)
+            if self.stats is not None:
+                self.stats.add_batch(len(batch))
+            requests = list(waiting)
+            size = -(-len(requests) // self.workers)
+            for start in range(0, len(requests), size):
+                chunk = {
+                    request: waiting[request] for request in requests[start : start + size]
+                }
+                try:
+                    result = self.executor.submit(_calculate_batch, list(chunk))
+                except RuntimeError as error:
+                    for futures in chunk.values():
+                        for future in futures:
+                            future.set_exception(error)
+                    continue
+                result.add_done_callback(lambda done, c=chunk: self._fan_out(done, c))
+
+    @staticmethod
+    def _fan_out(
+        done: "Future[list[dict[str, object]]]",
+        waiting: dict[Request, list["Future[dict[str, object]]"]],
+    ) -> None:
+        error = CancelledError() if done.cancelled() else done.exception()
+        results = done.result() if error is None else [None] * len(waiting)
+        for futures, result in zip(waiting.values(), results):
+            for future in futures:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)  # type: ignore
+
+
+class ChemSynthCalcServer(ThreadingHTTPServer):
+    """
+    HTTP server with a micro-batcher and a warm worker pool.
+
+    Parameters:
+        address (tuple[str, int]): Host and port
+        workers (int | None): Number of workers (CPU count by default)
+        processes (bool): Use a process pool (a thread pool otherwise)
+        max_batch (int): Max number of requests in a micro-batch
+        window (float): Micro-batch gathering window (in seconds)
+        timeout (float): Max time (in seconds) to wait for a result
+
+    Attributes:
+        max_body_size (int): Max Content-Length of a request (in bytes)
+    """
+
+    daemon_threads = True
+    max_body_size: int = 1 << 20
+    # bursts of concurrent clients overflow the default listen backlog of 5
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int | None = None,
+        processes: bool = True,
+        max_batch: int = 64,
+        window: float = 0.002,
+        timeout: float = 60.0,
+    ) -> None:
+        super().__init__(address, _Handler)
+        workers = workers or os.cpu_count() or 1
+        self.executor: Executor = (
+            ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+        )
+        for future in [self.executor.submit(_warm_up) for _ in range(workers)]:
+            future.result()
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(
+            self.executor, max_batch, window, self.stats, workers
+        )
+        self.timeout_seconds = timeout
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ChemSynthCalcServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(self, status: int, body: dict[str, object]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send(200, self.server.stats.summary())
+        else:
+            self._send(404, {"error": "NotFound", "message": self.path})
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        allowed = {"/reaction": _REACTION_ARGUMENTS, "/formula": _FORMULA_ARGUMENTS}
+        if self.path not in allowed:
+            self._send(404, {"error": "NotFound", "message": self.path})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if not 0 <= length <= self.server.max_body_size:
+                raise ValueError(
+                    f"Content-Length should be from 0 to {self.server.max_body_size}"
+                )
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("Request body should be a JSON object")
+            unknown = set(body) - allowed[self.path]
+            if unknown:
+                raise ValueError(f"Unknown arguments {sorted(unknown)}")
+            if "custom_oxides" in body:
+                oxides = body["custom_oxides"]
+                if not isinstance(oxides, list) or not all(
+                    isinstance(oxide, str) for oxide in oxides
+                ):
+                    raise ValueError("custom_oxides should be a list of formulas")
+                body["custom_oxides"] = tuple(oxides)
+            request: Request = (self.path[1:], tuple(sorted(body.items())))
+            hash(request)
+        except (ValueError, TypeError) as error:
+            self._send(400, {"error": type(error).__name__, "message": str(error)})
+            self.server.stats.add_request(time.perf_counter() - start, True)
+            return
+
+        try:
+            result = self.server.batcher.submit(request).result(
+                self.server.timeout_seconds
+            )
+            status = 400 if "error" in result else 200
+        except Exception as error:
+            result = {"error": type(error).__name__, "message": str(error)}
+            status = 503
+        self._send(status, result)
+        self.server.stats.add_request(time.perf_counter() - start, status != 200)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int | None = None,
+    processes: bool = True,
+    max_batch: int = 64,
+    window: float = 0.002,
+) -> None:
+    """
+    Run the server until interrupted.
+    See [ChemSynthCalcServer][chemsynthcalc.server.ChemSynthCalcServer] for the arguments.
+    """
+    with ChemSynthCalcServer(
+        (host, port), workers, processes, max_batch, window
+    ) as server:
+        print(f"chemsynthcalc serving on http://{host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,294 @@
+"""
+Multi-step synthesis routes: precursor → intermediate → ... → target.
+
+Every step is balanced once by [ChemicalReaction][chemsynthcalc.chemical_reaction.ChemicalReaction].
+The compounds of all steps are linked by their canonical (Hill) formulas, so
+Y2(CO3)3 formed in one step is the same species as (CO3)3Y2 consumed in the next.
+The extents of all steps (how many times each balanced step runs) are found
+in one linear solve: every intermediate is consumed exactly as much as it is
+formed (with the yields of the steps), and the target is formed in the
+required amount.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import numpy.typing as npt
+
+from .chemical_reaction import ChemicalReaction
+from .reaction_matrix import ChemicalReactionMatrix
+
+
+class SynthesisRoute:
+    """
+    An ordered chain of reactions where products of earlier steps are
+    reactants of later steps.
+
+    Arguments:
+        reactions (list[str]): Reaction strings of the steps (in order)
+        yields (list[float] | None): Yield of every step (0 < yield <= 1, 1 by default)
+        target (int): Index of target compound in the products of the last step
+        target_mass (float): Desired mass of target compound (in grams)
+        precision (int): Value of rounding precision (8 by default)
+        intify (bool): Is it required to convert the coefficients to integer values?
+
+    Raise:
+        ValueError if the yields are not in (0, 1], the number of yields doesn't match
+        the number of steps, target mass <= 0, or the target is not a product of the last step
+
+    Examples:
+        >>> route = SynthesisRoute(["BaCO3=BaO+CO2", "BaO+TiO2=BaTiO3"], yields=[0.9, 0.8])
+        >>> route.masses
+        {'BaCO3': 1.17533005, 'TiO2': 0.42810936}
+    """
+
+    def __init__(
+        self,
+        reactions: list[str],
+        yields: list[float] | None = None,
+        target: int = 0,
+        target_mass: float = 1.0,
+        precision: int = 8,
+        intify: bool = True,
+    ) -> None:
+        if not reactions:
+            raise ValueError("No reactions in the route")
+        if yields is None:
+            yields = [1.0] * len(reactions)
+        if len(yields) != len(reactions):
+            raise ValueError(
+                f"{len(yields)} yields for a route of {len(reactions)} steps"
+            )
+        if any(not 0 < y <= 1 for y in yields):
+            raise ValueError("yield should be in the range (0, 1]")
+        if target_mass <= 0:
+            raise ValueError("target mass <= 0")
+
+        self.steps: list[ChemicalReaction] = [
+            ChemicalReaction(reaction, precision=precision, intify=intify)
+            for reaction in reactions
+        ]
+        self.yields: npt.NDArray[np.float64] = np.array(yields, dtype=np.float64)
+        self.target_mass: float = target_mass
+        self.precision: int = precision
+        last = self.steps[-1]
+        self._target_compound: int = last._target_to_index(target)
+        if self._target_compound < len(last.decomposed_reaction.reactants):
+            raise ValueError("The target should be a product of the last step")
+
+    def __repr__(self) -> str:
+        return f"SynthesisRoute({[step.reaction for step in self.steps]}, {self.yields.tolist()})"
+
+    @cached_property
+    def species(self) -> list[str]:
+        """
+        Canonical formulas of all compounds of the route (in the order of first appearance).
+
+        Examples:
+            >>> SynthesisRoute(["BaCO3=BaO+CO2", "BaO+TiO2=BaTiO3"]).species
+            ['CBaO3', 'BaO', 'CO2', 'O2Ti', 'BaO3Ti']
+        """
+        return list(
+            dict.fromkeys(
+                compound.canonical
+                for step in self.steps
+                for compound in step.chemformula_objs
+            )
+        )
+
+    @cached_property
+    def formulas(self) -> dict[str, str]:
+        """
+        The formula (as first written in the route) of every species.
+        """
+        formulas: dict[str, str] = {}
+        for step in self.steps:
+            for compound in step.chemformula_objs:
+                formulas.setdefault(compound.canonical, compound.formula)
+        return formulas
+
+    @cached_property
+    def molar_masses(self) -> npt.NDArray[np.float64]:
+        """
+        Molar masses of the species (in g/mol).
+        """
+        masses: dict[str, float] = {}
+        for step in self.steps:
+            for compound in step.chemformula_objs:
+                masses.setdefault(compound.canonical, compound.molar_mass)
+        return np.array([masses[s] for s in self.species], dtype=np.float64)
+
+    def _step_species(self, step: ChemicalReaction) -> list[str]:
+        return [compound.canonical for compound in step.chemformula_objs]
+
+    def _step_consumption(self, step: ChemicalReaction) -> dict[str, float]:
+        consumption: dict[str, float] = {}
+        separator = len(step.decomposed_reaction.reactants)
+        for species, coefficient in zip(
+            self._step_species(step)[:separator], step.coefficients[:separator]
+        ):
+            consumption[species] = consumption.get(species, 0.0) + coefficient
+        return consumption
+
+    @cached_property
+    def stoichiometric_matrix(self) -> npt.NDArray[np.float64]:
+        """
+        Net change of moles of every species (rows) in one run of every
+        balanced step (columns): reactants are negative, products are
+        positive and multiplied by the step yield.
+
+        Examples:
+            >>> SynthesisRoute(["BaCO3=BaO+CO2", "BaO+TiO2=BaTiO3"], yields=[0.9, 0.8]).stoichiometric_matrix
+            [[-1.   0. ]
+            [ 0.9 -1. ]
+            [ 0.9  0. ]
+            [ 0.  -1. ]
+            [ 0.   0.8]]
+        """
+        columns: list[dict[str, float]] = []
+        for step, step_yield in zip(self.steps, self.yields):
+            separator = len(step.decomposed_reaction.reactants)
+            column: dict[str, float] = {}
+            for i, (species, coefficient) in enumerate(
+                zip(self._step_species(step), step.coefficients)
+            ):
+                change = -coefficient if i < separator else coefficient * step_yield
+                column[species] = column.get(species, 0.0) + change
+            columns.append(column)
+        return ChemicalReactionMatrix(columns, self.species).matrix
+
+    @cached_property
+    def intermediates(self) -> list[str]:
+        """
+        Species that are formed in one step and consumed in another.
+        """
+        formed = self.stoichiometric_matrix > 0
+        consumed = self.stoichiometric_matrix < 0
+        return [
+            species
+            for i, species in enumerate(self.species)
+            if formed[i].any() and consumed[i].any()
+        ]
+
+    @cached_property
+    def precursors(self) -> list[str]:
+        """
+        Species that are only consumed (the starting materials).
+        """
+        formed = (self.stoichiometric_matrix > 0).any(axis=1)
+        consumed = (self.stoichiometric_matrix < 0).any(axis=1)
+        return [
+            species
+            for i, species in enumerate(self.species)
+            if consumed[i] and not formed[i]
+        ]
+
+    @cached_property
+    def target(self) -> str:
+        """
+        Canonical formula of the target compound.
+        """
+        return self._step_species(self.steps[-1])[self._target_compound]
+
+    @cached_property
+    def _linking_system(self) -> npt.NDArray[np.float64]:
+        """
+        Rows of the stoichiometric matrix of the target and the intermediates.
+
+        Raise:
+            ValueError if the extents of the steps can't be determined
+        """
+        rows = [self.species.index(self.target)] + [
+            self.species.index(species) for species in self.intermediates
+        ]
+        system = self.stoichiometric_matrix[rows]
+        if np.linalg.matrix_rank(system) < len(self.steps):
+            raise ValueError("Steps of the route are not linked by intermediates")
+        return system
+
+    def extents(
+        self, target_masses: float | list[float] | npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        How many times every balanced step runs (in moles of the reaction as
+        written with its coefficients) for every target mass.
+
+        Arguments:
+            target_masses (float | list[float] | npt.ArrayLike): Desired masses of target compound (in grams)
+
+        Returns:
+            A 2D array of shape (target masses, steps)
+
+        Raise:
+            ValueError if any of target masses <= 0, or if the intermediates
+            can't be balanced between the steps
+        """
+        masses = np.atleast_1d(np.asarray(target_masses, dtype=np.float64))
+        if np.any(masses <= 0):
+            raise ValueError("target mass <= 0")
+        system = self._linking_system
+        target_moles = masses / self.molar_masses[self.species.index(self.target)]
+        rhs = np.zeros((system.shape[0], masses.size))
+        rhs[0] = target_moles
+        extents, *_ = np.linalg.lstsq(system, rhs, rcond=None)
+        if not np.allclose(system @ extents, rhs) or np.any(extents <= 0):
+            raise ValueError("Intermediates can't be balanced between the steps")
+        return extents.T
+
+    def masses_for(
+        self, target_masses: float | list[float] | npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        Masses of the precursors (in grams) for many target masses at once.
+
+        Arguments:
+            target_masses (float | list[float] | npt.ArrayLike): Desired masses of target compound (in grams)
+
+        Returns:
+            A 2D array of shape (target masses, precursors)
+
+        Examples:
+            >>> SynthesisRoute(["BaCO3=BaO+CO2", "BaO+TiO2=BaTiO3"]).masses_for([1, 2])
+            [[0.84623763 0.34248749]
+            [1.69247527 0.68497498]]
+        """
+        extents = self.extents(target_masses)
+        consumption = np.zeros((len(self.precursors), len(self.steps)))
+        for j, step in enumerate(self.steps):
+            for species, coefficient in self._step_consumption(step).items():
+                if species in self.precursors:
+                    consumption[self.precursors.index(species), j] = coefficient
+        moles = extents @ consumption.T
+        indices = [self.species.index(species) for species in self.precursors]
+        return np.round(moles * self.molar_masses[indices], self.precision)
+
+    @property
+    def masses(self) -> dict[str, float]:
+        """
+        Masses of the precursors (in grams) for the target mass.
+
+        Returns:
+            A dict of precursor formula: mass
+        """
+        masses = self.masses_for(self.target_mass)[0]
+        return {
+            self.formulas[species]: float(mass)
+            for species, mass in zip(self.precursors, masses)
+        }
+
+    @property
+    def output_results(self) -> dict[str, object]:
+        """
+        Collection of the route outputs in one dictionary.
+        """
+        return {
+            "reactions": [step.final_reaction for step in self.steps],
+            "yields": self.yields.tolist(),
+            "intermediates": [self.formulas[s] for s in self.intermediates],
+            "target": self.formulas[self.target],
+            "target mass": self.target_mass,
+            "extents": np.round(
+                self.extents(self.target_mass)[0], self.precision
+            ).tolist(),
+            "masses": self.masses,
+        }
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from chemsynthcalc import aio
+from chemsynthcalc.chem_errors import NoSeparator
+from chemsynthcalc.chemical_formula import ChemicalFormula
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+
+reactions: list[str] = [
+    "KI+H2SO4=I2+H2S+K2SO4+H2O",
+    "H2+O2=H2O",
+    "H2O2",
+    "KMnO4+HCl=MnCl2+Cl2+H2O+KCl",
+]
+
+
+def test_balance():
+    result = asyncio.run(aio.balance(reactions[0], target_mass=2))
+    assert result["masses"] == ChemicalReaction(reactions[0], target_mass=2).masses
+
+
+def test_calculate_formula():
+    result = asyncio.run(aio.calculate_formula("K2FeO4", "FeO3"))
+    assert result["oxide percent"] == ChemicalFormula("K2FeO4", "FeO3").oxide_percent
+
+
+def test_balance_many_order():
+    async def collect() -> list[object]:
+        calculator = aio.AsyncCalculator(max_workers=2, max_concurrency=2)
+        try:
+            return [r async for r in calculator.balance_many(reactions, max_in_flight=3)]
+        finally:
+            calculator.shutdown()
+
+    results = asyncio.run(collect())
+    assert results[0]["final reaction"] == "8KI+5H2SO4=4I2+H2S+4K2SO4+4H2O"  # type: ignore
+    assert results[1]["final reaction"] == "2H2+O2=2H2O"  # type: ignore
+    assert isinstance(results[2], NoSeparator)
+    assert results[3]["coefficients"] == [2, 16, 2, 5, 8, 2]  # type: ignore
+
+
+def test_balance_many_raise():
+    async def collect() -> None:
+        async for _ in aio.balance_many(reactions, return_exceptions=False):
+            pass
+
+    with pytest.raises(NoSeparator):
+        asyncio.run(collect())
+
+
+def test_cancel_queued():
+    started: list[str] = []
+    release = threading.Event()
+
+    def blocking(name: str) -> str:
+        started.append(name)
+        release.wait(5)
+        return name
+
+    async def scenario() -> None:
+        calculator = aio.AsyncCalculator(max_workers=1, max_concurrency=1)
+        first = asyncio.ensure_future(calculator.run(blocking, "first"))
+        queued = asyncio.ensure_future(calculator.run(blocking, "queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        release.set()
+        assert await first == "first"
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        calculator.shutdown()
+
+    asyncio.run(scenario())
+    assert started == ["first"]
+
+
+def test_wrong_concurrency():
+    with pytest.raises(ValueError):
+        aio.AsyncCalculator(max_concurrency=0)
+
+
+def test_wrong_max_in_flight():
+    async def scenario():
+        calculator = aio.AsyncCalculator(max_concurrency=2)
+        try:
+            for value in (0, -1):
+                with pytest.raises(ValueError):
+                    [r async for r in calculator.balance_many(["H2+O2=H2O"], max_in_flight=value)]
+        finally:
+            calculator.shutdown()
+
+    asyncio.run(scenario())
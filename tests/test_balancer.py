@@ -1,8 +1,16 @@
+import numpy as np
 import pytest
 import csv
 import ast
+import time
 from chemsynthcalc.chemical_reaction import ChemicalReaction
-from chemsynthcalc.balancer import Balancer
+from chemsynthcalc.chem_errors import BalancingError, BalancingTimeout
+from chemsynthcalc.balancer import (
+    Balancer,
+    BalancingAttempt,
+    aggregate_attempts,
+    estimate_cost,
+)
 
 
 def test_balancer_wrong_precision():
@@ -41,3 +49,197 @@ def test_ppinv_algorithm(reaction: str, coefs: list[int | float]):
 @pytest.mark.parametrize("reaction,coefs", comb_set)
 def test_comb_algorithm(reaction: str, coefs: list[int | float]):
     assert ChemicalReaction(reaction).balancer.comb() == coefs
+
+
+def test_attempts_log():
+    reaction_obj = ChemicalReaction("Fe2O3+C=Fe3O4+FeO+Fe+Fe3C+CO+CO2")
+    reaction_obj.coefficients
+    attempts = reaction_obj.balancing_attempts
+    assert [(a.method, a.reason, a.success) for a in attempts] == [
+        ("inv", "length mismatch", False),
+        ("gpinv", "", True),
+    ]
+    assert all(a.duration_ns > 0 for a in attempts)
+
+
+def test_attempts_log_direct_call():
+    balancer = ChemicalReaction("H2+O2=H2O").balancer
+    balancer.comb()
+    with pytest.raises(ValueError):
+        balancer._calculate_by_method("wrong")
+    assert [(a.method, a.reason) for a in balancer.attempts] == [
+        ("comb", ""),
+        ("wrong", "ValueError"),
+    ]
+
+
+def test_aggregate_attempts():
+    logs = [
+        [BalancingAttempt("inv", "", 10), BalancingAttempt("gpinv", "", 5)],
+        [BalancingAttempt("inv", "singular matrix", 3)],
+        [BalancingAttempt("inv", "", 20)],
+    ]
+    assert aggregate_attempts(logs) == {
+        "inv": {
+            "ok": {"count": 2, "total_ns": 30},
+            "singular matrix": {"count": 1, "total_ns": 3},
+        },
+        "gpinv": {"ok": {"count": 1, "total_ns": 5}},
+    }
+
+
+def test_shared_decomposition(monkeypatch: pytest.MonkeyPatch):
+    calls: list[int] = []
+    svd = np.linalg.svd
+
+    def counting_svd(*args, **kwargs):
+        calls.append(1)
+        return svd(*args, **kwargs)
+
+    monkeypatch.setattr(np.linalg, "svd", counting_svd)
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    assert balancer.inv() == [2, 16, 2, 5, 8, 2]
+    assert balancer.gpinv() == [2, 16, 2, 5, 8, 2]
+    assert len(calls) == 1
+
+
+def test_inv_dependent_rows():
+    # the baseline output of a reaction with linearly dependent element rows
+    reaction_obj = ChemicalReaction("0.5Li2CO3+1MnCO3+0.5Ta2O5==1LiTaO3+MnO+1.5CO2")
+    assert reaction_obj.coefficients == [1, 4, 1, 2, 4, 5]
+    assert reaction_obj.algorithm == "inverse"
+    assert reaction_obj.masses == [
+        0.15661877, 0.97459441, 0.93666614, 1.0, 0.60145477, 0.46642455
+    ]
+
+
+def test_check_balance_near_float_limit():
+    # one residual sums 9 coefficients, so the float64 sums round it away
+    x = 2**51 + 1
+    reactants = np.array([[1.0] * 5])
+    products = np.array([[1.0] * 4])
+    vectors = np.array([[x, x, x, x, 1, x, x, x, x]], dtype=np.int64)
+    check = Balancer.check_balance(reactants, products, vectors)
+    assert check.balanced.tolist() == [False]
+    assert check.residuals.tolist() == [1.0]
+    assert not Balancer.is_reaction_balanced(reactants, products, vectors[0].tolist())
+    assert Balancer.is_reaction_balanced(
+        reactants, products, [x, x, x, x, 0, x, x, x, x]
+    )
+
+
+def test_check_balance():
+    reaction_obj = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl")
+    vectors = np.ones((1000, 6), dtype=np.int64)
+    vectors[[3, 700]] = [2, 16, 2, 5, 8, 2]
+    check = Balancer.check_balance(
+        reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, vectors
+    )
+    assert np.flatnonzero(check.balanced).tolist() == [3, 700]
+    assert check.residuals[3] == 0 and check.residuals[0] > 0
+    float_check = Balancer.check_balance(
+        reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, vectors / 2
+    )
+    assert np.array_equal(float_check.balanced, check.balanced)
+    assert np.allclose(float_check.residuals, check.residuals / 2)
+
+
+def test_check_balance_agrees_with_single_check():
+    reaction_obj = ChemicalReaction("NH4ClO4+HNO3+HCl=HClO4+NOCl+N2O+N2O3+H2O+Cl2")
+    vectors = [
+        [64, 167, 137, 80, 43, 64, 30, 240, 39],
+        [64, 167, 137, 80, 43, 64, 30, 240, 40],
+        [32, 83.5, 68.5, 40, 21.5, 32, 15, 120, 19.5],
+    ]
+    check = Balancer.check_balance(
+        reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, vectors
+    )
+    assert check.balanced.tolist() == [
+        Balancer.is_reaction_balanced(
+            reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, vector
+        )
+        for vector in vectors
+    ] == [True, False, True]
+
+
+def test_check_balance_wrong_shape():
+    reaction_obj = ChemicalReaction("H2+O2=H2O")
+    with pytest.raises(ValueError):
+        Balancer.check_balance(
+            reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, [[1, 2]]
+        )
+    assert not Balancer.is_reaction_balanced(
+        reaction_obj.balancer.reactant_matrix, reaction_obj.balancer.product_matrix, [2, 1]
+    )
+
+
+def test_balancer_wrong_timeout():
+    reaction_obj = ChemicalReaction("H2+O2=H2O")
+    with pytest.raises(ValueError):
+        Balancer(reaction_obj.matrix, 2, 8, timeout=0)
+
+
+def test_expired_deadline():
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    with pytest.raises(BalancingTimeout):
+        balancer.auto(deadline=time.monotonic() - 1)
+    # auto doesn't try the next methods after a timeout
+    assert [(a.method, a.reason) for a in balancer.attempts] == [("inv", "timeout")]
+    assert balancer.auto(deadline=time.monotonic() + 60)[0] == [2, 16, 2, 5, 8, 2]
+
+
+def test_comb_timeout():
+    reaction_obj = ChemicalReaction(
+        "NH4ClO4+HNO3+HCl=HClO4+NOCl+N2O+N2O3+H2O+Cl2", timeout=0.05
+    )
+    start = time.monotonic()
+    with pytest.raises(BalancingTimeout):
+        reaction_obj.balancer.comb()
+    assert time.monotonic() - start < 1
+    assert reaction_obj.balancing_attempts[-1].reason == "timeout"
+
+
+def test_estimate():
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    estimates = {
+        method: balancer.estimate(method)
+        for method in ("inv", "gpinv", "ppinv", "exact", "comb")
+    }
+    assert all(e.nullity == 1 for e in estimates.values())
+    # coefficients up to 21 for 6 compounds
+    assert estimates["comb"].iterations == sum(i**6 for i in range(1, 22))
+    assert estimates["comb"].seconds > 100 * estimates["inv"].seconds
+    assert estimates["comb"].peak_memory < balancer.memory_limit
+    with pytest.raises(ValueError):
+        balancer.estimate("wrong")
+    # the estimate doesn't decompose the matrix
+    assert "decomposition" not in balancer.__dict__
+    assert estimate_cost("inv", 5, 6) == estimates["inv"]
+    assert estimate_cost("inv", 3, 6).nullity == 3
+
+
+def test_memory_limit():
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    balancer.memory_limit = 0
+    with pytest.raises(BalancingError):
+        balancer.auto()
+    assert [a.reason for a in balancer.attempts] == ["memory limit"] * 3
+    assert "decomposition" not in balancer.__dict__
+    assert balancer.plan() == []
+
+
+def test_plan():
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    assert balancer.plan() == ["inv", "gpinv", "ppinv"]
+    balancer.memory_limit = balancer.estimate("inv").peak_memory
+    assert balancer.plan() == ["inv", "gpinv"]
+    decimal = ChemicalReaction("Li2CO3+NiO+Co3O4+Al2O3+O2=Li0.95Ni0.8Co0.15Al0.05O2+CO2")
+    assert decimal.balancer.plan()[0] == "exact"
+
+
+def test_over_time_budget():
+    balancer = ChemicalReaction("KMnO4+HCl=MnCl2+Cl2+H2O+KCl").balancer
+    assert balancer._cost_reason("inv", None) == ""
+    assert balancer._cost_reason("inv", time.monotonic() + 1e-7) == "over time budget"
+    # comb checks the deadline by itself
+    assert balancer._cost_reason("comb", time.monotonic() + 1e-7) == ""
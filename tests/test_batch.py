@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from chemsynthcalc.balancer import Balancer
+from chemsynthcalc.batch import calculate_batch, check_batch
+from chemsynthcalc.chem_errors import BalancingError, BalancingTimeout, NoSeparator
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+
+
+def test_calculate_batch() -> None:
+    reactions = [
+        "KMnO4+HCl=MnCl2+Cl2+H2O+KCl",
+        "HCl + KMnO4 -> KCl+MnCl2+Cl2+H2O",
+        "H2+O2",
+        "KMnO4+HCl=MnCl2+Cl2+H2O+KCl",
+    ]
+    results = calculate_batch(reactions)
+    for reaction, result in zip(reactions[:2], results[:2]):
+        expected = ChemicalReaction(reaction).output_results
+        assert result["coefficients"] == expected["coefficients"]  # type: ignore
+        assert result["masses"] == expected["masses"]  # type: ignore
+        assert result["initial reaction"] == expected["initial reaction"]  # type: ignore
+    assert isinstance(results[2], NoSeparator)
+    assert results[3] == results[0]
+    assert results[3] is not results[0]
+
+
+def test_check_batch() -> None:
+    reactions = [
+        "2KMnO4+16HCl=2MnCl2+5Cl2+8H2O+2KCl",
+        "16HCl + 2KMnO4 -> 2KCl+2MnCl2+5Cl2+8H2O",
+        "KMnO4+HCl=MnCl2+Cl2+H2O+KCl",
+        "H2+O2",
+        "2H2+O2=2H2O",
+    ]
+    check = check_batch(reactions)
+    assert check.balanced.tolist() == [True, True, False, False, True]
+    assert check.residuals[2] > 0
+    assert np.isnan(check.residuals[3])
+    for reaction, balanced in zip(reactions, check.balanced):
+        try:
+            ChemicalReaction(reaction, mode="check").coefficients
+            expected = True
+        except Exception:
+            expected = False
+        assert balanced == expected
+
+
+def test_calculate_batch_timeout() -> None:
+    results = calculate_batch(["H2+O2=H2O", "CaCO3=CaO+CO2"], timeout=1e-9)
+    assert all(isinstance(result, BalancingTimeout) for result in results)
+    results = calculate_batch(["H2+O2=H2O", "CaCO3=CaO+CO2"], timeout=60)
+    assert [result["coefficients"] for result in results] == [[2, 1, 2], [1, 1, 1]]
+
+
+def test_calculate_batch_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Balancer, "memory_limit", 1000)
+    results = calculate_batch(["KMnO4+HCl=MnCl2+Cl2+H2O+KCl", "H2+O2=H2O"])
+    assert isinstance(results[0], BalancingError)
+    assert not isinstance(results[0], BalancingTimeout)
+    assert results[1]["coefficients"] == [2, 1, 2]  # type: ignore
@@ -0,0 +1,102 @@
+import pytest
+
+from chemsynthcalc.batch_validation import (
+    ValidationIssue,
+    validate_formulas,
+    validate_reactions,
+)
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+
+
+def test_valid_inputs() -> None:
+    reports = validate_formulas(["H2O", "(NH4)2SO4", "CuSO4*5H2O", "C2H5OH", "0.5H2"])
+    assert all(report.valid for report in reports)
+    reports = validate_reactions(["H2+O2=H2O", "2H2 + O2 -> 2H2O", "BaCO3+TiO2==BaTiO3+CO2"])
+    assert all(report.valid for report in reports)
+
+
+def test_formula_issues() -> None:
+    issues = validate_formulas(["Xx2(SO4"])[0].issues
+    assert issues == [
+        ValidationIssue("NoSuchAtom", "Xx", 0, -1),
+        ValidationIssue("BracketsNotPaired", "(", 3, -1),
+    ]
+    assert validate_formulas([""])[0].issues == [ValidationIssue("EmptyFormula", "", -1, -1)]
+    assert validate_formulas(["H2O$"])[0].issues == [
+        ValidationIssue("InvalidCharacter", "$", 3, -1)
+    ]
+    assert validate_formulas(["hO"])[0].issues == [ValidationIssue("NoSuchAtom", "h", 0, -1)]
+    assert validate_formulas(["H2O*H2O*H2O"])[0].issues == [
+        ValidationIssue("MoreThanOneAdduct", "*", 7, -1)
+    ]
+
+
+def test_all_problems_reported() -> None:
+    issues = validate_formulas(["Qq(H2O]]*Zz*"])[0].issues
+    assert [issue.error for issue in issues] == [
+        "NoSuchAtom",
+        "NoSuchAtom",
+        "BracketsNotPaired",
+        "BracketsNotPaired",
+        "BracketsNotPaired",
+        "MoreThanOneAdduct",
+    ]
+
+
+def test_reaction_issues() -> None:
+    issues = validate_reactions(["H2+O2$=H2O*H2O*H2O"])[0].issues
+    assert issues == [
+        ValidationIssue("InvalidCharacter", "$", 5, -1),
+        ValidationIssue("MoreThanOneAdduct", "*", 7, 2),
+    ]
+    assert validate_reactions([""])[0].issues == [ValidationIssue("EmptyReaction", "", -1, -1)]
+    assert validate_reactions(["H2+O2 H2O"])[0].issues == [
+        ValidationIssue("NoSeparator", "", -1, -1)
+    ]
+    assert validate_reactions(["H2O=H2O"])[0].issues == [
+        ValidationIssue("NoSeparator", "+", -1, -1)
+    ]
+    assert validate_reactions(["H2++O2=H2O"])[0].issues == [
+        ValidationIssue("EmptyFormula", "", -1, 1)
+    ]
+    assert validate_reactions(["1.2.3H2+O2=H2O"])[0].issues == [
+        ValidationIssue("ValueError", "1.2.3", 0, 0)
+    ]
+
+
+@pytest.mark.parametrize(
+    "reaction",
+    [
+        "H2+O2=H2O",
+        "H2+O2=H2Xx",
+        "H2+O2=H2O)",
+        "H2+O2=",
+        "H2+O2H2O",
+        "2.5.H2+O2=H2O",
+        "H2+O2=2",
+        "Cu(NO3)2*3H2O+NaOH=Cu(OH)2+NaNO3*H2O*H2O",
+        "Fe + Cl2 → FeCl3",
+        "Fe+cl2=FeCl3",
+    ],
+)
+def test_agrees_with_validators(reaction: str) -> None:
+    try:
+        ChemicalReaction(reaction).decomposed_reaction
+        ChemicalReaction(reaction).chemformula_objs
+        valid = True
+    except Exception:
+        valid = False
+    assert validate_reactions([reaction])[0].valid == valid
+
+
+def test_misordered_brackets() -> None:
+    assert validate_formulas([")O("])[0].issues == [
+        ValidationIssue("BracketsNotPaired", ")", 0, -1),
+        ValidationIssue("BracketsNotPaired", "(", 2, -1),
+    ]
+    assert validate_formulas(["]F["])[0].issues != []
+    issues = validate_reactions(["H2+)O(=H2O"])[0].issues
+    assert [(issue.error, issue.compound) for issue in issues] == [
+        ("BracketsNotPaired", 1),
+        ("BracketsNotPaired", 1),
+    ]
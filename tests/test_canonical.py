@@ -0,0 +1,55 @@
+import pytest
+
+from chemsynthcalc.canonical import (
+    ReactionKey,
+    composition_hash,
+    dedupe,
+    hill_formula,
+    reaction_key,
+)
+from chemsynthcalc.formula_parser import ChemicalFormulaParser
+
+
+@pytest.mark.parametrize(
+    "formula, hill",
+    [
+        ("Y2(CO3)3", "C3O9Y2"),
+        ("(CO3)3Y2", "C3O9Y2"),
+        ("CH3COOH", "C2H4O2"),
+        ("NH4Cl", "ClH4N"),
+        ("Li0.95CoO2", "CoLi0.95O2"),
+        ("CuSO4*5H2O", "CuH10O9S"),
+    ],
+)
+def test_hill_formula(formula: str, hill: str) -> None:
+    assert hill_formula(ChemicalFormulaParser(formula).parse_formula()) == hill
+
+
+def test_composition_hash() -> None:
+    def parse(formula: str) -> dict[str, float]:
+        return ChemicalFormulaParser(formula).parse_formula()
+
+    assert composition_hash(parse("Y2(CO3)3")) == composition_hash(parse("Y2C3O9"))
+    assert composition_hash(parse("Y2(CO3)3")) != composition_hash(parse("Y2O3"))
+    # stable between processes and Python versions
+    assert composition_hash({"H": 2.0, "O": 1.0}) == 0x845e9607262f302e
+
+
+def test_reaction_key() -> None:
+    key = reaction_key("Y2(CO3)3 → CO2 + Y2O3")
+    assert key == ReactionKey(("C3O9Y2",), ("CO2", "O3Y2"))
+    assert key == reaction_key("Y2C3O9=Y2O3+CO2")
+    assert key.hash == reaction_key("Y2C3O9=Y2O3+CO2").hash
+    assert key != reaction_key("CO2+Y2O3=Y2(CO3)3")
+    assert reaction_key("2H2+O2=2H2O") == reaction_key("H2+O2=H2O")
+    assert reaction_key("2H2+O2=2H2O", True) != reaction_key("H2+O2=H2O", True)
+
+
+def test_dedupe() -> None:
+    deduped = dedupe(
+        ["H2+O2=H2O", "O2 + H2 -> H2O", "CaCO3=CaO+CO2", "H2+O2", "H2+O2", "H2O=H2+O2"]
+    )
+    assert deduped.unique == [0, 2, 3, 4, 5]
+    assert deduped.groups == [0, 0, 1, 2, 3, 4]
+    assert deduped.expand("abcde") == ["a", "a", "b", "c", "d", "e"]
+    assert deduped.permute(1, [2, 1, 2]) == [1, 2, 2]
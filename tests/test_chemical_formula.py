@@ -19,3 +19,12 @@ def test_repr() -> None:
 
 def test_str() -> None:
     assert ChemicalFormula(formula=formula).__str__() == "[Ru(C10H8N2)3]Cl2*6H2O"
+
+
+def test_canonical() -> None:
+    assert ChemicalFormula(formula=formula).canonical == "C30H36Cl2N6O6Ru"
+    spellings = [ChemicalFormula(f) for f in ("Y2(CO3)3", "Y2C3O9", "(CO3)3Y2")]
+    assert {f.canonical for f in spellings} == {"C3O9Y2"}
+    assert len({f.composition_hash for f in spellings}) == 1
+    assert len({f.molar_mass for f in spellings}) == 1
+    assert ChemicalFormula("Y2O3").composition_hash != spellings[0].composition_hash
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from chemsynthcalc.chemical_reaction import ChemicalReaction
@@ -91,3 +92,126 @@ def test_masses() -> None:
         0.68654792,
         0.07097859,
     ]
+
+
+def test_set_target_mass() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    reaction_obj.masses
+    balancer = reaction_obj.balancer
+    reaction_obj.target_mass = 2
+    assert reaction_obj.masses == [
+        2.61618003,
+        0.96600222,
+        2.0,
+        0.06712924,
+        1.37309584,
+        0.14195717,
+    ]
+    assert reaction_obj.balancer is balancer
+
+
+def test_set_wrong_target_mass() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    with pytest.raises(ValueError):
+        reaction_obj.target_mass = 0
+
+
+def test_set_timeout() -> None:
+    reaction_obj = ChemicalReaction(reaction, timeout=10)
+    assert reaction_obj.balancer.timeout == 10
+    reaction_obj.timeout = None
+    assert reaction_obj.balancer.timeout is None
+    with pytest.raises(ValueError):
+        reaction_obj.timeout = 0
+    with pytest.raises(ValueError):
+        ChemicalReaction(reaction, timeout=-1)
+
+
+def test_set_target() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    reaction_obj.masses
+    coefficients = reaction_obj.coefficients
+    reaction_obj.target = -1
+    assert reaction_obj.normalized_coefficients == [1.6, 1, 0.8, 0.2, 0.8, 0.8]
+    assert reaction_obj.output_results["target"] == "H2SO4"
+    assert reaction_obj.coefficients is coefficients
+
+
+def test_with_target() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    masses = reaction_obj.masses
+    copied = reaction_obj.with_target(-1, 2)
+    assert copied is not reaction_obj
+    assert copied.masses == ChemicalReaction(reaction, target=-1, target_mass=2).masses
+    assert copied.coefficients is reaction_obj.coefficients
+    assert reaction_obj.target == 0
+    assert reaction_obj.masses is masses
+
+
+def test_invalidate_seeded_properties() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    # seeded without the chemformula_objs they depend on
+    reaction_obj.parsed_formulas = ChemicalReaction(reaction).parsed_formulas
+    reaction_obj.matrix
+    reaction_obj.precision = 3
+    assert "parsed_formulas" not in reaction_obj.__dict__
+    assert "matrix" not in reaction_obj.__dict__
+
+
+def test_set_precision() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    reaction_obj.masses
+    reaction_obj.precision = 3
+    assert reaction_obj.masses == ChemicalReaction(reaction, precision=3).masses
+
+
+def test_set_coefficients() -> None:
+    reaction_obj = ChemicalReaction(reaction)
+    reaction_obj.final_reaction
+    reaction_obj.coefficients = [16, 10, 8, 2, 8, 8]
+    assert reaction_obj.final_reaction == "16KI+10H2SO4=8I2+2H2S+8K2SO4+8H2O"
+
+
+def test_masses_for_single_target() -> None:
+    table = ChemicalReaction(reaction).masses_for([1, 2], 0)
+    assert table.shape == (2, 6)
+    assert table[0].tolist() == ChemicalReaction(reaction).masses
+    assert table[1].tolist() == ChemicalReaction(reaction, target_mass=2).masses
+
+
+def test_masses_for_all_targets() -> None:
+    table = ChemicalReaction(reaction).masses_for([1, 2, 3])
+    assert table.shape == (6, 3, 6)
+    assert table[1, 2].tolist() == ChemicalReaction(
+        reaction, target=-1, target_mass=3
+    ).masses
+
+
+def test_masses_for_wrong_mass() -> None:
+    with pytest.raises(ValueError):
+        ChemicalReaction(reaction).masses_for([1, 0])
+
+
+def test_masses_for_wrong_target() -> None:
+    with pytest.raises(IndexError):
+        ChemicalReaction(reaction).masses_for(1, [0, 4])
+
+
+def test_limiting_reagents() -> None:
+    reaction_obj = ChemicalReaction("H2+O2=H2O")
+    result = reaction_obj.limiting_reagents([[1, 10], [1, 4], [0, 4]])
+    assert result.limiting.tolist() == [0, 1, 0]
+    assert result.excess[0, 0] == 0 and result.excess[1, 1] == 0
+    assert result.theoretical_yield[2] == 0
+    assert result.masses.shape == (3, 3)
+    single = reaction_obj.limiting_reagents([1, 10])
+    assert single.theoretical_yield == result.theoretical_yield[0]
+    table = reaction_obj.masses_for(result.theoretical_yield[:2], 0)
+    assert np.allclose(table, result.masses[:2])
+
+
+def test_limiting_reagents_wrong_input() -> None:
+    with pytest.raises(ValueError):
+        ChemicalReaction("H2+O2=H2O").limiting_reagents([1, 2, 3])
+    with pytest.raises(ValueError):
+        ChemicalReaction("H2+O2=H2O").limiting_reagents([1, -2])
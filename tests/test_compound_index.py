@@ -0,0 +1,37 @@
+import pytest
+
+from chemsynthcalc.chemical_formula import ChemicalFormula
+from chemsynthcalc.compound_index import CompoundIndex
+from chemsynthcalc.periodic_table import ELEMENT_BITS, element_mask, mask_elements
+
+library = ["BaCO3", "TiO2", "Ba(NO3)2", "SrTiO3", "O2", "OgF4", "H"]
+
+
+def test_element_mask() -> None:
+    assert element_mask(["H", "O"]) == ELEMENT_BITS["H"] | ELEMENT_BITS["O"]
+    assert mask_elements(element_mask(["O", "H", "Og"])) == ["H", "O", "Og"]
+    assert ChemicalFormula("Og").element_mask.bit_length() == 118
+
+
+def test_element_mask_xor() -> None:
+    reactants = ChemicalFormula("BaCO3").element_mask | ChemicalFormula("TiO2").element_mask
+    products = ChemicalFormula("BaTiO3").element_mask
+    assert mask_elements(reactants ^ products) == ["C"]
+
+
+def test_subset_of() -> None:
+    index = CompoundIndex(library)
+    assert len(index) == 7
+    assert index.subset_of(["Ba", "Ti", "O", "C"]) == ["BaCO3", "TiO2", "O2"]
+    assert index.subset_of(element_mask(["O", "F", "Og", "H"])) == ["O2", "OgF4", "H"]
+    assert index.subset_of([]) == []
+
+
+def test_containing() -> None:
+    index = CompoundIndex(library)
+    assert index.containing("Ti") == ["TiO2", "SrTiO3"]
+    assert index.containing("Og") == ["OgF4"]
+    assert index.containing(["Ba", "N"]) == ["Ba(NO3)2"]
+    assert index.containing_mask("O").tolist() == [True] * 5 + [False, False]
+    with pytest.raises(KeyError):
+        index.containing("Xx")
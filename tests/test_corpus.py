@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chemsynthcalc.balancer import Balancer
+from chemsynthcalc.batch import calculate_corpus, calculate_file, iter_corpus, iter_file
+from chemsynthcalc.chem_errors import BalancingError, NoSeparator
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.corpus import (
+    CompiledCorpus,
+    compile_corpus,
+    line_offsets,
+    line_ranges,
+    read_lines,
+)
+from chemsynthcalc.instrumentation import StageTimings
+
+reactions = [
+    "KMnO4+HCl=MnCl2+Cl2+H2O+KCl",
+    "H2+O2",
+    "Li2CO3+NiO+Co3O4+Al2O3+O2=Li0.95Ni0.8Co0.15Al0.05O2+CO2",
+    "2H2 + O2 = 2H2O",
+]
+
+
+@pytest.fixture
+def corpus_path(tmp_path: Path) -> str:
+    text = tmp_path / "reactions.txt"
+    text.write_text("\n".join(reactions[:2]) + "\n\n" + "\n".join(reactions[2:]))
+    return compile_corpus(str(text))
+
+
+def test_compiled_corpus(corpus_path: str) -> None:
+    assert corpus_path.endswith("reactions.csc")
+    with CompiledCorpus(corpus_path) as corpus:
+        assert len(corpus) == 4
+        assert corpus.is_valid(1) is False
+        assert corpus.compounds(1) == []
+        for i, reaction in enumerate(reactions):
+            assert corpus.reaction(i) == reaction
+            if i == 1:
+                continue
+            expected = ChemicalReaction(reaction)
+            assert corpus.compounds(i) == expected.decomposed_reaction.compounds
+            assert corpus.reactant_count(i) == len(expected.decomposed_reaction.reactants)
+            assert corpus.coefficients(i) == expected.decomposed_reaction.initial_coefficients
+            assert corpus.parsed_formulas(i) == expected.parsed_formulas
+            assert corpus.molar_masses(i) == expected.molar_masses
+            assert corpus.exact_matrix(i) == expected.exact_matrix
+            assert (
+                corpus.chemical_reaction(i).output_results["masses"]
+                == expected.output_results["masses"]
+            )
+        assert corpus.ranges(3) == [(0, 1), (1, 2), (2, 4)]
+        rows, columns = corpus.shapes()
+        assert rows.tolist() == [5, 0, 6, 2]
+        assert columns.tolist() == [6, 0, 7, 3]
+        assert corpus.ranges(2, np.array([3.0, 1.0, 1.0, 1.0])) == [(0, 1), (1, 4)]
+
+
+def test_compiled_corpus_no_parsing(corpus_path: str) -> None:
+    with CompiledCorpus(corpus_path) as corpus:
+        assert corpus.exact_matrix(2) is not None
+        with StageTimings() as timings:
+            results = [
+                corpus.chemical_reaction(i).output_results for i in (0, 2, 3)
+            ]
+        assert results[1]["algorithm"] == "exact"
+        assert results[2]["coefficients"] == [2, 1, 2]
+        for stage in ("reaction validation", "decomposition", "parsing"):
+            assert stage not in timings.stages
+        # a different precision parses the formulas again
+        reaction = corpus.chemical_reaction(0, precision=4)
+        assert reaction.molar_masses == ChemicalReaction(reactions[0], precision=4).molar_masses
+
+
+def test_compiled_corpus_bad_file(tmp_path: Path) -> None:
+    path = tmp_path / "bad.csc"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        CompiledCorpus(str(path))
+
+
+def test_calculate_corpus(corpus_path: str) -> None:
+    results = calculate_corpus(corpus_path, workers=1)
+    assert len(results) == 4
+    assert isinstance(results[1], NoSeparator)
+    assert results[3]["coefficients"] == [2, 1, 2]  # type: ignore
+    parallel = calculate_corpus(corpus_path, workers=2)
+    assert isinstance(parallel[1], NoSeparator)
+    for i in (0, 2, 3):
+        assert parallel[i]["masses"] == results[i]["masses"]  # type: ignore
+
+
+def test_calculate_corpus_rejected(
+    corpus_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # only the 3-compound reaction fits
+    monkeypatch.setattr(Balancer, "memory_limit", 1000)
+    results = calculate_corpus(corpus_path, workers=1)
+    assert isinstance(results[0], BalancingError)
+    assert isinstance(results[1], NoSeparator)
+    assert isinstance(results[2], BalancingError)
+    assert results[3]["coefficients"] == [2, 1, 2]  # type: ignore
+
+
+def test_line_offsets(tmp_path: Path) -> None:
+    path = tmp_path / "reactions.txt"
+    path.write_bytes(b"H2+O2=H2O\n\nCaCO3=CaO+CO2")
+    offsets = line_offsets(str(path), chunk_size=4)
+    assert offsets.tolist() == [0, 10, 11, 24]
+    assert line_ranges(offsets, 2) == [(0, 11), (11, 24)]
+    assert line_ranges(offsets, 24) == [(0, 10), (10, 11), (11, 24)]
+    assert read_lines(str(path), 0, 11) == ["H2+O2=H2O"]
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert line_offsets(str(empty)).tolist() == [0]
+
+
+def test_calculate_file(tmp_path: Path) -> None:
+    path = tmp_path / "reactions.txt"
+    path.write_text("\n".join(reactions) + "\n")
+    results = calculate_file(str(path), workers=1)
+    assert isinstance(results[1], NoSeparator)
+    assert results[3]["coefficients"] == [2, 1, 2]  # type: ignore
+    parallel = calculate_file(str(path), workers=3, offsets=line_offsets(str(path)))
+    assert len(parallel) == 4
+    for i in (0, 2, 3):
+        assert parallel[i]["masses"] == results[i]["masses"]  # type: ignore
+
+
+def test_iter_file(tmp_path: Path) -> None:
+    path = tmp_path / "reactions.txt"
+    path.write_text("\n".join(reactions * 3) + "\n")
+    results = iter_file(str(path), workers=2)
+    assert not isinstance(results, list)
+    first = next(results)
+    assert first["coefficients"] == [2, 16, 2, 5, 8, 2]  # type: ignore
+    # stopping early cancels the ranges that are not started
+    results.close()
+    parallel = list(iter_corpus(compile_corpus(str(path)), workers=2))
+    assert len(parallel) == 12
+    assert isinstance(parallel[5], NoSeparator)
+    assert parallel[11]["coefficients"] == [2, 1, 2]  # type: ignore
@@ -0,0 +1,58 @@
+from fractions import Fraction
+
+import pytest
+
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.exact import exact_coefficients, exact_nullspace
+
+
+def test_exact_nullspace() -> None:
+    matrix = [
+        [Fraction(2), Fraction(0), Fraction(-2)],
+        [Fraction(0), Fraction(2), Fraction(-1)],
+    ]
+    assert exact_nullspace(matrix) == [[2, 1, 2]]
+    assert exact_nullspace([[Fraction(1), Fraction(1), Fraction(1)]]) == [
+        [-1, 1, 0],
+        [-1, 0, 1],
+    ]
+
+
+def test_exact_coefficients() -> None:
+    matrix = [
+        [Fraction(1), Fraction(0), Fraction(1, 2)],
+        [Fraction(0), Fraction(2), Fraction(1)],
+    ]
+    assert exact_coefficients(matrix, 2) == [1, 1, 2]
+    assert exact_coefficients(matrix, 2, limit=2) is None
+    assert exact_coefficients(matrix, 1) is None
+
+
+@pytest.mark.parametrize(
+    "reaction, coefficients",
+    [
+        (
+            "Li2CO3+NiO+Co3O4+Al2O3+O2=Li0.95Ni0.8Co0.15Al0.05O2+CO2",
+            [19, 32, 2, 1, 9, 40, 19],
+        ),
+        ("SrCO3+TiO2+La2O3=Sr0.999La0.001TiO3.0005+CO2", [1998, 2000, 1, 2000, 1998]),
+    ],
+)
+def test_exact_balancing(reaction: str, coefficients: list[int]) -> None:
+    chemical_reaction = ChemicalReaction(reaction)
+    assert chemical_reaction.coefficients == coefficients
+    assert chemical_reaction.algorithm == "exact"
+
+
+def test_no_exact_matrix_for_integer_amounts() -> None:
+    reaction = ChemicalReaction("H2+O2=H2O")
+    assert reaction.exact_matrix is None
+    assert reaction.coefficients == [2, 1, 2]
+    assert reaction.algorithm == "inverse"
+
+
+def test_exact_decimal_coefficients() -> None:
+    reaction = ChemicalReaction("2.946Gd2O3+1MoO3+0.08O2==1Gd5.893MoO12")
+    assert reaction.coefficients == [36.7165109, 12.46105919, 1.0, 12.46105919]
+    assert reaction.algorithm == "exact"
+    assert reaction.coefficients == reaction.balancer.inv()
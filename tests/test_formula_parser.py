@@ -1,3 +1,5 @@
+from fractions import Fraction
+
 import pytest
 
 from chemsynthcalc.formula_parser import ChemicalFormulaParser
@@ -13,3 +15,14 @@ parser_test_data: list[tuple[str, dict[str, float]]] = [
 @pytest.mark.parametrize("formula,parsed_formula", parser_test_data)
 def test_parser(formula: str, parsed_formula: dict[str, float]):
     assert ChemicalFormulaParser(formula).parse_formula() == parsed_formula
+
+
+def test_parser_exact():
+    parser = ChemicalFormulaParser("(K0.6Na0.4)2SO4*0.5H2O", exact=True)
+    assert parser.parse_formula() == {
+        "K": Fraction(6, 5),
+        "Na": Fraction(4, 5),
+        "S": 1,
+        "O": Fraction(9, 2),
+        "H": 1,
+    }
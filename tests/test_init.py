@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import pytest
+
+import chemsynthcalc
+
+
+def test_lazy_formula_import_without_numpy() -> None:
+    code = (
+        "import sys; from chemsynthcalc import ChemicalFormula; "
+        "ChemicalFormula('H2O').to_json(); assert 'numpy' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes() -> None:
+    from chemsynthcalc.chemical_reaction import ChemicalReaction
+
+    assert chemsynthcalc.ChemicalReaction is ChemicalReaction
+    assert isinstance(chemsynthcalc.__version__, str)
+
+
+def test_no_such_attribute() -> None:
+    with pytest.raises(AttributeError):
+        chemsynthcalc.ChemicalCompound
@@ -0,0 +1,71 @@
+import pytest
+
+from chemsynthcalc.chemical_formula import _parse
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.instrumentation import (
+    StageTimings,
+    add_callback,
+    remove_callback,
+    timed,
+)
+
+reaction: str = "Fe2O3+C=Fe3O4+FeO+Fe+Fe3C+CO+CO2"
+
+
+def test_stage_timings():
+    # formulas parsed by other tests are cached
+    _parse.cache_clear()
+    with StageTimings() as timings:
+        ChemicalReaction(reaction).to_json()
+    summary = timings.summary()
+    assert {
+        "reaction validation",
+        "decomposition",
+        "parsing",
+        "matrix",
+        "balancing",
+        "auto balancing",
+        "output",
+        "serialization",
+    } <= set(summary)
+    assert summary["balancing"]["errors"] == 1
+    assert summary["auto balancing"]["count"] == 1
+
+
+def test_callback_events():
+    events: list[tuple[str, int, dict[str, object]]] = []
+
+    def callback(stage: str, duration_ns: int, metadata: dict[str, object]) -> None:
+        events.append((stage, duration_ns, metadata))
+
+    add_callback(callback)
+    try:
+        ChemicalReaction(reaction).coefficients
+    finally:
+        remove_callback(callback)
+    balancing = [e[2] for e in events if e[0] == "balancing"]
+    assert balancing[0] == {
+        "method": "inv",
+        "shape": (3, 8),
+        "reason": "length mismatch",
+        "error": "BalancingError",
+    }
+    assert balancing[1] == {"method": "gpinv", "shape": (3, 8), "reason": ""}
+    assert all(e[1] >= 0 for e in events)
+
+
+def test_disabled():
+    timings = StageTimings()
+    ChemicalReaction(reaction).coefficients
+    assert timings.summary() == {}
+
+
+def test_timed_reraises():
+    @timed("failing")
+    def fail() -> None:
+        raise KeyError
+
+    with StageTimings() as timings:
+        with pytest.raises(KeyError):
+            fail()
+    assert timings.summary()["failing"]["errors"] == 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.integerize import integerize
+
+
+@pytest.mark.parametrize(
+    "coefficients, result",
+    [
+        ([1.0, 2.0, 3.0], [1, 2, 3]),
+        ([2.0, 4.0, 6.0], [1, 2, 3]),
+        ([0.5, 0.33333333, 1.0], [3, 2, 6]),
+        ([0.999, 1.0], [999, 1000]),
+        ([-1.5, 1.0], [-3, 2]),
+    ],
+)
+def test_integerize_vector(coefficients: list[float], result: list[int]) -> None:
+    integers = integerize(coefficients)
+    assert integers.success
+    assert integers.coefficients.tolist() == result
+    assert np.isnan(integers.balance_error)
+
+
+def test_integerize_batch() -> None:
+    integers = integerize(
+        [[1.5, 1.0], [0.25, 1.0], [np.pi, 1.0], [np.nan, 1.0]], max_denominator=100
+    )
+    assert integers.coefficients.shape == (4, 2)
+    assert integers.coefficients[:2].tolist() == [[3, 2], [1, 4]]
+    assert integers.success.tolist() == [True, True, False, False]
+
+
+def test_integerize_limit() -> None:
+    assert not integerize([0.5, 0.33333333, 1.0], limit=5).success
+
+
+def test_integerize_closest_fraction() -> None:
+    # 11786/321 is within tolerance of 36.7165109, but a closer fraction
+    # with a large denominator exists, so the vector can't be intified
+    assert not integerize([36.7165109, 12.46105919, 1.0]).success
+
+
+def test_integerize_balance_error() -> None:
+    matrix = np.array([[2.0, 0.0, -2.0], [0.0, 2.0, -1.0]])
+    assert integerize([1.0, 0.5, 1.0], matrix=matrix).balance_error == 0
+    assert integerize([1.0, 1.0, 1.0], matrix=matrix).balance_error == 1
+
+
+def test_intify_error() -> None:
+    reaction = ChemicalReaction("H2+O2=H2O")
+    assert reaction.coefficients == [2, 1, 2]
+    assert reaction.balancer.intify_error == 0
+
+
+def test_intify_error_reset() -> None:
+    balancer = ChemicalReaction("H2+O2=H2O").balancer
+    balancer._intify_coefficients([1.0, 0.5, 1.0], 100)
+    assert balancer.intify_error == 0
+    balancer._intify_coefficients([np.pi, 1.0, 1.0], 100)
+    assert balancer.intify_error is None
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from chemsynthcalc.balancer import Balancer
+from chemsynthcalc.chem_errors import BalancingError
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.reaction_matrix import (
+    as_integer_array,
+    checked_matmul,
+    integer_dtype,
+)
+
+
+def test_integer_matrix() -> None:
+    balancer = ChemicalReaction("H2+O2=H2O").balancer
+    assert balancer.integer_matrix.dtype == np.int32
+    assert np.array_equal(balancer.integer_matrix, balancer.reaction_matrix)
+    assert ChemicalReaction("Li2O+O2=Li0.95O").balancer.integer_matrix is None
+
+
+def test_integer_dtype() -> None:
+    assert integer_dtype(2**31 - 1) == np.int32
+    assert integer_dtype(2**31) == np.int64
+    assert integer_dtype(2**63) == object
+
+
+def test_as_integer_array() -> None:
+    assert as_integer_array([1.0, 3e9]).dtype == np.int64
+    assert as_integer_array([2**70, 1]).dtype == object
+    assert as_integer_array([1.0, np.nan]) is None
+    assert as_integer_array([2.0**60]) is None
+
+
+def test_checked_matmul_overflow() -> None:
+    left = as_integer_array([[2**40, 1]])
+    right = as_integer_array([[2**40], [1]])
+    assert checked_matmul(left, right).tolist() == [[2**80 + 1]]
+    small = as_integer_array([[3, 4]])
+    assert checked_matmul(small, small.T).dtype == np.int32
+
+
+def test_exact_balance_check() -> None:
+    # the relative difference is 1e-9, so the float check can't see it
+    reactants = np.array([[1e9]])
+    products = np.array([[1e9 + 1]])
+    assert not Balancer.is_reaction_balanced(reactants, products, [10**9, 10**9])
+    assert Balancer.is_reaction_balanced(reactants, products, [10**9 + 1, 10**9])
+    assert not Balancer.is_reaction_balanced(reactants, products, [1, 2, 3])
+
+
+def test_comb_overflow() -> None:
+    # the atom count doesn't fit into uint16
+    reaction = ChemicalReaction("H65537+H=H2")
+    assert reaction.balancer.integer_matrix.dtype == np.int32
+    assert reaction.balancer._comb_algorithm(1e4) is None
+
+
+def test_comb_non_integer_matrix() -> None:
+    reaction = ChemicalReaction("Li2CO3+CoO+O2=Li0.95CoO2+Li2O+CO2")
+    with pytest.raises(BalancingError):
+        reaction.balancer.comb()
+
+
+def test_comb_first_candidate() -> None:
+    assert ChemicalReaction("H2+Cl2=HCl").balancer.comb() == [1, 1, 2]
+    assert ChemicalReaction("NaCl+AgNO3=AgCl+NaNO3").balancer.comb() == [1, 1, 1, 1]
@@ -0,0 +1,40 @@
+import pytest
+
+from chemsynthcalc.reaction_network import ReactionNetwork
+
+
+def test_net_reaction() -> None:
+    network = ReactionNetwork(["N2+O2=NO", "NO+O2=NO2"])
+    assert network.intermediates == ["NO"]
+    assert network.multipliers == [1, 1]
+    assert network.net_reaction == "N2+2O2=2NO2"
+    assert network.to_chemical_reaction().is_balanced
+
+
+def test_reversed_step() -> None:
+    network = ReactionNetwork(["C+O2=CO2", "CO+O2=CO2"], intermediates=["O2C"])
+    assert network.multipliers == [2, -1]
+    assert network.net_coefficients == {"C": -2, "O2": -1, "CO": 2}
+
+
+def test_reduced_net_reaction() -> None:
+    network = ReactionNetwork(["C+O2=CO", "CO+O2=CO2"])
+    assert network.multipliers == [1, 1]
+    assert network.net_coefficients == {"C": -1, "O2": -1, "CO2": 1}
+    assert network.net_reaction == "C+O2=CO2"
+
+
+def test_large_network() -> None:
+    steps = [f"C{k}H{2 * k + 2}+CH4=C{k + 1}H{2 * k + 4}+H2" for k in range(1, 200)]
+    network = ReactionNetwork(steps)
+    assert network.multipliers == [1] * len(steps)
+    assert network.net_reaction == "200C1H4=199H2+C200H402"
+
+
+def test_network_errors() -> None:
+    with pytest.raises(ValueError):
+        ReactionNetwork([])
+    with pytest.raises(ValueError):
+        ReactionNetwork(["H2+O2=H2O", "Na+Cl2=NaCl"], intermediates=["H2O", "NaCl"]).multipliers
+    with pytest.raises(ValueError):
+        ReactionNetwork(["H2+O2=H2O", "Na+Cl2=NaCl"]).multipliers
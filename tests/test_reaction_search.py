@@ -0,0 +1,38 @@
+import pytest
+
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.reaction_search import find_reactions
+
+precursors = ["BaCO3", "BaO", "TiO2", "Ba(NO3)2", "SrCO3", "NaCl"]
+byproducts = ["CO2", "NO2", "O2"]
+
+
+def test_find_reactions() -> None:
+    found = find_reactions("BaTiO3", precursors, byproducts, workers=1)
+    assert [r.reaction for r in found] == [
+        "BaO+TiO2=BaTiO3",
+        "BaCO3+TiO2=BaTiO3+CO2",
+        "2TiO2+2Ba(NO3)2=2BaTiO3+4NO2+O2",
+    ]
+    for result in found:
+        assert ChemicalReaction(result.reaction, mode="check").is_balanced
+        assert result.coefficient_sum == sum(result.coefficients)
+
+
+def test_find_reactions_by_mass() -> None:
+    found = find_reactions("BaTiO3", precursors, byproducts, rank_by="mass", workers=2)
+    masses = [r.precursor_mass for r in found]
+    assert masses == sorted(masses)
+    assert masses[0] == pytest.approx(1.0)
+
+
+def test_find_reactions_max_size() -> None:
+    assert find_reactions("BaTiO3", precursors, byproducts, max_size=1) == []
+    assert find_reactions("BaTiO3", ["BaO", "TiO2"], max_size=2, workers=1)[0].coefficients == [1, 1, 1]
+
+
+def test_find_reactions_errors() -> None:
+    with pytest.raises(ValueError):
+        find_reactions("BaTiO3", precursors, rank_by="price")
+    with pytest.raises(ValueError):
+        find_reactions("BaTiO3", precursors, max_size=0)
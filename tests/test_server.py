@@ -0,0 +1,133 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chemsynthcalc.chemical_formula import ChemicalFormula
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc import server
+from chemsynthcalc.batch import calculate_batch
+from chemsynthcalc.server import ChemSynthCalcServer, MicroBatcher
+
+
+@pytest.fixture(scope="module")
+def url():
+    server = ChemSynthCalcServer(
+        ("127.0.0.1", 0), workers=2, processes=False, max_batch=8, window=0.01
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url: str, body: object) -> tuple[int, dict[str, object]]:
+    request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"))
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_reaction(url: str):
+    status, result = post(
+        url + "/reaction", {"reaction": "KI+H2SO4=I2+H2S+K2SO4+H2O", "target_mass": 2}
+    )
+    assert status == 200
+    expected = ChemicalReaction("KI+H2SO4=I2+H2S+K2SO4+H2O", target_mass=2)
+    assert result["masses"] == expected.masses
+    assert result["reaction matrix"] == expected.matrix.tolist()
+
+
+def test_formula(url: str):
+    status, result = post(url + "/formula", {"formula": "K2FeO4", "custom_oxides": ["FeO3"]})
+    assert status == 200
+    assert result["oxide percent"] == ChemicalFormula("K2FeO4", "FeO3").oxide_percent
+
+
+def test_errors(url: str):
+    assert post(url + "/reaction", {"reaction": "H2O2"})[1]["error"] == "NoSeparator"
+    assert post(url + "/reaction", {"reactions": "H2+O2=H2O"})[0] == 400
+    assert post(url + "/reaction", {"reaction": ["H2+O2=H2O"]})[0] == 400
+    assert post(url + "/balance", {"reaction": "H2+O2=H2O"})[0] == 404
+    status, result = post(url + "/formula", {"formula": "K2FeO4", "custom_oxides": "FeO3"})
+    assert status == 400
+    assert result["error"] == "ValueError"
+
+
+def test_micro_batching(url: str):
+    with ThreadPoolExecutor(16) as pool:
+        results = list(
+            pool.map(
+                lambda _: post(url + "/reaction", {"reaction": "H2+O2=H2O"}), range(32)
+            )
+        )
+    assert all(r == (200, results[0][1]) for r in results)
+    with urllib.request.urlopen(url + "/stats") as response:
+        stats = json.loads(response.read())
+    assert stats["requests"] >= 32
+    assert stats["mean batch size"] > 1
+    assert stats["p50 ms"] <= stats["p99 ms"]
+
+
+def test_micro_batch_chunks():
+    with ThreadPoolExecutor(2) as executor:
+        submit = executor.submit
+        chunks: list[int] = []
+
+        def counting(function, requests):
+            chunks.append(len(requests))
+            return submit(function, requests)
+
+        executor.submit = counting  # type: ignore
+        batcher = MicroBatcher(executor, max_batch=8, window=0.5, workers=2)
+        reactions = ["H2+O2=H2O", "CaCO3=CaO+CO2", "Fe+O2=Fe2O3"]
+        futures = [
+            batcher.submit(("reaction", (("reaction", reaction),)))
+            for reaction in reactions
+        ]
+        results = [future.result(10) for future in futures]
+    assert chunks == [2, 1]
+    assert results[2]["coefficients"] == [4, 3, 2]
+
+
+@pytest.mark.parametrize("length", ["-1", str(ChemSynthCalcServer.max_body_size + 1)])
+def test_bad_content_length(url: str, length: str):
+    connection = http.client.HTTPConnection(urllib.parse.urlsplit(url).netloc, timeout=10)
+    connection.putrequest("POST", "/reaction")
+    connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read())["error"] == "ValueError"
+    connection.close()
+
+
+def test_calculate_batch(monkeypatch: pytest.MonkeyPatch):
+    calls: list[list[str]] = []
+
+    def counting(reactions, **kwargs):
+        calls.append(reactions)
+        return calculate_batch(reactions, **kwargs)
+
+    monkeypatch.setattr(server, "calculate_batch", counting)
+    results = server._calculate_batch(
+        [
+            ("reaction", (("reaction", "H2+O2=H2O"),)),
+            ("formula", (("formula", "H2O"),)),
+            ("reaction", (("reaction", "O2+H2=H2O"),)),
+            ("reaction", (("reaction", "H2O2"),)),
+        ]
+    )
+    assert calls == [["H2+O2=H2O", "O2+H2=H2O", "H2O2"]]
+    assert results[0]["coefficients"] == [2, 1, 2]
+    assert results[1]["formula"] == "H2O"
+    assert results[2]["coefficients"] == [1, 2, 2]
+    assert results[3]["error"] == "NoSeparator"
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from chemsynthcalc.chemical_reaction import ChemicalReaction
+from chemsynthcalc.synthesis_route import SynthesisRoute
+
+ybco_steps = [
+    "Y2(CO3)3=Y2O3+CO2",
+    "BaCO3=BaO+CO2",
+    "CuCO3=CuO+CO2",
+    "BaO+O2+CuO+Y2O3=YBa2Cu3O7",
+]
+
+
+def test_route_matches_one_step() -> None:
+    route = SynthesisRoute(ybco_steps, target_mass=3)
+    assert route.intermediates == ["O3Y2", "BaO", "CuO"]
+    assert route.precursors == ["C3O9Y2", "CBaO3", "CCuO3", "O2"]
+    reaction = ChemicalReaction("BaCO3+Y2(CO3)3+CuCO3+O2=YBa2Cu3O7+CO2", target_mass=3)
+    masses = dict(zip(reaction.decomposed_reaction.compounds, reaction.masses))
+    for formula, mass in route.masses.items():
+        assert mass == pytest.approx(masses[formula])
+
+
+def test_route_yields() -> None:
+    full = SynthesisRoute(["BaCO3=BaO+CO2", "TiO2+OBa=BaTiO3"])
+    lossy = SynthesisRoute(["BaCO3=BaO+CO2", "BaO+TiO2=BaTiO3"], yields=[0.5, 0.8])
+    assert lossy.intermediates == ["BaO"]
+    table = lossy.masses_for([1, 2, 3])
+    assert table.shape == (3, 2)
+    assert np.allclose(table[2], 3 * table[0])
+    ratio = lossy.masses_for(1)[0] / full.masses_for(1)[0]
+    assert np.allclose(ratio, [1 / 0.4, 1 / 0.8])
+
+
+def test_route_errors() -> None:
+    with pytest.raises(ValueError):
+        SynthesisRoute(ybco_steps, yields=[1, 1])
+    with pytest.raises(ValueError):
+        SynthesisRoute(ybco_steps, yields=[1, 1, 1.5, 1])
+    with pytest.raises(ValueError):
+        SynthesisRoute(ybco_steps, target=-1)
+    with pytest.raises(ValueError):
+        SynthesisRoute(["BaCO3=BaO+CO2", "SrCO3=SrO+CO2"]).masses